@@ -35,11 +35,13 @@ class MarkerLoader:
     def __init__(self, config: Optional[MarkerConfig] = None):
         self.config = config or MarkerConfig()
         self._markers: Dict[str, MarkerDefinition] = {}
-        self._file_cache: Dict[str, float] = {}  # Datei -> Zeitstempel
+        # Datei -> Zeitstempel beim letzten load_all_markers (None: noch nie geladen)
+        self._file_cache: Optional[Dict[str, float]] = None
         
     def load_all_markers(self) -> Dict[str, MarkerDefinition]:
         """Lädt alle Marker aus den konfigurierten Verzeichnissen."""
         self._markers.clear()
+        self._file_cache = self._scan_marker_files()
         
         for directory in self.config.marker_directories:
             if not directory.exists():
@@ -275,25 +277,35 @@ class MarkerLoader:
         """Gibt nur aktive Marker zurück."""
         return [m for m in self._markers.values() if m.active]
     
+    def get_all_markers(self) -> Dict[str, MarkerDefinition]:
+        """Gibt alle geladenen Marker zurück (ID -> Definition)."""
+        return self._markers
+    
     def reload_if_changed(self) -> bool:
-        """Lädt Marker neu, wenn sich Dateien geändert haben."""
-        if not self.config.auto_reload:
-            return False
+        """Lädt Marker neu, wenn Dateien geändert, hinzugefügt oder entfernt wurden.
         
-        changed = False
-        for directory in self.config.marker_directories:
-            if not directory.exists():
-                continue
-            
-            for file in directory.glob("*.{yaml,json,txt}"):
-                mtime = file.stat().st_mtime
-                if file.as_posix() not in self._file_cache or \
-                   self._file_cache[file.as_posix()] < mtime:
-                    changed = True
-                    break
+        Greift nur, wenn zuvor ``load_all_markers`` lief.
+        """
+        if not self.config.auto_reload or self._file_cache is None:
+            return False
         
+        changed = self._scan_marker_files() != self._file_cache
         if changed:
             logger.info("Änderungen erkannt, lade Marker neu")
             self.load_all_markers()
             
-        return changed
\ No newline at end of file
+        return changed
+    
+    def _scan_marker_files(self) -> Dict[str, float]:
+        """Zeitstempel aller Marker-Dateien in den konfigurierten Verzeichnissen."""
+        files = {}
+        for directory in self.config.marker_directories:
+            if not directory.exists():
+                continue
+            for pattern in ("*.yaml", "*.json", "*.txt"):
+                for file in directory.glob(pattern):
+                    try:
+                        files[file.as_posix()] = file.stat().st_mtime
+                    except FileNotFoundError:
+                        continue
+        return files
\ No newline at end of file
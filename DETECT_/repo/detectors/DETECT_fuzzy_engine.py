@@ -1,7 +1,11 @@
 """Fuzzy-Matching Engine für flexible Marker-Erkennung."""
 
 import re
-from typing import List, Tuple, Optional, Dict
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+from typing import Any, Iterable, List, Tuple, Optional, Dict
 from difflib import SequenceMatcher
 import logging
 
@@ -15,18 +19,152 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+# Toleranz der Filter gegen Rundung im Float-Vergleich similarity >= threshold
+_FILTER_EPS = 1e-9
+
+# Wortfenster bzw. deren q-Gramme je Fenstergröße
+_Windows = Dict[int, List[str]]
+_WindowGrams = Dict[int, List[Optional[Counter]]]
+
+
+def _qgrams(text: str, q: int) -> Counter:
+    return Counter(text[i:i + q] for i in range(len(text) - q + 1))
+
+
+class TokenOffsets:
+    """Wörter eines Texts (wie ``text.split()``) mit ihren Zeichen-Offsets.
+    
+    Wird einmal pro Chunk berechnet; Positionen werden per ``bisect`` auf
+    Wort-Indizes abgebildet.
+    """
+    
+    __slots__ = ("text", "words", "starts", "ends")
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.words = text.split()
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        pos = 0
+        for word in self.words:
+            start = text.find(word, pos)
+            pos = start + len(word)
+            self.starts.append(start)
+            self.ends.append(pos)
+    
+    def token_at(self, position: int) -> Optional[int]:
+        """Index des Worts mit start <= position <= end (None zwischen Wörtern)."""
+        idx = bisect_right(self.starts, position) - 1
+        if idx >= 0 and position <= self.ends[idx]:
+            return idx
+        return None
+    
+    def span(self, first: int, last: int) -> Tuple[int, int]:
+        """Zeichenbereich der Wörter ``first`` bis ``last`` (inklusive)."""
+        return self.starts[first], self.ends[last]
+
+
+class QGramIndex:
+    """q-Gramm-Index über Fuzzy-Patterns für die Kandidatensuche.
+    
+    Schlägt zu einem Wortfenster nur Patterns vor, die die Schwelle mit
+    ``SequenceMatcher.ratio`` (2M / (|a| + |b|)) überhaupt erreichen können:
+    
+    - Längenfilter: M <= min(|a|, |b|)
+    - Count-Filter: M <= LCS; jede Löschung in a zerstört höchstens q,
+      jede Einfügung in b höchstens q - 1 der |a| - q + 1 q-Gramme von a.
+      Gemeinsame q-Gramme >= |a| - q + 1 - q (|a| - LCS) - (q - 1) (|b| - LCS)
+    
+    Beide Filter sind verlustfrei; die exakte Ähnlichkeit wird danach nur
+    noch für die Kandidaten berechnet.
+    """
+    
+    def __init__(self, patterns: List[str], q: int = 2):
+        self.q = q
+        self.patterns = [p.lower() for p in patterns]
+        # Wortanzahl -> (Pattern-Indizes, q-Gramm -> [(Index, Anzahl)])
+        self.groups: Dict[int, Tuple[List[int], Dict[str, List[Tuple[int, int]]]]] = {}
+        for idx, pattern in enumerate(patterns):
+            ids, postings = self.groups.setdefault(len(pattern.split()), ([], {}))
+            ids.append(idx)
+            for gram, count in _qgrams(self.patterns[idx], q).items():
+                postings.setdefault(gram, []).append((idx, count))
+        # Kürzestes und längstes Pattern je Wortanzahl
+        self.length_bounds: Dict[int, Tuple[int, int]] = {
+            word_count: (
+                min(len(self.patterns[idx]) for idx in ids),
+                max(len(self.patterns[idx]) for idx in ids)
+            )
+            for word_count, (ids, _) in self.groups.items()
+        }
+    
+    def length_range(self, word_count: int, threshold: float) -> Tuple[float, float]:
+        """Fensterlängen, mit denen ein Pattern der Gruppe die Schwelle erreichen kann."""
+        if threshold <= 0:
+            return 0.0, float('inf')
+        shortest, longest = self.length_bounds[word_count]
+        return (
+            shortest * threshold / (2 - threshold) - _FILTER_EPS,
+            longest * (2 - threshold) / threshold + _FILTER_EPS
+        )
+    
+    def candidates(
+        self,
+        window: str,
+        word_count: int,
+        threshold: float,
+        grams: Optional[Counter] = None
+    ) -> List[int]:
+        """Indizes der Patterns mit ``word_count`` Wörtern, die für ``window``
+        (kleingeschrieben) die Schwelle erreichen können."""
+        ids, postings = self.groups[word_count]
+        q = self.q
+        la = len(window)
+        if grams is None:
+            grams = _qgrams(window, q)
+        shared: Dict[int, int] = {}
+        for gram, count in grams.items():
+            for idx, pattern_count in postings.get(gram, ()):
+                shared[idx] = shared.get(idx, 0) + min(count, pattern_count)
+        
+        result = []
+        for idx in ids:
+            lb = len(self.patterns[idx])
+            if la + lb == 0:
+                result.append(idx)
+                continue
+            lcs = threshold * (la + lb) / 2 - _FILTER_EPS
+            if lcs > min(la, lb):
+                continue
+            required = max(
+                la - q + 1 - q * (la - lcs) - (q - 1) * (lb - lcs),
+                lb - q + 1 - q * (lb - lcs) - (q - 1) * (la - lcs)
+            )
+            if shared.get(idx, 0) >= required:
+                result.append(idx)
+        return result
+
+
 class FuzzyMatcher:
     """Engine für Fuzzy-String-Matching."""
     
-    def __init__(self, threshold: float = 0.85):
+    def __init__(self, threshold: float = 0.85, max_indexes: int = 256):
         self.threshold = threshold
         self.use_fuzzywuzzy = FUZZYWUZZY_AVAILABLE
+        # LRU wie RegexCache: Hot-Reload und Ad-hoc-Patterns erzeugen neue Schlüssel
+        self.max_indexes = max_indexes
+        self._indexes: "OrderedDict[Tuple[str, ...], QGramIndex]" = OrderedDict()
+        # Wortfenster des zuletzt durchsuchten Texts (MarkerMatcher sucht
+        # nacheinander die Patterns aller Marker im selben Chunk)
+        self._windows: Tuple[str, _Windows, _WindowGrams] = ("", {}, {})
         
     def find_fuzzy_matches(
         self,
         text: str,
         patterns: List[str],
-        threshold: Optional[float] = None
+        threshold: Optional[float] = None,
+        offsets: Optional[TokenOffsets] = None,
+        index: Optional[QGramIndex] = None
     ) -> List[Tuple[str, int, int, float]]:
         """Findet Fuzzy-Matches in einem Text.
         
@@ -34,21 +172,25 @@ class FuzzyMatcher:
             text: Der zu durchsuchende Text
             patterns: Liste von Patterns zum Suchen
             threshold: Mindest-Ähnlichkeit (0-1)
+            offsets: Wort-Offsets von ``text``, falls schon berechnet
+            index: Vorab gebauter Index über ``patterns`` (siehe ``get_index``)
             
         Returns:
             Liste von (matched_text, start_pos, end_pos, confidence)
         """
         if threshold is None:
             threshold = self.threshold
+        if offsets is None:
+            offsets = TokenOffsets(text)
             
-        matches = []
         text_lower = text.lower()
-        words = text.split()
+        words = offsets.words
+        # Treffer je Pattern, damit die Reihenfolge (für Gleichstände in der
+        # Deduplizierung) der Suche Pattern für Pattern entspricht
+        pattern_matches: List[List[Tuple[str, int, int, float]]] = [[] for _ in patterns]
         
-        for pattern in patterns:
+        for idx, pattern in enumerate(patterns):
             pattern_lower = pattern.lower()
-            pattern_words = pattern.split()
-            pattern_len = len(pattern_words)
             
             # Exakte Substring-Suche zuerst
             start = 0
@@ -56,37 +198,61 @@ class FuzzyMatcher:
                 pos = text_lower.find(pattern_lower, start)
                 if pos == -1:
                     break
-                matches.append((
+                pattern_matches[idx].append((
                     text[pos:pos + len(pattern)],
                     pos,
                     pos + len(pattern),
                     1.0  # Exakter Match = 100% Konfidenz
                 ))
                 start = pos + 1
+        
+        # Fuzzy-Matching auf Wort-Ebene, gruppiert nach Wortanzahl der Patterns
+        if index is None:
+            index = self.get_index(patterns)
+        window_cache, gram_cache = self._get_windows(text)
+        for pattern_len in index.groups:
+            if not 0 < pattern_len <= len(words):
+                continue
+            min_len, max_len = index.length_range(pattern_len, threshold)
+            window_texts = window_cache.get(pattern_len)
+            if window_texts is None:
+                window_texts = window_cache[pattern_len] = [
+                    ' '.join(words[i:i + pattern_len]).lower()
+                    for i in range(len(words) - pattern_len + 1)
+                ]
+                gram_cache[pattern_len] = [None] * len(window_texts)
+            window_grams = gram_cache[pattern_len]
             
-            # Fuzzy-Matching auf Wort-Ebene
-            if pattern_len <= len(words):
-                for i in range(len(words) - pattern_len + 1):
-                    window = words[i:i + pattern_len]
-                    window_text = ' '.join(window)
-                    
+            for i, window_text in enumerate(window_texts):
+                if self.use_fuzzywuzzy:
+                    # partial_ratio/token_sort_ratio sind durch die Filter nicht beschränkt
+                    candidates = index.groups[pattern_len][0]
+                elif min_len <= len(window_text) <= max_len:
+                    grams = window_grams[i]
+                    if grams is None:
+                        grams = window_grams[i] = _qgrams(window_text, index.q)
+                    candidates = index.candidates(window_text, pattern_len, threshold, grams)
+                else:
+                    continue
+                
+                for idx in candidates:
                     similarity = self._calculate_similarity(
-                        window_text.lower(),
-                        pattern_lower
+                        window_text,
+                        index.patterns[idx]
                     )
                     
                     if similarity >= threshold:
-                        # Finde Position im Original-Text
-                        start_pos = text.find(window[0], 0 if i == 0 else len(' '.join(words[:i])))
-                        end_pos = text.find(window[-1], start_pos) + len(window[-1])
+                        start_pos, end_pos = offsets.span(i, i + pattern_len - 1)
                         
-                        matches.append((
+                        pattern_matches[idx].append((
                             text[start_pos:end_pos],
                             start_pos,
                             end_pos,
                             similarity
                         ))
         
+        matches = [match for found in pattern_matches for match in found]
+        
         # Deduplizierung - behalte nur beste Matches für überlappende Bereiche
         matches = self._deduplicate_matches(matches)
         
@@ -127,6 +293,26 @@ class FuzzyMatcher:
         
         return semantic_matches
     
+    def get_index(self, patterns: List[str]) -> QGramIndex:
+        """q-Gramm-Index je Pattern-Liste (die Patterns eines Markers), LRU-begrenzt."""
+        key = tuple(patterns)
+        index = self._indexes.get(key)
+        if index is not None:
+            self._indexes.move_to_end(key)
+            return index
+        index = self._indexes[key] = QGramIndex(patterns)
+        while len(self._indexes) > self.max_indexes:
+            self._indexes.popitem(last=False)
+        return index
+    
+    def _get_windows(self, text: str) -> Tuple[_Windows, _WindowGrams]:
+        """Wortfenster (kleingeschrieben) und deren q-Gramme je Fenstergröße für ``text``."""
+        cached_text, windows, grams = self._windows
+        if cached_text is not text and cached_text != text:
+            windows, grams = {}, {}
+            self._windows = (text, windows, grams)
+        return windows, grams
+    
     def _calculate_similarity(self, str1: str, str2: str) -> float:
         """Berechnet Ähnlichkeit zwischen zwei Strings."""
         if self.use_fuzzywuzzy:
@@ -144,7 +330,20 @@ class FuzzyMatcher:
         self,
         matches: List[Tuple[str, int, int, float]]
     ) -> List[Tuple[str, int, int, float]]:
-        """Entfernt überlappende Matches, behält die mit höchster Konfidenz."""
+        """Entfernt überlappende Matches, behält die mit höchster Konfidenz.
+        
+        Die akzeptierten Bereiche überlappen sich nicht; nach Start sortiert
+        sind damit auch ihre Enden aufsteigend. Ein Kandidat [start, end)
+        überlappt genau dann, wenn der letzte akzeptierte Bereich mit
+        Start < end über start hinausreicht: eine Binärsuche statt eines
+        Vergleichs mit allen bisher akzeptierten Bereichen.
+        
+        Die Suche kostet O(log n), das Einfügen per ``list.insert`` aber ein
+        memmove von O(n) Zeigern: im schlechtesten Fall insgesamt O(n²), mit
+        sehr kleiner Konstante. Ein Fenwick-Baum wäre O(n log n), ist aber bei
+        den Match-Zahlen eines Chunks (bis ~1000) gut doppelt so langsam und
+        holt erst ab einigen 10.000 Matches auf.
+        """
         if not matches:
             return []
         
@@ -152,31 +351,130 @@ class FuzzyMatcher:
         sorted_matches = sorted(matches, key=lambda x: (-x[3], x[1]))
         
         deduplicated = []
-        used_ranges = []
+        # Akzeptierte Bereiche, sortiert nach (Start, Ende)
+        used_ranges: List[Tuple[int, int]] = []
+        used_starts: List[int] = []
+        used_ends: List[int] = []
         
         for match in sorted_matches:
             _, start, end, _ = match
             
             # Prüfe Überlappung mit bereits verwendeten Bereichen
-            overlaps = False
-            for used_start, used_end in used_ranges:
-                if not (end <= used_start or start >= used_end):
-                    overlaps = True
-                    break
+            idx = bisect_left(used_starts, end)
+            if idx and used_ends[idx - 1] > start:
+                continue
             
-            if not overlaps:
-                deduplicated.append(match)
-                used_ranges.append((start, end))
+            deduplicated.append(match)
+            pos = bisect_right(used_ranges, (start, end))
+            used_ranges.insert(pos, (start, end))
+            used_starts.insert(pos, start)
+            used_ends.insert(pos, end)
         
         # Sortiere nach Position für Output
         return sorted(deduplicated, key=lambda x: x[1])
 
 
+class RegexCache:
+    """Thread-sicherer LRU-Cache kompilierter Regexe, Schlüssel (pattern, flags).
+    
+    Begrenzt, damit nutzerdefinierte oder per Hot-Reload wechselnde Patterns
+    den Speicher nicht unbegrenzt füllen; zählt Treffer und Kompilierzeit.
+    """
+    
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], re.Pattern]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        self.compile_seconds = 0.0
+    
+    def get(self, pattern: str, flags: int = 0) -> re.Pattern:
+        """Kompiliertes Pattern aus dem Cache oder neu kompiliert.
+        
+        Raises:
+            re.error: bei ungültigem Pattern (wird nicht gecacht)
+        """
+        key = (pattern, int(flags))
+        with self._lock:
+            regex = self._entries.get(key)
+            if regex is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return regex
+            self.misses += 1
+        
+        start = time.perf_counter()
+        try:
+            regex = re.compile(pattern, flags)
+        except re.error:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.compile_seconds += elapsed
+        
+        with self._lock:
+            self._entries[key] = regex
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return regex
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "compile_seconds": self.compile_seconds
+        }
+
+
 class RegexMatcher:
     """Engine für Regex-basiertes Matching."""
     
-    def __init__(self):
-        self._compiled_patterns: Dict[str, re.Pattern] = {}
+    def __init__(self, cache_size: int = 1024):
+        self._compiled_patterns = RegexCache(cache_size)
+    
+    def compile(self, pattern: str, case_sensitive: bool = False) -> re.Pattern:
+        """Kompiliertes Pattern mit denselben Flags wie ``find_regex_matches``.
+        
+        Raises:
+            re.error: bei ungültigem Pattern
+        """
+        return self._compiled_patterns.get(pattern, 0 if case_sensitive else re.IGNORECASE)
+    
+    def warm(self, patterns: Iterable[Tuple[str, bool]]) -> int:
+        """Kompiliert (pattern, case_sensitive)-Paare vorab, z.B. beim Laden der Marker.
+        
+        Returns:
+            Anzahl gültiger Patterns
+        """
+        compiled = 0
+        for pattern, case_sensitive in patterns:
+            try:
+                self.compile(pattern, case_sensitive)
+                compiled += 1
+            except re.error as e:
+                logger.error(f"Ungültiges Regex-Pattern '{pattern}': {e}")
+        return compiled
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._compiled_patterns.stats()
     
     def find_regex_matches(
         self,
@@ -200,11 +498,7 @@ class RegexMatcher:
         for pattern in patterns:
             try:
                 # Compile und cache Pattern
-                cache_key = f"{pattern}_{flags}"
-                if cache_key not in self._compiled_patterns:
-                    self._compiled_patterns[cache_key] = re.compile(pattern, flags)
-                
-                regex = self._compiled_patterns[cache_key]
+                regex = self._compiled_patterns.get(pattern, flags)
                 
                 for match in regex.finditer(text):
                     matches.append((
@@ -223,7 +517,8 @@ class RegexMatcher:
         self,
         text: str,
         position: int,
-        context_words: int = 10
+        context_words: int = 10,
+        offsets: Optional[TokenOffsets] = None
     ) -> str:
         """Extrahiert Kontext um eine Position im Text.
         
@@ -231,27 +526,19 @@ class RegexMatcher:
             text: Der Gesamttext
             position: Position im Text
             context_words: Anzahl Wörter vor/nach der Position
+            offsets: Wort-Offsets von ``text``, falls schon berechnet
             
         Returns:
             Kontext-String
         """
-        words = text.split()
-        word_positions = []
-        current_pos = 0
-        
-        # Finde Wort-Positionen
-        for word in words:
-            word_start = text.find(word, current_pos)
-            word_end = word_start + len(word)
-            word_positions.append((word_start, word_end))
-            current_pos = word_end
+        if offsets is None:
+            offsets = TokenOffsets(text)
+        words = offsets.words
         
         # Finde Wort, das die Position enthält
-        target_word_idx = 0
-        for i, (start, end) in enumerate(word_positions):
-            if start <= position <= end:
-                target_word_idx = i
-                break
+        target_word_idx = offsets.token_at(position)
+        if target_word_idx is None:
+            target_word_idx = 0
         
         # Extrahiere Kontext
         start_idx = max(0, target_word_idx - context_words)
@@ -264,4 +551,4 @@ class RegexMatcher:
             relative_idx = target_word_idx - start_idx
             context_words_list[relative_idx] = f"**{context_words_list[relative_idx]}**"
         
-        return ' '.join(context_words_list)
\ No newline at end of file
+        return ' '.join(context_words_list)
@@ -0,0 +1,168 @@
+"""
+importer_benchmark.py
+Durchsatz-Benchmark der Chat-Importer. Erzeugt synthetische Exporte
+(Signal-NDJSON, DiscordChatExporter-JSON, mbox) und misst MB/s und
+Messages/s von ``iter_messages`` sowie optional von ``TextChunker.chunk_file``.
+
+Usage:
+    python -m chunker.importer_benchmark --messages 200000
+    python -m chunker.importer_benchmark --format discord --messages 1000000 --chunk
+    python -m chunker.importer_benchmark --file export.mbox --format mbox
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .chat_importers import IMPORTERS, ChatImporter
+
+_SPEAKERS = ["Anna Schmidt", "Ben", "Clara M.", "Dieter"]
+_PHRASES = [
+    "Hast du kurz Zeit?",
+    "Ich weiß nicht, ob das so eine gute Idee ist.",
+    "Klar, lass uns morgen darüber reden.",
+    "Du hast dich schon wieder nicht gemeldet...",
+    "Danke dir, das hilft mir wirklich weiter!",
+    "Immer dasselbe mit dir.",
+]
+
+
+# --------------------------------------------------------------
+# Synthetische Exporte
+
+
+def _conversation(messages: int, seed: int) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    timestamp = datetime(2024, 1, 1, 8, 0, tzinfo=timezone.utc)
+    for _ in range(messages):
+        timestamp += timedelta(seconds=rng.choice((20, 90, 300, 7200)))
+        yield {
+            "speaker": rng.choice(_SPEAKERS),
+            "text": " ".join(rng.choices(_PHRASES, k=rng.randint(1, 4))),
+            "timestamp": timestamp,
+        }
+
+
+def write_signal(path: Path, messages: int, seed: int = 0):
+    with open(path, "w", encoding="utf-8") as f:
+        for i, msg in enumerate(_conversation(messages, seed)):
+            millis = int(msg["timestamp"].timestamp() * 1000)
+            envelope = {"source": f"+4917{i % 4:08d}", "sourceName": msg["speaker"],
+                        "timestamp": millis}
+            envelope["dataMessage"] = {"timestamp": millis, "message": msg["text"]}
+            f.write(json.dumps({"envelope": envelope, "account": "+4917000000000"}) + "\n")
+            if i % 10 == 0:
+                receipt = {"source": envelope["source"], "timestamp": millis,
+                           "receiptMessage": {"isDelivery": True, "timestamps": [millis]}}
+                f.write(json.dumps({"envelope": receipt, "account": "+4917000000000"}) + "\n")
+
+
+def write_discord(path: Path, messages: int, seed: int = 0):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "guild": {"id": "1", "name": "Benchmark"},\n'
+                '  "channel": {"id": "2", "type": "GuildTextChat", "name": "allgemein"},\n'
+                '  "messages": [\n')
+        for i, msg in enumerate(_conversation(messages, seed)):
+            item = {
+                "id": str(10 ** 17 + i),
+                "type": "Default",
+                "timestamp": msg["timestamp"].isoformat(timespec="milliseconds"),
+                "content": msg["text"],
+                "author": {"id": str(_SPEAKERS.index(msg["speaker"])),
+                           "name": msg["speaker"].lower().replace(" ", "_"),
+                           "nickname": msg["speaker"]},
+                "attachments": [],
+                "reactions": [],
+            }
+            f.write(("    " if i == 0 else ",\n    ") + json.dumps(item, indent=2))
+        f.write(f'\n  ],\n  "messageCount": {messages}\n}}\n')
+
+
+def write_mbox(path: Path, messages: int, seed: int = 0):
+    with open(path, "w", encoding="utf-8") as f:
+        for i, msg in enumerate(_conversation(messages, seed)):
+            address = msg["speaker"].split()[0].lower() + "@example.org"
+            f.write(f"From {address} {msg['timestamp']:%a %b %d %H:%M:%S %Y}\n"
+                    f"From: {msg['speaker']} <{address}>\n"
+                    f"To: team@example.org\n"
+                    f"Subject: Nachricht {i}\n"
+                    f"Date: {format_datetime(msg['timestamp'])}\n"
+                    f"Message-ID: <{i}@example.org>\n"
+                    f"Content-Type: text/plain; charset=utf-8\n"
+                    f"\n"
+                    f"{msg['text']}\n"
+                    f">From der Vorlage zitiert.\n"
+                    f"\n")
+
+
+WRITERS = {"signal": write_signal, "discord": write_discord, "mbox": write_mbox}
+
+
+# --------------------------------------------------------------
+# Messung
+
+
+def benchmark(importer: ChatImporter, path: Path, chunk: bool = False) -> Dict[str, Any]:
+    """Misst einen vollständigen Durchlauf über ``path``."""
+    size = path.stat().st_size
+    start = time.perf_counter()
+    if chunk:
+        from .text_chunker import TextChunker
+        count = sum(1 for _ in TextChunker().chunk_file(path, format_hint=importer.name))
+        unit = "chunks"
+    else:
+        count = sum(1 for _ in importer.iter_messages(path))
+        unit = "messages"
+    elapsed = time.perf_counter() - start
+    return {
+        "format": importer.name,
+        "bytes": size,
+        unit: count,
+        "seconds": elapsed,
+        "mb_per_s": size / 1e6 / elapsed if elapsed else float("inf"),
+        f"{unit}_per_s": count / elapsed if elapsed else float("inf"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the streaming chat importers")
+    parser.add_argument("--format", choices=sorted(IMPORTERS), action="append",
+                        help="Importer (mehrfach möglich; Standard: alle)")
+    parser.add_argument("--file", type=Path,
+                        help="Vorhandenen Export messen statt zu synthetisieren")
+    parser.add_argument("--messages", type=int, default=100_000,
+                        help="Messages pro synthetischem Export")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", action="store_true",
+                        help="Zusätzlich TextChunker.chunk_file messen")
+    args = parser.parse_args(argv)
+
+    formats = args.format or sorted(IMPORTERS)
+    if args.file and len(formats) != 1:
+        parser.error("--file benötigt genau ein --format")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in formats:
+            path = args.file
+            if path is None:
+                path = Path(tmp) / f"export.{name}"
+                WRITERS[name](path, args.messages, args.seed)
+            results.append(benchmark(IMPORTERS[name], path))
+            if args.chunk:
+                results.append(benchmark(IMPORTERS[name], path, chunk=True))
+
+    for result in results:
+        print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
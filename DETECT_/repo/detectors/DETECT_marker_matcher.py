@@ -1,21 +1,35 @@
 """Marker Matcher - Hauptmodul für Marker-Erkennung."""
 
 import logging
-from typing import List, Dict, Optional, Set, Tuple
+import re
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Set, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 
 from .marker_models import (
-    MarkerDefinition, MarkerMatch, MarkerStatistics, 
+    MarkerDefinition, MarkerMatch, MarkerMatchRecord, MarkerStatistics, 
     MarkerCategory, MarkerSeverity
 )
-from .fuzzy_engine import FuzzyMatcher, RegexMatcher
-from ..chunker.chunk_models import TextChunk
+from .fuzzy_engine import FuzzyMatcher, QGramIndex, RegexMatcher, TokenOffsets
+from ..chunker.chunk_models import TextChunk, TextChunkRecord
 from ..config.config_loader import MarkerLoader, MarkerConfig
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class MarkerPlan:
+    """Vorab aufgelöste Suche für einen Marker; hängt nicht vom Chunk ab."""
+    marker: MarkerDefinition
+    regexes: Tuple[re.Pattern, ...]
+    regex_context_words: int
+    fuzzy_patterns: Tuple[str, ...]
+    fuzzy_index: Optional[QGramIndex]
+    fuzzy_threshold: float
+    fuzzy_context_words: Optional[int]
+
+
 class MarkerMatcher:
     """Hauptklasse für Marker-Matching in Text-Chunks."""
     
@@ -30,6 +44,7 @@ class MarkerMatcher:
         self.regex_matcher = RegexMatcher()
         
         self._markers: Dict[str, MarkerDefinition] = {}
+        self._plans: Dict[str, MarkerPlan] = {}
         self._semantic_groups: Dict[str, Dict[str, List[str]]] = {}
         
     def load_markers(self, path: Optional[Path] = None) -> int:
@@ -61,12 +76,15 @@ class MarkerMatcher:
         # Baue semantische Gruppen
         self._build_semantic_groups()
         
+        # Regexe, Fuzzy-Index und Schwellen vorab auflösen
+        self._build_plans()
+        
         logger.info(f"Geladen: {len(self._markers)} Marker")
         return len(self._markers)
     
     def find_matches(
         self,
-        chunks: List[TextChunk],
+        chunks: List[Union[TextChunk, TextChunkRecord]],
         categories: Optional[List[MarkerCategory]] = None,
         min_confidence: float = 0.7
     ) -> List[MarkerMatch]:
@@ -80,21 +98,38 @@ class MarkerMatcher:
         Returns:
             Liste aller gefundenen Marker-Matches
         """
+        return [
+            match.to_model()
+            for match in self.find_match_records(chunks, categories, min_confidence)
+        ]
+    
+    def find_match_records(
+        self,
+        chunks: List[Union[TextChunk, TextChunkRecord]],
+        categories: Optional[List[MarkerCategory]] = None,
+        min_confidence: float = 0.7
+    ) -> List[MarkerMatchRecord]:
+        """Wie ``find_matches``, liefert aber MarkerMatchRecords für die
+        interne Pipeline (ohne Pydantic-Objekte pro Treffer)."""
         all_matches = []
         
         # Lade Marker neu wenn Auto-Reload aktiv
-        if self.config.auto_reload:
-            self.loader.reload_if_changed()
+        if self.config.auto_reload and self.loader.reload_if_changed():
+            self._markers = self.loader.get_all_markers()
+            self._build_semantic_groups()
+            self._build_plans()
         
         # Filtere Marker nach Kategorien
-        active_markers = self._get_active_markers(categories)
+        active_plans = [
+            self._get_plan(marker) for marker in self._get_active_markers(categories)
+        ]
         
-        logger.info(f"Suche mit {len(active_markers)} aktiven Markern in {len(chunks)} Chunks")
+        logger.info(f"Suche mit {len(active_plans)} aktiven Markern in {len(chunks)} Chunks")
         
         for chunk in chunks:
             chunk_matches = self._find_matches_in_chunk(
                 chunk,
-                active_markers,
+                active_plans,
                 min_confidence
             )
             all_matches.extend(chunk_matches)
@@ -131,7 +166,7 @@ class MarkerMatcher:
     
     def get_statistics(
         self,
-        matches: List[MarkerMatch]
+        matches: List[Union[MarkerMatch, MarkerMatchRecord]]
     ) -> MarkerStatistics:
         """Berechnet Statistiken über gefundene Matches.
         
@@ -139,9 +174,9 @@ class MarkerMatcher:
             matches: Liste von Marker-Matches
             
         Returns:
-            Statistik-Objekt
+            Statistik-Objekt (inkl. Zustand des Regex-Caches)
         """
-        stats = MarkerStatistics()
+        stats = MarkerStatistics(regex_cache=self.regex_matcher.cache_stats())
         
         if not matches:
             return stats
@@ -181,46 +216,36 @@ class MarkerMatcher:
     
     def _find_matches_in_chunk(
         self,
-        chunk: TextChunk,
-        markers: List[MarkerDefinition],
+        chunk: Union[TextChunk, TextChunkRecord],
+        plans: List[MarkerPlan],
         min_confidence: float
-    ) -> List[MarkerMatch]:
+    ) -> List[MarkerMatchRecord]:
         """Findet Matches in einem einzelnen Chunk."""
         matches = []
         chunk_text = chunk.text
+        # Wort-Offsets einmal pro Chunk für Fuzzy-Positionen und Kontext
+        offsets = TokenOffsets(chunk_text)
         
-        for marker in markers:
-            # Sammle alle Patterns
-            patterns = marker.get_all_patterns()
-            if not patterns:
-                continue
+        for plan in plans:
+            marker = plan.marker
             
             # Regex-Patterns
-            regex_patterns = [
-                p.pattern for p in marker.patterns 
-                if p.is_regex
-            ]
-            
-            if regex_patterns:
-                regex_matches = self.regex_matcher.find_regex_matches(
-                    chunk_text,
-                    regex_patterns,
-                    case_sensitive=any(p.case_sensitive for p in marker.patterns if p.is_regex)
-                )
-                
-                for match_text, start, end in regex_matches:
+            for regex in plan.regexes:
+                for regex_match in regex.finditer(chunk_text):
+                    start = regex_match.start()
                     context = self.regex_matcher.extract_context(
                         chunk_text,
                         start,
-                        context_words=marker.patterns[0].context_words or 10
+                        context_words=plan.regex_context_words,
+                        offsets=offsets
                     )
                     
-                    match = MarkerMatch(
+                    match = MarkerMatchRecord(
                         marker_id=marker.id,
                         marker_name=marker.name,
                         category=marker.category,
                         severity=marker.severity,
-                        text=match_text,
+                        text=regex_match.group(),
                         context=context,
                         chunk_id=chunk.id,
                         position=chunk.start_pos + start,
@@ -235,25 +260,13 @@ class MarkerMatcher:
                     matches.append(match)
             
             # Fuzzy-Matching für Keywords und nicht-Regex Patterns
-            fuzzy_patterns = []
-            fuzzy_patterns.extend(marker.keywords)
-            fuzzy_patterns.extend([
-                p.pattern for p in marker.patterns 
-                if not p.is_regex
-            ])
-            
-            if fuzzy_patterns:
-                # Bestimme Threshold
-                threshold = min(
-                    p.fuzzy_threshold or self.fuzzy_matcher.threshold
-                    for p in marker.patterns
-                    if p.fuzzy_threshold is not None
-                ) if marker.patterns else self.fuzzy_matcher.threshold
-                
+            if plan.fuzzy_patterns:
                 fuzzy_matches = self.fuzzy_matcher.find_fuzzy_matches(
                     chunk_text,
-                    fuzzy_patterns,
-                    threshold=max(threshold, min_confidence)
+                    list(plan.fuzzy_patterns),
+                    threshold=max(plan.fuzzy_threshold, min_confidence),
+                    offsets=offsets,
+                    index=plan.fuzzy_index
                 )
                 
                 for match_text, start, end, confidence in fuzzy_matches:
@@ -263,10 +276,11 @@ class MarkerMatcher:
                     context = self.regex_matcher.extract_context(
                         chunk_text,
                         start,
-                        context_words=marker.patterns[0].context_words if marker.patterns else 10
+                        context_words=plan.fuzzy_context_words,
+                        offsets=offsets
                     )
                     
-                    match = MarkerMatch(
+                    match = MarkerMatchRecord(
                         marker_id=marker.id,
                         marker_name=marker.name,
                         category=marker.category,
@@ -287,6 +301,54 @@ class MarkerMatcher:
         
         return matches
     
+    def _build_plans(self):
+        """Kompiliert die Pläne aller aktiven Marker (nach Laden/Reload)."""
+        self._plans = {
+            marker.id: self._compile_plan(marker)
+            for marker in self._markers.values()
+            if marker.active
+        }
+    
+    def _get_plan(self, marker: MarkerDefinition) -> MarkerPlan:
+        """Plan eines Markers; wird neu gebaut, wenn der Marker ersetzt wurde."""
+        plan = self._plans.get(marker.id)
+        if plan is None or plan.marker is not marker:
+            plan = self._plans[marker.id] = self._compile_plan(marker)
+        return plan
+    
+    def _compile_plan(self, marker: MarkerDefinition) -> MarkerPlan:
+        """Löst alles auf, was ``_find_matches_in_chunk`` pro Marker braucht."""
+        regex_patterns = [p for p in marker.patterns if p.is_regex]
+        fuzzy_patterns = tuple(marker.keywords) + tuple(
+            p.pattern for p in marker.patterns if not p.is_regex
+        )
+        
+        case_sensitive = any(p.case_sensitive for p in regex_patterns)
+        regexes = []
+        for p in regex_patterns:
+            try:
+                regexes.append(self.regex_matcher.compile(p.pattern, case_sensitive))
+            except re.error as e:
+                logger.error(f"Ungültiges Regex-Pattern '{p.pattern}' in Marker {marker.id}: {e}")
+        
+        # Niedrigste Pattern-Schwelle des Markers, sonst die des FuzzyMatchers
+        thresholds = [
+            p.fuzzy_threshold or self.fuzzy_matcher.threshold
+            for p in marker.patterns
+            if p.fuzzy_threshold is not None
+        ]
+        
+        return MarkerPlan(
+            marker=marker,
+            regexes=tuple(regexes),
+            regex_context_words=(marker.patterns[0].context_words or 10) if marker.patterns else 10,
+            fuzzy_patterns=fuzzy_patterns,
+            fuzzy_index=(self.fuzzy_matcher.get_index(list(fuzzy_patterns))
+                         if fuzzy_patterns else None),
+            fuzzy_threshold=min(thresholds) if thresholds else self.fuzzy_matcher.threshold,
+            fuzzy_context_words=marker.patterns[0].context_words if marker.patterns else 10
+        )
+    
     def _get_active_markers(
         self,
         categories: Optional[List[MarkerCategory]] = None
@@ -5,6 +5,8 @@ from datetime import datetime
 from enum import Enum
 from pydantic import BaseModel, Field, validator
 
+from ..chunker.chunk_models import construct_model
+
 
 class MarkerCategory(str, Enum):
     """Kategorien für verschiedene Marker-Typen."""
@@ -134,6 +136,81 @@ class MarkerMatch(BaseModel):
     )
 
 
+class MarkerMatchRecord:
+    """Schlankes Gegenstück zu MarkerMatch für die interne Pipeline.
+    
+    Gleiche Felder als __slots__ ohne Pydantic-Validierung; ``to_model()``
+    erzeugt das MarkerMatch erst an der API-Grenze.
+    """
+    
+    __slots__ = (
+        'marker_id', 'marker_name', 'category', 'severity', 'text', 'context',
+        'chunk_id', 'position', 'confidence', 'speaker', 'timestamp', 'metadata'
+    )
+    
+    def __init__(
+        self,
+        marker_id: str,
+        marker_name: str,
+        category: MarkerCategory,
+        severity: MarkerSeverity,
+        text: str,
+        context: str,
+        chunk_id: str,
+        position: int,
+        confidence: float,
+        speaker: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.marker_id = marker_id
+        self.marker_name = marker_name
+        self.category = category
+        self.severity = severity
+        self.text = text
+        self.context = context
+        self.chunk_id = chunk_id
+        self.position = position
+        self.confidence = confidence
+        self.speaker = speaker
+        self.timestamp = timestamp
+        self.metadata = metadata if metadata is not None else {}
+    
+    @classmethod
+    def from_model(cls, match: MarkerMatch) -> "MarkerMatchRecord":
+        return cls(*(getattr(match, name) for name in cls.__slots__))
+    
+    def to_model(self) -> MarkerMatch:
+        """MarkerMatch ohne erneute Validierung."""
+        return construct_model(MarkerMatch, {
+            'marker_id': self.marker_id,
+            'marker_name': self.marker_name,
+            'category': self.category,
+            'severity': self.severity,
+            'text': self.text,
+            'context': self.context,
+            'chunk_id': self.chunk_id,
+            'position': self.position,
+            'confidence': self.confidence,
+            'speaker': self.speaker,
+            'timestamp': self.timestamp,
+            'metadata': self.metadata
+        })
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MarkerMatchRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"MarkerMatchRecord(marker_id={self.marker_id!r}, chunk_id={self.chunk_id!r}, "
+            f"position={self.position!r}, confidence={self.confidence!r})"
+        )
+
+
 class MarkerStatistics(BaseModel):
     """Statistiken über Marker-Treffer."""
     
@@ -152,6 +229,11 @@ class MarkerStatistics(BaseModel):
         default_factory=list,
         description="Top Marker nach Häufigkeit"
     )
+    
+    regex_cache: Dict[str, Union[int, float]] = Field(
+        default_factory=dict,
+        description="Zustand des Regex-Caches (Einträge, Trefferquote, Kompilierzeit)"
+    )
 
 
 class MarkerProfile(BaseModel):
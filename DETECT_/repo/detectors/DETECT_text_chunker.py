@@ -1,19 +1,159 @@
 """Text Chunker für intelligente Text-Segmentierung."""
 
+import codecs
+import io
+import mmap
+import os
 import re
 import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple, Dict, Any
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Dict, Any, Union
 import logging
 from uuid import uuid4
 
 from .chunk_models import (
-    TextChunk, ChunkType, Speaker, ChunkingConfig, ChunkingResult
+    TextChunkRecord, ChunkType, SpeakerRecord, ChunkingConfig, ChunkingResult
 )
+from .chat_importers import ChatImporter, detect_importer, get_importer, iter_decoded_blocks
 
 logger = logging.getLogger(__name__)
 
 
+# Feld-Regexe wie in _strptime, damit der schnelle Pfad dieselben Strings akzeptiert
+_TIMESTAMP_FIELDS = {
+    'd': r'(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])',
+    'm': r'(1[0-2]|0[1-9]|[1-9])',
+    'y': r'(\d\d)',
+    'Y': r'(\d\d\d\d)',
+    'H': r'(2[0-3]|[0-1]\d|\d)',
+    'M': r'([0-5]\d|\d)',
+    'S': r'(6[0-1]|[0-5]\d|\d)',
+}
+# Werte fehlender Felder wie bei strptime: (Jahr, Monat, Tag, Stunde, Minute, Sekunde)
+_TIMESTAMP_DEFAULTS = (1900, 1, 1, 0, 0, 0)
+
+
+class CompiledTimestampFormat:
+    """Vorkompiliertes strptime-Format mit rein numerischen Feldern.
+    
+    Liefert für jeden String dasselbe wie ``datetime.strptime(s, format)``
+    (bzw. None statt ValueError), ohne dessen Overhead pro Aufruf.
+    """
+    
+    def __init__(self, fmt: str):
+        self.format = fmt
+        parts = []
+        fields = []
+        for directive, literal in re.findall(r'%(.)|([^%]+)', fmt):
+            if directive:
+                if directive not in _TIMESTAMP_FIELDS:
+                    raise ValueError(f"Nicht unterstützte Direktive: %{directive}")
+                parts.append(_TIMESTAMP_FIELDS[directive])
+                fields.append(directive)
+            else:
+                # Leerraum im Format steht wie bei strptime für beliebig viel Leerraum
+                parts.append(r'\s+'.join(re.escape(p) for p in re.split(r'\s+', literal)))
+        self._regex = re.compile(''.join(parts), re.IGNORECASE)
+        self._two_digit_year = 'y' in fields
+        year = 'y' if self._two_digit_year else 'Y'
+        self._index = tuple(
+            fields.index(f) if f in fields else None
+            for f in (year, 'm', 'd', 'H', 'M', 'S')
+        )
+    
+    def parse(self, text: str) -> Optional[datetime]:
+        match = self._regex.fullmatch(text)
+        if match is None:
+            return None
+        groups = match.groups()
+        year, month, day, hour, minute, second = (
+            int(groups[i]) if i is not None else default
+            for i, default in zip(self._index, _TIMESTAMP_DEFAULTS)
+        )
+        if self._two_digit_year:
+            # Wie strptime: 69-99 -> 19xx, 00-68 -> 20xx
+            year += 1900 if year >= 69 else 2000
+        try:
+            return datetime(year, month, day, hour, minute, second)
+        except ValueError:
+            return None
+
+
+class TimestampParser:
+    """Zeitstempel-Parser mit Formaterkennung pro Export.
+    
+    Das Format wird einmal aus einer Stichprobe von Headern bestimmt und
+    vorkompiliert; wiederkehrende Strings (mehrere Messages pro Minute)
+    kommen aus einem kleinen Cache. Nur wenn ein String nicht zum erkannten
+    Format passt, werden alle FORMATS der Reihe nach mit strptime probiert.
+    """
+    
+    FORMATS = [
+        "%d.%m.%Y %H:%M",
+        "%d.%m.%Y %H:%M:%S",
+        "%d/%m/%Y %H:%M",
+        "%m/%d/%Y %H:%M",
+        "%d.%m.%y, %H:%M",
+        "%d/%m/%y, %H:%M",
+        "%Y-%m-%d %H:%M:%S",
+    ]
+    SAMPLE_SIZE = 100
+    CACHE_SIZE = 4096
+    
+    def __init__(self):
+        self.format: Optional[str] = None
+        self._compiled: Optional[CompiledTimestampFormat] = None
+        self._cache: Dict[str, datetime] = {}
+    
+    def infer(self, samples: Iterable[str]) -> Optional[str]:
+        """Wählt das Format, das die meisten Stichproben parst (bei Gleichstand
+        das frühere in FORMATS), und verwendet es ab sofort."""
+        samples = [s.strip() for s in islice(samples, self.SAMPLE_SIZE)]
+        best, best_count = None, 0
+        for fmt in self.FORMATS:
+            compiled = CompiledTimestampFormat(fmt)
+            count = sum(1 for s in samples if compiled.parse(s) is not None)
+            if count > best_count:
+                best, best_count = fmt, count
+        self.use(best)
+        return best
+    
+    def use(self, fmt: Optional[str]):
+        """Setzt das Format des aktuellen Exports (None: nur Fallback)."""
+        self.format = fmt
+        self._compiled = CompiledTimestampFormat(fmt) if fmt else None
+        self._cache.clear()
+    
+    def parse(self, timestamp_str: str) -> Optional[datetime]:
+        cached = self._cache.get(timestamp_str)
+        if cached is not None:
+            return cached
+        
+        text = timestamp_str.strip()
+        timestamp = self._compiled.parse(text) if self._compiled else None
+        if timestamp is None:
+            timestamp = self._parse_any(text)
+        
+        if timestamp is not None:
+            if len(self._cache) >= self.CACHE_SIZE:
+                # Exporte sind chronologisch; alte Einträge werden nicht mehr gebraucht
+                self._cache.clear()
+            self._cache[timestamp_str] = timestamp
+        return timestamp
+    
+    def _parse_any(self, text: str) -> Optional[datetime]:
+        # Verschiedene Formate probieren
+        for fmt in self.FORMATS:
+            try:
+                return datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+        return None
+
+
 class TextChunker:
     """Segmentiert Texte intelligent in analysierbare Chunks."""
     
@@ -42,9 +182,13 @@ class TextChunker:
         re.compile(r'\d{1,2}/\d{1,2}/\d{2,4}\s+\d{1,2}:\d{2}'),
     ]
     
+    # Zeichen am Dateianfang für die Formaterkennung in chunk_file
+    FORMAT_SAMPLE_SIZE = 64 * 1024
+    
     def __init__(self, config: Optional[ChunkingConfig] = None):
         self.config = config or ChunkingConfig()
-        self._speaker_map: Dict[str, Speaker] = {}
+        self._speaker_map: Dict[str, SpeakerRecord] = {}
+        self._timestamps = TimestampParser()
         
     def chunk_text(
         self, 
@@ -67,6 +211,7 @@ class TextChunker:
             # Format erkennen
             chat_format = format_hint or self._detect_format(text)
             logger.info(f"Erkanntes Format: {chat_format}")
+            self._infer_timestamp_format(text, chat_format)
             
             # Parse Messages
             messages = self._parse_messages(text, chat_format)
@@ -79,16 +224,17 @@ class TextChunker:
                     start_pos=0,
                     end_pos=len(text)
                 )
-                result.chunks = [chunk]
+                chunks = [chunk]
             else:
                 # Chunks aus Messages erstellen
-                result.chunks = self._create_chunks_from_messages(messages)
-            
-            # Speakers sammeln
-            result.speakers = list(self._speaker_map.values())
+                chunks = self._create_chunks_from_messages(messages)
             
             # Statistiken
-            result.statistics = self._calculate_statistics(result.chunks)
+            result.statistics = self._calculate_statistics(chunks)
+            
+            # Erst an der API-Grenze in Pydantic-Modelle umwandeln
+            result.chunks = [chunk.to_model() for chunk in chunks]
+            result.speakers = [speaker.to_model() for speaker in self._speaker_map.values()]
             
         except Exception as e:
             logger.error(f"Fehler beim Chunking: {e}")
@@ -97,6 +243,336 @@ class TextChunker:
         result.processing_time = time.time() - start_time
         return result
     
+    def chunk_file(
+        self,
+        path: Union[str, Path],
+        format_hint: Optional[str] = None,
+        encoding: str = "utf-8",
+        statistics: Optional["ChunkStatistics"] = None,
+        block_size: int = 1 << 20
+    ) -> Iterator[TextChunkRecord]:
+        """Segmentiert einen Chat-Export direkt aus der Datei, Chunk für Chunk.
+        
+        Die Datei wird per mmap gelesen und blockweise dekodiert. Im Speicher
+        liegen nur der aktuelle Block, die noch offene Message und der offene
+        Chunk, unabhängig von der Dateigröße. Ohne ``format_hint`` wird das
+        Format an den ersten ``FORMAT_SAMPLE_SIZE`` Zeichen erkannt. Plain
+        Text wird, anders als in ``chunk_text``, in Absatz-Chunks bis
+        ``max_chunk_size`` zerlegt. Exporte ohne Zeilenformat (Signal,
+        Discord, mbox) liest ein registrierter ``ChatImporter``; deren
+        Positionen sind Zeichen-Offsets der Einträge in der Datei.
+        
+        Args:
+            path: Pfad zum Export
+            format_hint: Hinweis auf Format (whatsapp, telegram, signal, discord, mbox, etc.)
+            encoding: Zeichenkodierung (ungültige Bytes werden ersetzt)
+            statistics: Wird, falls angegeben, mit jedem Chunk aktualisiert
+            block_size: Bytes pro Lese- und Dekodierschritt
+            
+        Yields:
+            TextChunkRecords in Dateireihenfolge (``to_model()`` liefert das
+            TextChunk); Positionen sind Zeichen-Offsets wie bei
+            ``chunk_text(datei.read())``
+        """
+        blocks = self._iter_decoded_blocks(path, encoding, block_size)
+        sample = self._take_sample(blocks)
+        if not sample:
+            return
+        
+        importer = self._find_importer(sample, format_hint)
+        if importer is not None:
+            blocks.close()
+            logger.info(f"Erkanntes Format: {importer.name}")
+            chunks = self._iter_chunks_from_messages(importer.iter_messages(path, encoding))
+        else:
+            chat_format = format_hint or self._detect_format(sample[:self.FORMAT_SAMPLE_SIZE])
+            logger.info(f"Erkanntes Format: {chat_format}")
+            self._infer_timestamp_format(sample, chat_format)
+            
+            blocks = self._prepend(sample, blocks)
+            if self._get_pattern(chat_format) is None:
+                chunks = self._iter_plain_chunks(blocks)
+            else:
+                messages = self._iter_stream_messages(blocks, chat_format)
+                chunks = self._iter_chunks_from_messages(messages)
+        
+        for chunk in self._link_chunks(chunks):
+            if statistics is not None:
+                statistics.add(chunk)
+            yield chunk
+    
+    def chunk_file_parallel(
+        self,
+        path: Union[str, Path],
+        format_hint: Optional[str] = None,
+        encoding: str = "utf-8",
+        statistics: Optional["ChunkStatistics"] = None,
+        executor: Optional[Executor] = None,
+        range_size: int = 16 << 20
+    ) -> Iterator[TextChunkRecord]:
+        """Wie ``chunk_file``, aber die Datei wird in Byte-Bereiche an
+        Message-Grenzen zerlegt, die in einem Prozess-Pool geparst werden.
+        
+        Die Worker parsen Messages (inkl. Zeitstempel) und bilden Chunks ab
+        dem ersten erzwungenen Split (Sprecherwechsel/Zeitsprung) ihres
+        Bereichs. Die Messages davor und der offene letzte Chunk werden hier
+        über die Nahtstellen hinweg gruppiert; Sprecher-IDs und Chunk-Links
+        werden in Dateireihenfolge vergeben. Das Ergebnis entspricht damit
+        ``chunk_file`` (bis auf die zufälligen Chunk-IDs).
+        
+        Nur für ASCII-kompatible Kodierungen (UTF-8, Latin-1, ...), da
+        Zeilenenden auf Byte-Ebene gesucht werden.
+        
+        Args:
+            path: Pfad zum Export
+            format_hint: Hinweis auf Format (whatsapp, telegram, etc.)
+            encoding: Zeichenkodierung (ungültige Bytes werden ersetzt)
+            statistics: Wird, falls angegeben, mit jedem Chunk aktualisiert
+            executor: Eigener Executor; sonst ein ProcessPoolExecutor
+            range_size: Ungefähre Bytes pro Bereich
+            
+        Yields:
+            TextChunkRecords in Dateireihenfolge
+        """
+        blocks = self._iter_decoded_blocks(path, encoding, self.FORMAT_SAMPLE_SIZE)
+        sample = self._take_sample(blocks)
+        blocks.close()
+        if self._find_importer(sample, format_hint) is not None:
+            # Importer lesen ihr Format selbst inkrementell
+            yield from self.chunk_file(path, format_hint, encoding, statistics)
+            return
+        chat_format = format_hint or self._detect_format(sample[:self.FORMAT_SAMPLE_SIZE])
+        pattern = self._get_pattern(chat_format)
+        
+        bounds = self._find_range_bounds(path, pattern, encoding, range_size) if pattern else []
+        if len(bounds) < 3:
+            # Plain Text oder nur ein Bereich: sequentiell
+            yield from self.chunk_file(path, chat_format, encoding, statistics)
+            return
+        logger.info(f"Erkanntes Format: {chat_format}, {len(bounds) - 1} Bereiche")
+        self._infer_timestamp_format(sample, chat_format)
+        
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor()
+        try:
+            results = executor.map(
+                _chunk_byte_range,
+                *zip(*[
+                    (path, start, end, encoding, chat_format, self.config, self._timestamps.format)
+                    for start, end in zip(bounds, bounds[1:])
+                ])
+            )
+            chunks = self._stitch_ranges(results)
+            for chunk in self._link_chunks(chunks):
+                if statistics is not None:
+                    statistics.add(chunk)
+                yield chunk
+        finally:
+            if own_executor:
+                executor.shutdown(cancel_futures=True)
+    
+    def _chunk_range(
+        self, 
+        text: str, 
+        chat_format: str
+    ) -> Tuple[List[Dict[str, Any]], List[TextChunkRecord], List[Dict[str, Any]], int]:
+        """Verarbeitet einen Bereich im Worker.
+        
+        Returns:
+            (Messages vor dem ersten erzwungenen Split, Chunks ab diesem Split,
+            Messages des offenen letzten Chunks, Zeichenanzahl des Bereichs)
+        """
+        messages = list(self._iter_messages(text, chat_format))
+        split = next(
+            (i for i in range(1, len(messages))
+             if self._is_forced_split(messages[i - 1], messages[i])),
+            None
+        )
+        if split is None:
+            return messages, [], [], len(text)
+        
+        # Ab einem erzwungenen Split hängt die Gruppierung nicht mehr vom Zustand davor ab
+        tail: List[Dict[str, Any]] = []
+        body = list(self._iter_chunks_from_messages(messages[split:], open_tail=tail))
+        return messages[:split], body, tail, len(text)
+    
+    def _stitch_ranges(self, results: Iterable[Tuple]) -> Iterator[TextChunkRecord]:
+        """Fügt die Worker-Ergebnisse in Dateireihenfolge zusammen."""
+        carry: List[Dict[str, Any]] = []
+        offset = 0
+        for head, body, tail, char_count in results:
+            for msg in head + tail:
+                msg['start_pos'] += offset
+                msg['end_pos'] += offset
+            for chunk in body:
+                chunk.start_pos += offset
+                chunk.end_pos += offset
+            offset += char_count
+            
+            carry.extend(head)
+            if body or tail:
+                # Vor body/tail liegt ein erzwungener Split: offene Messages abschließen
+                yield from self._iter_chunks_from_messages(carry)
+                for chunk in body:
+                    if chunk.speaker:
+                        chunk.speaker = self._get_or_create_speaker(chunk.speaker.name)
+                    yield chunk
+                carry = tail
+        yield from self._iter_chunks_from_messages(carry)
+    
+    def _find_range_bounds(
+        self, 
+        path: Union[str, Path], 
+        pattern: re.Pattern, 
+        encoding: str, 
+        range_size: int
+    ) -> List[int]:
+        """Byte-Grenzen der Bereiche; jede innere Grenze ist ein Message-Start."""
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                bounds = [0]
+                for target in range(range_size, size, range_size):
+                    if target <= bounds[-1]:
+                        continue
+                    seam = self._find_seam(mapped, target, target + range_size, pattern, encoding)
+                    if seam is not None:
+                        bounds.append(seam)
+        bounds.append(size)
+        return bounds
+    
+    @staticmethod
+    def _find_seam(
+        mapped: mmap.mmap, 
+        start: int, 
+        limit: int, 
+        pattern: re.Pattern, 
+        encoding: str
+    ) -> Optional[int]:
+        """Erster Zeilenanfang ab ``start``, an dem die sequentielle Suche
+        sicher eine neue Message findet.
+        
+        Die Vorzeile muss selbst eine vollständige, einzeilige Message mit
+        nicht-leerem Text sein: dann endet jeder Treffer, der sie abdeckt, an
+        ihrem Zeilenende, und der nächste Treffer beginnt an dieser Zeile.
+        """
+        line_start = mapped.rfind(b"\n", 0, start) + 1
+        previous_complete = False
+        while line_start < min(limit, len(mapped)):
+            line_end = mapped.find(b"\n", line_start)
+            if line_end == -1:
+                return None
+            line = mapped[line_start:line_end].decode(encoding, errors="replace").rstrip("\r")
+            if line_start >= start and previous_complete and pattern.match(line):
+                return line_start
+            match = pattern.fullmatch(line)
+            previous_complete = bool(match and match.group(match.lastindex))
+            line_start = line_end + 1
+        return None
+    
+    def _take_sample(self, blocks: Iterator[str]) -> str:
+        """Liest Blöcke, bis mindestens ``FORMAT_SAMPLE_SIZE`` Zeichen vorliegen."""
+        sample = ""
+        for block in blocks:
+            sample += block
+            if len(sample) >= self.FORMAT_SAMPLE_SIZE:
+                break
+        return sample
+    
+    @staticmethod
+    def _iter_decoded_blocks(
+        path: Union[str, Path], 
+        encoding: str, 
+        block_size: int
+    ) -> Iterator[str]:
+        """Dekodiert eine Datei blockweise über mmap (Zeilenenden wie im Textmodus)."""
+        return iter_decoded_blocks(path, encoding, block_size)
+    
+    def _find_importer(self, sample: str, format_hint: Optional[str]) -> Optional[ChatImporter]:
+        """Importer für Exporte ohne Zeilenformat (per Hinweis oder Dateianfang)."""
+        if format_hint:
+            return get_importer(format_hint)
+        return detect_importer(sample[:self.FORMAT_SAMPLE_SIZE])
+    
+    @staticmethod
+    def _prepend(first: str, rest: Iterator[str]) -> Iterator[str]:
+        yield first
+        yield from rest
+    
+    def _iter_stream_messages(
+        self, 
+        blocks: Iterable[str], 
+        format_type: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Wie ``_iter_messages``, aber über dekodierte Blöcke.
+        
+        Gesucht wird nur in vollständigen Zeilen. Die letzte gefundene Message
+        kann im nächsten Block weitergehen; der Puffer beginnt daher immer an
+        ihrem Start und wird mit dem nächsten Block erneut durchsucht.
+        """
+        pattern = self._get_pattern(format_type)
+        with_timestamp = format_type in ["whatsapp", "telegram"]
+        buffer = ""
+        offset = 0  # Zeichen-Offset von buffer[0] in der Datei
+        
+        for block in self._prepend_final(blocks):
+            final = block is None
+            if not final:
+                buffer += block
+            complete = len(buffer) if final else buffer.rfind("\n") + 1
+            
+            pending = None
+            for match in pattern.finditer(buffer, 0, complete):
+                if pending is not None:
+                    yield self._build_message(
+                        buffer, pending, match.start(), with_timestamp, offset
+                    )
+                pending = match
+            
+            if pending is None:
+                # Text vor der ersten Message wird wie in chunk_text verworfen
+                buffer = buffer[complete:]
+                offset += complete
+            elif final:
+                yield self._build_message(buffer, pending, len(buffer), with_timestamp, offset)
+            else:
+                buffer = buffer[pending.start():]
+                offset += pending.start()
+    
+    @staticmethod
+    def _prepend_final(blocks: Iterable[str]) -> Iterator[Optional[str]]:
+        """Blöcke gefolgt von None als Ende-Markierung."""
+        yield from blocks
+        yield None
+    
+    def _iter_plain_chunks(self, blocks: Iterable[str]) -> Iterator[TextChunkRecord]:
+        """Zerlegt Plain Text in Absatz-Chunks bis max_chunk_size (an Zeilenenden)."""
+        max_size = self.config.max_chunk_size
+        buffer = ""
+        offset = 0
+        
+        for block in self._prepend_final(blocks):
+            final = block is None
+            if not final:
+                buffer += block
+            while len(buffer) >= max_size or (final and buffer):
+                cut = len(buffer) if final and len(buffer) < max_size else (
+                    buffer.rfind("\n", 0, max_size) + 1 or max_size
+                )
+                text = buffer[:cut]
+                if text.strip():
+                    yield self._create_chunk(
+                        text=text,
+                        chunk_type=ChunkType.PARAGRAPH,
+                        start_pos=offset,
+                        end_pos=offset + cut
+                    )
+                buffer = buffer[cut:]
+                offset += cut
+    
     def _detect_format(self, text: str) -> str:
         """Erkennt das Chat-Format automatisch."""
         # Teste verschiedene Patterns
@@ -115,138 +591,178 @@ class TextChunker:
         format_type: str
     ) -> List[Dict[str, Any]]:
         """Parst Messages aus dem Text basierend auf Format."""
-        messages = []
-        
+        return list(self._iter_messages(text, format_type))
+    
+    def _get_pattern(self, format_type: str) -> Optional[re.Pattern]:
+        """Gibt das Message-Pattern für ein Format zurück (None für Plain Text)."""
         if format_type == "whatsapp":
-            pattern = self.WHATSAPP_PATTERN
+            return self.WHATSAPP_PATTERN
         elif format_type == "telegram":
-            pattern = self.TELEGRAM_PATTERN
+            return self.TELEGRAM_PATTERN
         elif format_type == "generic":
-            pattern = self.GENERIC_PATTERN
-        else:
+            return self.GENERIC_PATTERN
+        return None
+    
+    def _iter_messages(
+        self, 
+        text: str, 
+        format_type: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Liefert Messages in einem Durchlauf über den Text.
+        
+        Das Ende einer Message ist der Start des nächsten finditer-Treffers;
+        die Message wird daher erst ausgegeben, wenn der nächste Treffer
+        (oder das Textende) erreicht ist.
+        """
+        pattern = self._get_pattern(format_type)
+        if pattern is None:
             # Plain text - keine Messages
-            return []
+            return
         
-        last_end = 0
+        with_timestamp = format_type in ["whatsapp", "telegram"]
+        pending = None
         
         for match in pattern.finditer(text):
-            if format_type in ["whatsapp", "telegram"]:
-                timestamp_str, speaker, message = match.groups()
-                timestamp = self._parse_timestamp(timestamp_str)
-            else:
-                speaker, message = match.groups()
-                timestamp = None
-            
-            # Multi-line Messages zusammenführen
-            start = match.start()
-            end = match.end()
-            
-            # Finde nächste Message oder Ende
-            next_match = pattern.search(text, end)
-            if next_match:
-                message_end = next_match.start()
-            else:
-                message_end = len(text)
-            
-            # Erweitere Message bis zur nächsten
-            full_message = text[match.end():message_end].strip()
-            if full_message:
-                message = message + "\n" + full_message
-            
-            messages.append({
-                'speaker': speaker.strip(),
-                'text': message.strip(),
-                'timestamp': timestamp,
-                'start_pos': start,
-                'end_pos': message_end
-            })
-            
-            last_end = message_end
+            if pending is not None:
+                yield self._build_message(text, pending, match.start(), with_timestamp)
+            pending = match
+        
+        if pending is not None:
+            yield self._build_message(text, pending, len(text), with_timestamp)
+    
+    def _build_message(
+        self, 
+        text: str, 
+        match: re.Match, 
+        message_end: int, 
+        with_timestamp: bool,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """Erstellt eine Message aus ihrem Treffer und dem Start der nächsten.
+        
+        ``offset`` ist die Position von ``text`` im Gesamttext.
+        """
+        if with_timestamp:
+            timestamp_str, speaker, message = match.groups()
+            timestamp = self._parse_timestamp(timestamp_str)
+        else:
+            speaker, message = match.groups()
+            timestamp = None
+        
+        # Multi-line Messages zusammenführen
+        full_message = text[match.end():message_end].strip()
+        if full_message:
+            message = message + "\n" + full_message
         
-        return messages
+        return {
+            'speaker': speaker.strip(),
+            'text': message.strip(),
+            'timestamp': timestamp,
+            'start_pos': offset + match.start(),
+            'end_pos': offset + message_end
+        }
     
     def _parse_timestamp(self, timestamp_str: str) -> Optional[datetime]:
         """Versucht einen Zeitstempel zu parsen."""
-        # Verschiedene Formate probieren
-        formats = [
-            "%d.%m.%Y %H:%M",
-            "%d.%m.%Y %H:%M:%S",
-            "%d/%m/%Y %H:%M",
-            "%m/%d/%Y %H:%M",
-            "%d.%m.%y, %H:%M",
-            "%d/%m/%y, %H:%M",
-            "%Y-%m-%d %H:%M:%S",
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(timestamp_str.strip(), fmt)
-            except ValueError:
-                continue
-        
-        logger.warning(f"Konnte Zeitstempel nicht parsen: {timestamp_str}")
-        return None
+        timestamp = self._timestamps.parse(timestamp_str)
+        if timestamp is None:
+            logger.warning(f"Konnte Zeitstempel nicht parsen: {timestamp_str}")
+        return timestamp
+    
+    def _infer_timestamp_format(self, text: str, chat_format: str):
+        """Bestimmt das Zeitstempel-Format des Exports aus den ersten Headern."""
+        if chat_format not in ["whatsapp", "telegram"]:
+            self._timestamps.use(None)
+            return
+        pattern = self._get_pattern(chat_format)
+        headers = islice(pattern.finditer(text), TimestampParser.SAMPLE_SIZE)
+        fmt = self._timestamps.infer(match.group(1) for match in headers)
+        logger.info(f"Zeitstempel-Format: {fmt}")
     
     def _create_chunks_from_messages(
         self, 
         messages: List[Dict[str, Any]]
-    ) -> List[TextChunk]:
+    ) -> List[TextChunkRecord]:
         """Erstellt Chunks aus geparsten Messages."""
-        chunks = []
+        return list(self._link_chunks(self._iter_chunks_from_messages(messages)))
+    
+    def _iter_chunks_from_messages(
+        self, 
+        messages: Iterable[Dict[str, Any]],
+        open_tail: Optional[List[Dict[str, Any]]] = None
+    ) -> Iterator[TextChunkRecord]:
+        """Gruppiert Messages zu Chunks, sobald ein Chunk abgeschlossen ist.
+        
+        Ist ``open_tail`` angegeben, wird der letzte Chunk nicht erzeugt;
+        seine Messages werden stattdessen dort abgelegt.
+        """
         current_chunk_messages = []
-        current_speaker = None
-        last_timestamp = None
+        current_size = 0
+        previous = None
         
-        for i, msg in enumerate(messages):
-            speaker_name = msg['speaker']
-            timestamp = msg['timestamp']
-            
-            # Entscheide ob neuer Chunk nötig
-            need_new_chunk = False
-            
-            # Bei Sprecherwechsel
-            if self.config.chunk_by_speaker and speaker_name != current_speaker:
-                need_new_chunk = True
-            
-            # Bei Zeitsprung
-            if (self.config.chunk_by_time and 
-                last_timestamp and timestamp and
-                (timestamp - last_timestamp).total_seconds() > self.config.time_gap_minutes * 60):
-                need_new_chunk = True
+        for msg in messages:
+            # Entscheide ob neuer Chunk nötig (Sprecherwechsel, Zeitsprung)
+            need_new_chunk = self._is_forced_split(previous, msg)
             
-            # Bei Größenlimit
-            current_size = sum(len(m['text']) for m in current_chunk_messages)
+            # Bei Größenlimit (laufende Summe statt Neuberechnung pro Message)
             if current_size + len(msg['text']) > self.config.max_chunk_size:
                 need_new_chunk = True
             
             # Erstelle neuen Chunk wenn nötig
             if need_new_chunk and current_chunk_messages:
-                chunk = self._create_chunk_from_messages(current_chunk_messages)
-                chunks.append(chunk)
+                yield self._create_chunk_from_messages(current_chunk_messages)
                 current_chunk_messages = []
+                current_size = 0
             
             current_chunk_messages.append(msg)
-            current_speaker = speaker_name
-            last_timestamp = timestamp
+            current_size += len(msg['text'])
+            previous = msg
         
         # Letzten Chunk erstellen
-        if current_chunk_messages:
-            chunk = self._create_chunk_from_messages(current_chunk_messages)
-            chunks.append(chunk)
-        
-        # Chunk-IDs verlinken
-        for i in range(len(chunks)):
-            if i > 0:
-                chunks[i].previous_chunk_id = chunks[i-1].id
-            if i < len(chunks) - 1:
-                chunks[i].next_chunk_id = chunks[i+1].id
+        if open_tail is not None:
+            open_tail.extend(current_chunk_messages)
+        elif current_chunk_messages:
+            yield self._create_chunk_from_messages(current_chunk_messages)
+    
+    def _is_forced_split(
+        self, 
+        previous: Optional[Dict[str, Any]], 
+        msg: Dict[str, Any]
+    ) -> bool:
+        """Neuer Chunk unabhängig von der Größe: Sprecherwechsel oder Zeitsprung."""
+        # Bei Sprecherwechsel
+        if self.config.chunk_by_speaker and (
+            previous is None or msg['speaker'] != previous['speaker']
+        ):
+            return True
         
-        return chunks
+        # Bei Zeitsprung
+        if previous is None:
+            return False
+        last_timestamp, timestamp = previous['timestamp'], msg['timestamp']
+        return bool(
+            self.config.chunk_by_time and
+            last_timestamp and timestamp and
+            (timestamp - last_timestamp).total_seconds() > self.config.time_gap_minutes * 60
+        )
+    
+    @staticmethod
+    def _link_chunks(chunks: Iterable[TextChunkRecord]) -> Iterator[TextChunkRecord]:
+        """Verlinkt Chunk-IDs; jeder Chunk wird ausgegeben, sobald sein Nachfolger feststeht."""
+        previous = None
+        for chunk in chunks:
+            if previous is not None:
+                chunk.previous_chunk_id = previous.id
+                previous.next_chunk_id = chunk.id
+                yield previous
+            previous = chunk
+        if previous is not None:
+            yield previous
     
     def _create_chunk_from_messages(
         self, 
         messages: List[Dict[str, Any]]
-    ) -> TextChunk:
+    ) -> TextChunkRecord:
         """Erstellt einen Chunk aus einer Liste von Messages."""
         # Text zusammenführen
         texts = []
@@ -288,10 +804,10 @@ class TextChunker:
         chunk_type: ChunkType,
         start_pos: int,
         end_pos: int,
-        speaker: Optional[Speaker] = None,
+        speaker: Optional[SpeakerRecord] = None,
         timestamp: Optional[datetime] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> TextChunk:
+    ) -> TextChunkRecord:
         """Erstellt einen einzelnen Chunk."""
         chunk_id = f"chunk_{uuid4().hex[:8]}"
         
@@ -299,7 +815,7 @@ class TextChunker:
         if self.config.normalize_whitespace:
             text = ' '.join(text.split())
         
-        return TextChunk(
+        return TextChunkRecord(
             id=chunk_id,
             type=chunk_type,
             text=text,
@@ -310,56 +826,100 @@ class TextChunker:
             metadata=metadata or {}
         )
     
-    def _get_or_create_speaker(self, name: str) -> Speaker:
+    def _get_or_create_speaker(self, name: str) -> SpeakerRecord:
         """Holt oder erstellt einen Speaker."""
         if name not in self._speaker_map:
             speaker_id = f"speaker_{len(self._speaker_map) + 1}"
-            self._speaker_map[name] = Speaker(
+            self._speaker_map[name] = SpeakerRecord(
                 id=speaker_id,
                 name=name
             )
         return self._speaker_map[name]
     
-    def _calculate_statistics(self, chunks: List[TextChunk]) -> Dict[str, Any]:
+    def _calculate_statistics(self, chunks: List[TextChunkRecord]) -> Dict[str, Any]:
         """Berechnet Statistiken über die Chunks."""
-        if not chunks:
-            return {}
-        
-        total_words = sum(c.word_count for c in chunks)
-        total_chars = sum(c.char_count for c in chunks)
+        statistics = ChunkStatistics()
+        for chunk in chunks:
+            statistics.add(chunk)
+        return statistics.to_dict()
+
+
+def _chunk_byte_range(
+    path: Union[str, Path],
+    start: int,
+    end: int,
+    encoding: str,
+    chat_format: str,
+    config: ChunkingConfig,
+    timestamp_format: Optional[str]
+) -> Tuple[List[Dict[str, Any]], List[TextChunkRecord], List[Dict[str, Any]], int]:
+    """Worker für chunk_file_parallel: dekodiert und verarbeitet einen Byte-Bereich."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = mapped[start:end]
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(encoding)(errors="replace"),
+        translate=True
+    )
+    text = decoder.decode(data, final=True)
+    chunker = TextChunker(config)
+    chunker._timestamps.use(timestamp_format)
+    return chunker._chunk_range(text, chat_format)
+
+
+class ChunkStatistics:
+    """Online berechnete Chunk-Statistiken (ein Chunk nach dem anderen)."""
+    
+    def __init__(self):
+        self.total_chunks = 0
+        self.total_words = 0
+        self.total_chars = 0
+        self.first_timestamp: Optional[datetime] = None
+        self.last_timestamp: Optional[datetime] = None
+        self.speaker_stats: Dict[str, Dict[str, int]] = {}
+        self.chunk_types: Dict[str, int] = {t.value: 0 for t in ChunkType}
+    
+    def add(self, chunk: TextChunkRecord):
+        """Nimmt einen Chunk in die Statistik auf."""
+        self.total_chunks += 1
+        self.total_words += chunk.word_count
+        self.total_chars += chunk.char_count
+        self.chunk_types[chunk.type.value] += 1
         
         # Zeitspanne
-        timestamps = [c.timestamp for c in chunks if c.timestamp]
-        if timestamps:
-            time_span = max(timestamps) - min(timestamps)
+        if chunk.timestamp:
+            if self.first_timestamp is None or chunk.timestamp < self.first_timestamp:
+                self.first_timestamp = chunk.timestamp
+            if self.last_timestamp is None or chunk.timestamp > self.last_timestamp:
+                self.last_timestamp = chunk.timestamp
+        
+        # Speaker-Statistiken
+        if chunk.speaker:
+            stats = self.speaker_stats.setdefault(
+                chunk.speaker.name,
+                {'chunks': 0, 'words': 0, 'chars': 0}
+            )
+            stats['chunks'] += 1
+            stats['words'] += chunk.word_count
+            stats['chars'] += chunk.char_count
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Statistiken im Format von ChunkingResult.statistics."""
+        if not self.total_chunks:
+            return {}
+        
+        if self.first_timestamp is not None:
+            time_span = self.last_timestamp - self.first_timestamp
             time_span_hours = time_span.total_seconds() / 3600
         else:
             time_span_hours = 0
         
-        # Speaker-Statistiken
-        speaker_stats = {}
-        for chunk in chunks:
-            if chunk.speaker:
-                speaker_name = chunk.speaker.name
-                if speaker_name not in speaker_stats:
-                    speaker_stats[speaker_name] = {
-                        'chunks': 0,
-                        'words': 0,
-                        'chars': 0
-                    }
-                speaker_stats[speaker_name]['chunks'] += 1
-                speaker_stats[speaker_name]['words'] += chunk.word_count
-                speaker_stats[speaker_name]['chars'] += chunk.char_count
-        
         return {
-            'total_chunks': len(chunks),
-            'total_words': total_words,
-            'total_chars': total_chars,
-            'avg_chunk_size': total_chars / len(chunks) if chunks else 0,
+            'total_chunks': self.total_chunks,
+            'total_words': self.total_words,
+            'total_chars': self.total_chars,
+            'avg_chunk_size': self.total_chars / self.total_chunks,
             'time_span_hours': time_span_hours,
-            'speaker_stats': speaker_stats,
-            'chunk_types': {
-                t.value: sum(1 for c in chunks if c.type == t)
-                for t in ChunkType
-            }
-        }
\ No newline at end of file
+            'speaker_stats': {name: dict(stats) for name, stats in self.speaker_stats.items()},
+            'chunk_types': dict(self.chunk_types)
+        }
@@ -0,0 +1,79 @@
+"""
+admission.py
+Admission control for the analysis API: per-request size caps and a bound on
+the number of messages queued or running in the analysis pool.
+"""
+
+import math
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class AdmissionController:
+    """Tracks in-flight messages and decides whether new work is admitted.
+
+    Capacity is measured in messages, not requests, because analysis cost grows
+    with the number of messages. The Retry-After hint is derived from an
+    exponentially weighted average of the observed service time per message.
+    """
+
+    def __init__(
+        self,
+        max_inflight_messages: int = 5000,
+        max_messages_per_request: int = 2000,
+        max_request_text_chars: int = 1_000_000,
+        workers: int = 4,
+        max_retry_after: int = 60,
+    ):
+        self.max_inflight_messages = max_inflight_messages
+        self.max_messages_per_request = max_messages_per_request
+        self.max_request_text_chars = max_request_text_chars
+        self.workers = max(1, workers)
+        self.max_retry_after = max_retry_after
+
+        self._inflight_messages = 0
+        self._seconds_per_message = 0.01
+        self._lock = threading.Lock()
+
+    @property
+    def inflight_messages(self) -> int:
+        return self._inflight_messages
+
+    def check_size(self, messages: List[Dict[str, Any]]) -> Optional[str]:
+        """Returns an error detail if the request exceeds the per-request caps."""
+        if len(messages) > self.max_messages_per_request:
+            return (f"Too many messages: {len(messages)} "
+                    f"(limit {self.max_messages_per_request})")
+        text_chars = sum(len(m["text"]) for m in messages)
+        if text_chars > self.max_request_text_chars:
+            return (f"Request text too large: {text_chars} characters "
+                    f"(limit {self.max_request_text_chars})")
+        return None
+
+    def try_admit(self, message_count: int) -> bool:
+        """Reserves capacity for ``message_count`` messages; False when saturated."""
+        with self._lock:
+            if self._inflight_messages + message_count > self.max_inflight_messages:
+                return False
+            self._inflight_messages += message_count
+            return True
+
+    def release(self, message_count: int, service_time: float) -> None:
+        """Frees capacity once the work has finished and updates the per-message estimate."""
+        with self._lock:
+            self._inflight_messages = max(0, self._inflight_messages - message_count)
+            if message_count > 0:
+                observed = service_time / message_count
+                self._seconds_per_message = 0.8 * self._seconds_per_message + 0.2 * observed
+
+    def retry_after(self) -> int:
+        """Estimated seconds until the current backlog has drained."""
+        backlog = self._inflight_messages * self._seconds_per_message / self.workers
+        return int(min(self.max_retry_after, max(1, math.ceil(backlog))))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "inflight_messages": self._inflight_messages,
+            "max_inflight_messages": self.max_inflight_messages,
+            "saturated": self._inflight_messages >= self.max_inflight_messages,
+        }
@@ -3,44 +3,54 @@ api_service.py
 FastAPI service for the Marker Engine with endpoints for analysis, scoring, and drift.
 """
 
+import asyncio
 import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response
 from pydantic import BaseModel, validator
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 import hashlib
 import json
 from pathlib import Path
 import os
+import numpy as np
 
-from marker_engine_core import MarkerEngine
+from marker_engine_core import MarkerEngine, PRFX_LEVELS
 from scoring_adapter import run_scoring
+from scoring_registry import scoring_registry
 from drift_axes import DriftAxesManager
 from engine_digest import generate_engine_digest
+from admission import AdmissionController
+from artifact_store import ArtifactStore
+from metrics import (
+    REGISTRY, CONTENT_TYPE, STAGE_LATENCY, MESSAGES_TOTAL, HITS_TOTAL,
+    CACHE_HITS_TOTAL, CACHE_MISSES_TOTAL, POOL_QUEUE_DEPTH, INFLIGHT_MESSAGES, REJECTED_TOTAL
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global storage for artifacts (consider using a database in production)
-ARTIFACTS_DIR = Path("artifacts")
+# Artifacts are stored on disk so every worker process can serve them
+ARTIFACTS_DIR = Path(os.getenv("ARTIFACTS_DIR", "artifacts"))
 ARTIFACTS_DIR.mkdir(exist_ok=True)
 
 # Lifespan management
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    # Startup. Components are built once at import time (below), so preforked
+    # workers reuse the master's frozen engine instead of rebuilding it.
     logger.info("Starting Marker Engine API")
-    try:
-        global engine, drift_manager
-        engine = MarkerEngine()
-        drift_manager = DriftAxesManager()
-        logger.info("Components initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize components: {e}")
-        raise
+    logger.info(
+        f"Components ready: {len(engine.markers)} markers, {len(engine.detectors)} detectors"
+        + (" (frozen, shared copy-on-write)" if engine.frozen else "")
+    )
 
     yield
 
@@ -93,7 +103,14 @@ class AnalysisResponse(BaseModel):
 
 # Initialize components
 engine = MarkerEngine()
+# Marker files are read once per process; artifact keys include the set, since the
+# artifact store outlives restarts
+MARKER_SET_DIGEST = hashlib.sha256(json.dumps(
+    {"markers": dict(engine.markers), "detectors": engine.detectors}, sort_keys=True, default=str
+).encode()).hexdigest()
 drift_manager = DriftAxesManager()
+# Build and compile the shared scoring engine up front (shared by preforked workers)
+scoring_registry.engine
 
 # Data models
 class Message(BaseModel):
@@ -122,86 +139,286 @@ class AnalysisResponse(BaseModel):
     drift_events: List[Dict[str, Any]]
     engine_digest: str
 
-# Global storage for artifacts (in production, use proper database)
-artifacts = {}
+class CompactHit(BaseModel):
+    marker: str
+    source: Optional[str] = None
+    msg_range: Optional[List[int]] = None
+    evidence: Optional[List[int]] = None
 
-@app.post("/analyze", response_model=AnalysisResponse)
-async def analyze_conversation(request: ConversationRequest, background_tasks: BackgroundTasks):
-    """Analyze a conversation for markers, scores, and drift."""
-    try:
-        # Convert messages to engine format
-        messages = [
-            {
-                "id": msg.id,
-                "ts": msg.ts,
-                "speaker": msg.speaker,
-                "text": msg.text
-            }
-            for msg in request.messages
-        ]
-
-        # Run analysis
-        result = engine.analyze_conversation(messages, request.window, request.options)
-
-        # Run scoring
-        scoring_result = run_scoring(messages, result)
-
-        # Calculate drift
-        aggregated_scores = {}
-        if "aggregated_scores" in scoring_result:
-            aggregated_scores = scoring_result["aggregated_scores"]
+class CompactAnalysisResponse(BaseModel):
+    timestamp: str
+    summary: str
+    hits: List[CompactHit]
+    marker_counts: Dict[str, int]
+    scores: Dict[str, float]
+    drift_values: Dict[str, float]
+    drift_events: List[Dict[str, Any]]
+    engine_digest: str
+    view: str = "compact"
+    artifact: str
+
+# Analysis pool and admission control. Analyses run off the event loop so that
+# /health and /metrics stay responsive while the pool is busy.
+def configure_capacity(web_workers: int = 1) -> None:
+    """Builds the analysis pool and admission controller for one worker process.
+
+    MAX_WORKERS and MAX_INFLIGHT_MESSAGES are budgets for the whole server; with
+    ``web_workers`` processes each one gets an equal share. Per-request caps apply
+    unchanged in every process.
+    """
+    global ANALYSIS_WORKERS, analysis_pool, admission
+    web_workers = max(1, web_workers)
+    ANALYSIS_WORKERS = max(1, int(os.getenv("MAX_WORKERS", "4")) // web_workers)
+    analysis_pool = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="analysis")
+    admission = AdmissionController(
+        max_inflight_messages=max(
+            1, int(os.getenv("MAX_INFLIGHT_MESSAGES", "5000")) // web_workers
+        ),
+        max_messages_per_request=int(os.getenv("MAX_MESSAGES_PER_REQUEST", "2000")),
+        max_request_text_chars=int(os.getenv("MAX_REQUEST_TEXT_CHARS", "1000000")),
+        workers=ANALYSIS_WORKERS
+    )
+
+# WEB_WORKERS is set by the launcher for uvicorn --workers; prefork reconfigures before forking
+configure_capacity(int(os.getenv("WEB_WORKERS", "1")))
+
+def _marker_level(marker_id: str) -> str:
+    """Returns the marker level (ATO/SEM/CLU/MEMA) for metric labels."""
+    for prefix in PRFX_LEVELS:
+        if marker_id.startswith(prefix):
+            return prefix.rstrip("_")
+    return "OTHER"
+
+def _json_default(obj: Any) -> Any:
+    """Fallback for json.dumps on values the engine may emit (numpy scalars, datetimes)."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# Analysis artifacts, shared by all workers through ARTIFACTS_DIR
+artifact_store = ArtifactStore(
+    ARTIFACTS_DIR,
+    max_entries=int(os.getenv("ARTIFACTS_MAX_ENTRIES", "1000")),
+    max_age_seconds=float(os.getenv("ARTIFACTS_TTL_SECONDS", "86400")),
+    json_default=_json_default
+)
 
-        drift_values = drift_manager.calculate_drift_values(aggregated_scores)
-        drift_events = drift_manager.check_thresholds(drift_values)
+def _json_response(payload: Dict[str, Any]) -> Response:
+    """Serializes engine output once, without pydantic re-validation of the hit dicts."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+    return Response(content=body.encode("utf-8"), media_type="application/json")
 
-        # Generate engine digest
-        engine_digest = hashlib.sha256(json.dumps({
-            "markers": list(engine.markers.keys()),
-            "detectors": [d.get("id") for d in engine.detectors],
-            "timestamp": datetime.utcnow().isoformat()
-        }).encode()).hexdigest()
-
-        # Prepare response
-        response = AnalysisResponse(
-            timestamp=datetime.utcnow().isoformat(),
-            summary=result["summary"],
-            hits=result["hits"],
-            scores=result.get("scores", {}),
-            drift_values=drift_values,
-            drift_events=[
-                {
-                    "axis_id": event.axis_id,
-                    "axis_name": event.axis_name,
-                    "value": event.value,
-                    "threshold": event.threshold,
-                    "direction": event.direction,
-                    "timestamp": event.timestamp.isoformat(),
-                    "metadata": event.metadata
-                }
-                for event in drift_events
-            ],
-            engine_digest=engine_digest
-        )
+def _serialize_drift_event(event) -> Dict[str, Any]:
+    return {
+        "axis_id": event.axis_id,
+        "axis_name": event.axis_name,
+        "value": event.value,
+        "threshold": event.threshold,
+        "direction": event.direction,
+        "timestamp": event.timestamp.isoformat(),
+        "metadata": event.metadata
+    }
 
-        # Store artifact (write-once)
-        input_hash = hashlib.sha256(json.dumps([msg.dict() for msg in request.messages]).encode()).hexdigest()
-        artifacts[input_hash] = {
-            "input": request.dict(),
-            "output": response.dict(),
-            "timestamp": datetime.utcnow().isoformat()
+def _compact_hits(hits: List[Dict[str, Any]], messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Builds the compact hit view.
+
+    Each hit carries its marker id, source and the half-open message index range
+    of its window; activation evidence is returned as indices into the hit list
+    instead of nested copies. Full hits can be fetched via /artifacts/{hash}/hits/{index}.
+    """
+    msg_index = {m["id"]: i for i, m in enumerate(messages)}
+    hit_index = {id(hit): i for i, hit in enumerate(hits)}
+    marker_counts: Dict[str, int] = {}
+    compact = []
+
+    for hit in hits:
+        marker_id = hit["marker"]
+        marker_counts[marker_id] = marker_counts.get(marker_id, 0) + 1
+        entry: Dict[str, Any] = {"marker": marker_id, "source": hit.get("source")}
+        msg_ids = hit.get("msg_ids")
+        if msg_ids:
+            entry["msg_range"] = [msg_index.get(msg_ids[0]), msg_index.get(msg_ids[-1], -1) + 1]
+        if "evidence" in hit:
+            entry["evidence"] = [hit_index[id(e)] for e in hit["evidence"] if id(e) in hit_index]
+        compact.append(entry)
+
+    return {"hits": compact, "marker_counts": marker_counts}
+
+# Both shapes are documented; the handler returns a pre-serialized Response, so
+# neither model is used for validation
+@app.post("/analyze", response_model=Union[AnalysisResponse, CompactAnalysisResponse])
+async def analyze_conversation(
+    request: ConversationRequest,
+    background_tasks: BackgroundTasks,
+    view: str = Query("full", pattern="^(full|compact)$")
+):
+    """Analyze a conversation for markers, scores, and drift.
+
+    ``view=compact`` returns marker ids, message index ranges and counts, with
+    activation evidence given as references into the hit list.
+
+    Requests above the per-request caps are rejected with 413; when the analysis
+    pool already holds the maximum number of in-flight messages, with 429 and a
+    Retry-After estimate.
+    """
+    # Convert messages to engine format
+    messages = [
+        {
+            "id": msg.id,
+            "ts": msg.ts,
+            "speaker": msg.speaker,
+            "text": msg.text
         }
+        for msg in request.messages
+    ]
+
+    controller = admission
+    too_large = controller.check_size(messages)
+    if too_large:
+        REJECTED_TOTAL.inc(reason="too_large")
+        raise HTTPException(status_code=413, detail=too_large)
+
+    if not controller.try_admit(len(messages)):
+        REJECTED_TOTAL.inc(reason="saturated")
+        raise HTTPException(
+            status_code=429,
+            detail="Analysis queue is saturated",
+            headers={"Retry-After": str(controller.retry_after())}
+        )
+    INFLIGHT_MESSAGES.inc(len(messages))
+    MESSAGES_TOTAL.inc(len(messages))
 
-        return response
-
+    POOL_QUEUE_DEPTH.inc()
+    try:
+        future = analysis_pool.submit(_execute_analysis, controller, request, messages, view)
+        return await asyncio.wrap_future(future)
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    finally:
+        POOL_QUEUE_DEPTH.dec()
+
+def _execute_analysis(
+    controller: AdmissionController,
+    request: ConversationRequest,
+    messages: List[Dict[str, Any]],
+    view: str
+) -> Response:
+    """Runs in the analysis pool; releases the admitted capacity when the work is done."""
+    started = time.perf_counter()
+    try:
+        return _run_analysis(request, messages, view)
+    finally:
+        controller.release(len(messages), time.perf_counter() - started)
+        INFLIGHT_MESSAGES.dec(len(messages))
+
+def _artifact_key(
+    request: ConversationRequest,
+    messages: List[Dict[str, Any]],
+    scoring_digest: str
+) -> str:
+    """Artifact key: the input plus everything that changes the stored output.
+
+    Window and options change the hit list that compact responses reference by
+    index; the marker set and the scoring models change hits and scores. Stored
+    artifacts outlive restarts and /scores/reload, so a changed configuration
+    writes a new artifact instead of serving the old one.
+    """
+    return hashlib.sha256(json.dumps({
+        "messages": messages,
+        "window": request.window,
+        "options": request.options,
+        "markers": MARKER_SET_DIGEST,
+        "scoring": scoring_digest,
+    }, sort_keys=True).encode()).hexdigest()
+
+def _run_analysis(
+    request: ConversationRequest, messages: List[Dict[str, Any]], view: str
+) -> Response:
+    """Full pipeline: detection, activation, scoring, drift, artifact write and serialization."""
+    # Run analysis (detection and activation are timed inside the engine)
+    result = engine.analyze_conversation(messages, request.window, request.options)
+    for hit in result["hits"]:
+        HITS_TOTAL.inc(level=_marker_level(hit["marker"]))
+
+    # Run scoring; the engine is fetched once so the artifact key names the models used
+    scoring_engine = scoring_registry.engine
+    scoring_result = run_scoring(messages, result, engine=scoring_engine)
+    STAGE_LATENCY.observe(scoring_result.processing_time, stage="scoring")
+
+    # Calculate drift
+    with STAGE_LATENCY.time(stage="drift"):
+        aggregated_scores = scoring_result.aggregated_scores or {}
+
+        drift_values = drift_manager.calculate_drift_values(aggregated_scores)
+        drift_events = drift_manager.check_thresholds(drift_values)
+
+    # Generate engine digest
+    engine_digest = hashlib.sha256(json.dumps({
+        "markers": list(engine.markers.keys()),
+        "detectors": [d.get("id") for d in engine.detectors],
+        "timestamp": datetime.utcnow().isoformat()
+    }).encode()).hexdigest()
+
+    # Full output; engine hits are passed through by reference, not copied
+    output = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "summary": result["summary"],
+        "hits": result["hits"],
+        "scores": result.get("scores", {}),
+        "drift_values": drift_values,
+        "drift_events": [_serialize_drift_event(event) for event in drift_events],
+        "engine_digest": engine_digest
+    }
+
+    # Store artifact (write-once)
+    with STAGE_LATENCY.time(stage="artifact_write"):
+        input_hash = _artifact_key(request, messages, scoring_engine.model_digest)
+        if input_hash in artifact_store:
+            CACHE_HITS_TOTAL.inc(cache="artifacts")
+        else:
+            CACHE_MISSES_TOTAL.inc(cache="artifacts")
+            artifact_store.put(input_hash, {
+                "input": request.dict(),
+                "output": output,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+
+    with STAGE_LATENCY.time(stage="serialization"):
+        if view == "compact":
+            payload = {key: value for key, value in output.items() if key != "hits"}
+            payload.update(_compact_hits(result["hits"], messages))
+            payload["view"] = "compact"
+            payload["artifact"] = input_hash
+        else:
+            payload = output
+        response = _json_response(payload)
+
+    return response
 
 @app.get("/scores")
 async def get_scores():
-    """Get current scoring models and their definitions."""
+    """Get current scoring models and the registry version."""
     return {
-        "models": list(engine.models.keys()) if hasattr(engine, 'models') else [],
+        **scoring_registry.describe(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@app.post("/scores/reload")
+async def reload_scores():
+    """Reload scoring model definitions and hot-swap the scoring engine.
+
+    Requests already running keep the engine version they started with.
+    """
+    try:
+        version = await asyncio.get_running_loop().run_in_executor(None, scoring_registry.reload)
+    except Exception as e:
+        logger.error(f"Scoring model reload failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Reload failed: {e}")
+    return {
+        "version": version,
         "timestamp": datetime.utcnow().isoformat()
     }
 
@@ -211,36 +428,51 @@ async def get_drift():
     return {
         "axes": drift_manager.axes_definitions,
         "active_events": [
-            {
-                "axis_id": event.axis_id,
-                "axis_name": event.axis_name,
-                "value": event.value,
-                "threshold": event.threshold,
-                "direction": event.direction,
-                "timestamp": event.timestamp.isoformat(),
-                "metadata": event.metadata
-            }
-            for event in drift_manager.get_active_events()
+            _serialize_drift_event(event) for event in drift_manager.get_active_events()
         ],
         "timestamp": datetime.utcnow().isoformat()
     }
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint.
+
+    Served directly on the event loop and never subject to admission control, so a
+    saturated but healthy pod keeps answering its liveness probes.
+    """
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "load": admission.snapshot()
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Expose per-stage latency histograms and throughput counters (Prometheus text format)."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 @app.get("/artifacts/{input_hash}")
 async def get_artifact(input_hash: str):
     """Retrieve stored analysis artifact by input hash."""
-    if input_hash not in artifacts:
+    artifact = artifact_store.get(input_hash)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+
+    return artifact
+
+@app.get("/artifacts/{input_hash}/hits/{hit_index}")
+async def get_artifact_hit(input_hash: str, hit_index: int):
+    """Retrieve a single full hit (including evidence) referenced by a compact response."""
+    artifact = artifact_store.get(input_hash)
+    if artifact is None:
         raise HTTPException(status_code=404, detail="Artifact not found")
 
-    return artifacts[input_hash]
+    hits = artifact["output"]["hits"]
+    if not 0 <= hit_index < len(hits):
+        raise HTTPException(status_code=404, detail="Hit not found")
+
+    return _json_response(hits[hit_index])
 
 @app.on_event("startup")
 async def startup_event():
@@ -252,6 +484,38 @@ async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down Marker Engine API...")
 
-if __name__ == "__main__":
+def main():
+    """Console entry point. ``--prefork`` builds the engine once and forks workers sharing it."""
+    import argparse
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    parser = argparse.ArgumentParser(description="Marker Engine API server")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes. MAX_WORKERS and "
+                             "MAX_INFLIGHT_MESSAGES are split evenly across them; "
+                             "/metrics merges all workers")
+    parser.add_argument("--prefork", action="store_true",
+                        help="Fork workers from a master holding the frozen, precompiled engine")
+    args = parser.parse_args()
+
+    if args.prefork:
+        from prefork_server import serve_preforked
+        serve_preforked(args.host, args.port, args.workers)
+    elif args.workers > 1:
+        import tempfile
+        # Read by the freshly imported api_service/metrics in each uvicorn worker
+        os.environ["WEB_WORKERS"] = str(args.workers)
+        os.environ.setdefault("METRICS_MULTIPROC_DIR",
+                              tempfile.mkdtemp(prefix="marker-engine-metrics-"))
+        uvicorn.run("api_service:app", host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    # Run as a script, this module is __main__; register it under its import name so
+    # prefork_server's "import api_service" reuses it instead of building a second
+    # engine, pool and registry in the master
+    sys.modules.setdefault("api_service", sys.modules[__name__])
+    main()
@@ -0,0 +1,130 @@
+"""
+artifact_store.py
+File-backed store for analysis artifacts. Artifacts are written as one JSON file
+per input hash, so every worker process (uvicorn --workers, --prefork) resolves
+the references handed out by compact responses, not just the one that wrote them.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+_KEY = re.compile(r"^[0-9a-f]{64}$")
+
+
+class ArtifactStore:
+    """Write-once artifact files bounded by count and age.
+
+    Writes go to a temporary file that is renamed into place, so readers in
+    other processes never see a partial artifact. Pruning runs every
+    ``prune_interval`` writes and removes expired files first, then the oldest
+    ones until at most ``max_entries`` remain.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_entries: int = 1000,
+        max_age_seconds: float = 24 * 3600,
+        prune_interval: int = 16,
+        json_default: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.prune_interval = max(1, prune_interval)
+        self.json_default = json_default
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Optional[Path]:
+        # Keys are SHA-256 hex digests; anything else never touches the filesystem
+        if not _KEY.match(key):
+            return None
+        return self.directory / f"{key}.json"
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return self.max_age_seconds > 0 and now - mtime > self.max_age_seconds
+
+    def __contains__(self, key: str) -> bool:
+        path = self._path(key)
+        if path is None:
+            return False
+        try:
+            return not self._expired(path.stat().st_mtime, time.time())
+        except FileNotFoundError:
+            return False
+
+    def put(self, key: str, artifact: Dict[str, Any]) -> bool:
+        """Stores ``artifact`` unless it already exists; returns True when written."""
+        path = self._path(key)
+        if path is None:
+            raise ValueError(f"Invalid artifact key: {key!r}")
+        if key in self:
+            return False
+
+        body = json.dumps(
+            artifact, ensure_ascii=False, separators=(",", ":"), default=self.json_default
+        )
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(body)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.prune_interval == 0
+        if prune:
+            self.prune()
+        return True
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Loads an artifact; None if it is unknown, expired or already pruned."""
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            if self._expired(path.stat().st_mtime, time.time()):
+                return None
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def prune(self) -> int:
+        """Removes expired and surplus artifacts (oldest first); returns the number removed."""
+        now = time.time()
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json") or entry.name.startswith(".tmp-"):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+
+        surplus = max(0, len(entries) - self.max_entries) if self.max_entries > 0 else 0
+        removed = 0
+        for i, (mtime, path) in enumerate(entries):
+            if i >= surplus and not self._expired(mtime, now):
+                break
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
@@ -0,0 +1,110 @@
+"""LRU-Cache für Chunk-Scores, adressiert über Inhalt statt Chunk-ID."""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from marker_models import MarkerMatch
+
+# (raw_score, normalized_score, confidence, contributing_markers)
+CachedScore = Tuple[float, float, float, Tuple[Dict[str, Any], ...]]
+
+# (content_signature, model_id, model_version)
+CacheKey = Tuple[Tuple, str, int]
+
+_ENTRY_OVERHEAD = 200  # Schlüssel-Tupel, OrderedDict-Knoten, Ergebnis-Tupel (geschätzt)
+_SIGNATURE_BYTES_PER_MATCH = 80  # Tupel je Match in der Signatur (Felder werden geteilt)
+
+
+def content_signature(text: str, word_count: int, matches: List[MarkerMatch]) -> Tuple:
+    """Inhaltssignatur eines Chunks: Text-Hash plus alles, was aus den Matches in
+    den Score eingeht (Reihenfolge inklusive, da sie die Reihenfolge der
+    contributing_markers bestimmt). Nur Strings und Floats, damit das Hashing
+    vollständig in C läuft; wird einmal pro Chunk gebildet und für alle Modelle
+    wiederverwendet.
+    """
+    return (
+        hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),
+        word_count,
+        tuple(
+            (m.marker_id, m.marker_name, m.category.value, m.severity.value,
+             m.confidence, m.metadata.get('weight', 1.0))
+            for m in matches
+        )
+    )
+
+
+class ChunkScoreCache:
+    """Thread-sicherer LRU-Cache mit Speicherobergrenze.
+
+    Wiederkehrende Chunks (weitergeleitete Nachrichten, Grüße, Vorlagen) werden
+    über alle Requests hinweg nur einmal bewertet.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[CachedScore, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Beim Versand an Worker-Prozesse (ProcessPoolExecutor) nur die
+        # Konfiguration übertragen: Einträge und Lock bleiben im Elternprozess
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state.update(_entries=OrderedDict(), _bytes=0, hits=0, misses=0, evictions=0)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[CachedScore]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        return entry[0] if entry is not None else None
+
+    def put(self, key: CacheKey, value: CachedScore):
+        size = _ENTRY_OVERHEAD + _SIGNATURE_BYTES_PER_MATCH * len(key[0][2]) + sum(
+            sys.getsizeof(marker) + sum(sys.getsizeof(v) for v in marker.values())
+            for marker in value[3]
+        )
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
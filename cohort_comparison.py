@@ -0,0 +1,157 @@
+"""Kohortenvergleich: N Scoring-Ergebnisse als Delta-Matrizen und Verteilungen pro Modell."""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from score_models import AggregatedScore, ScoringResult
+
+# Gleiche Schwelle wie ScoringEngine.compare_scores ("Verbesserung"/"Verschlechterung")
+CHANGE_THRESHOLD = 0.5
+_PERCENTILES = (10, 25, 50, 75, 90)
+
+# ScoringResult oder gespeicherter Lauf: {score_type: AggregatedScore | {"average_score": ...}}
+RunLike = Union[ScoringResult, Mapping[str, Any]]
+
+
+def _aggregated(run: RunLike) -> Mapping[str, Any]:
+    if isinstance(run, ScoringResult):
+        return run.aggregated_scores
+    return run.get("aggregated_scores", run)
+
+
+def _average(score: Union[AggregatedScore, Mapping[str, Any]]) -> float:
+    if isinstance(score, AggregatedScore):
+        return score.average_score
+    return score["average_score"]
+
+
+@dataclass
+class CohortComparison:
+    """Gestapelte Durchschnitts-Scores (Lauf × Score-Typ, NaN = nicht vorhanden)."""
+    labels: List[str]
+    score_types: List[str]
+    averages: np.ndarray
+
+    def column(self, score_type: str) -> np.ndarray:
+        try:
+            return self.averages[:, self.score_types.index(score_type)]
+        except ValueError:
+            raise KeyError(f"Score-Typ nicht im Vergleich: {score_type}") from None
+
+    def delta_matrix(self, score_type: str, dtype=np.float64) -> np.ndarray:
+        """N×N-Matrix mit delta[i, j] = Score(j) - Score(i) (wie compare_scores(i, j)).
+
+        Fehlt der Score eines Laufs, sind Zeile und Spalte NaN. Für große N
+        bietet sich ``dtype=np.float32`` an (N² Einträge).
+        """
+        column = self.column(score_type).astype(dtype)
+        return column[None, :] - column[:, None]
+
+    def change_matrix(self, score_type: str, block_rows: int = 1024) -> np.ndarray:
+        """N×N-Matrix: +1 Verbesserung, -1 Verschlechterung, 0 stabil oder nicht vergleichbar.
+
+        Die Deltas werden wie in compare_scores in float64 gebildet (float32
+        klassifiziert Deltas nahe ±0.5 anders), aber nur blockweise über
+        ``block_rows`` Zeilen; gespeichert wird allein die int8-Matrix.
+        """
+        column = self.column(score_type)
+        change = np.zeros((column.size, column.size), dtype=np.int8)
+        for start in range(0, column.size, block_rows):
+            delta = column[None, :] - column[start:start + block_rows, None]
+            block = change[start:start + block_rows]
+            block[delta > CHANGE_THRESHOLD] = 1
+            block[delta < -CHANGE_THRESHOLD] = -1
+        return change
+
+    def summary(self, score_type: str) -> Dict[str, Any]:
+        """Verteilung eines Score-Typs über alle Läufe der Kohorte."""
+        return summarize_scores(self.column(score_type))
+
+
+def summarize_scores(values: np.ndarray) -> Dict[str, Any]:
+    """Kennzahlen einer Score-Verteilung (NaN-Einträge werden ignoriert)."""
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"count": 0}
+    percentiles = np.percentile(values, _PERCENTILES)
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        **{f"p{p}": float(v) for p, v in zip(_PERCENTILES, percentiles)}
+    }
+
+
+def stack_runs(
+    runs: Sequence[RunLike],
+    labels: Optional[Sequence[str]] = None,
+    score_types: Optional[Sequence[str]] = None
+) -> CohortComparison:
+    """Stapelt die aggregierten Scores von N Läufen zu einer Matrix (Lauf × Score-Typ)."""
+    aggregated = [_aggregated(run) for run in runs]
+    if labels is None:
+        labels = [str(i) for i in range(len(runs))]
+    elif len(labels) != len(runs):
+        raise ValueError(f"{len(labels)} Labels für {len(runs)} Läufe")
+
+    if score_types is None:
+        score_types = list(dict.fromkeys(t for scores in aggregated for t in scores))
+    type_index = {t: j for j, t in enumerate(score_types)}
+
+    averages = np.full((len(runs), len(score_types)), np.nan)
+    for i, scores in enumerate(aggregated):
+        for score_type, score in scores.items():
+            j = type_index.get(score_type)
+            if j is not None:
+                averages[i, j] = _average(score)
+
+    return CohortComparison(list(labels), list(score_types), averages)
+
+
+def compare_cohorts(
+    cohorts: Mapping[str, Sequence[RunLike]],
+    score_types: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """Vergleicht mehrere Kohorten miteinander.
+
+    Returns:
+        {"cohorts": [...], "score_types": [...],
+         "summaries": {kohorte: {score_type: Verteilung}},
+         "deltas": {score_type: K×K-Matrix der Kohorten-Mittelwerte (Liste)}}
+    """
+    if score_types is None:
+        score_types = list(dict.fromkeys(
+            t for runs in cohorts.values() for run in runs for t in _aggregated(run)
+        ))
+    stacked = {
+        name: stack_runs(runs, score_types=score_types)
+        for name, runs in cohorts.items()
+    }
+
+    names = list(cohorts)
+    summaries = {
+        name: {t: summarize_scores(comparison.column(t)) for t in score_types}
+        for name, comparison in stacked.items()
+    }
+
+    # Kohorten-Mittelwerte (Kohorte × Typ, NaN ohne Werte) und deren K×K-Deltas
+    means = np.full((len(names), len(score_types)), np.nan)
+    for k, comparison in enumerate(stacked.values()):
+        present = ~np.isnan(comparison.averages)
+        counts = present.sum(axis=0)
+        totals = np.where(present, comparison.averages, 0.0).sum(axis=0)
+        means[k, counts > 0] = totals[counts > 0] / counts[counts > 0]
+    means_comparison = CohortComparison(names, list(score_types), means)
+
+    return {
+        "cohorts": names,
+        "score_types": list(score_types),
+        "summaries": summaries,
+        "deltas": {
+            t: means_comparison.delta_matrix(t).tolist() for t in score_types
+        }
+    }
@@ -0,0 +1,153 @@
+"""Inkrementelle Aggregation von Chunk-Scores mit O(1)-Updates pro Chunk."""
+
+from typing import Dict, Iterable, List, Tuple
+
+from score_models import ScoringModel, ChunkScore, AggregatedScore, marker_names
+
+_DISTRIBUTION_BUCKETS = ("1-2", "3-4", "5-6", "7-8", "9-10")
+
+
+class RunningScore:
+    """Laufende Kennzahlen eines Modells: Summen für Mittelwert und Regression,
+    Min/Max, Verteilungs-Buckets und Top-k-Marker."""
+
+    def __init__(self, model: ScoringModel, top_k: int = 5):
+        self.model = model
+        self.top_k = top_k
+        self.count = 0
+        # Regression über x = 0..n-1; Σx und Σx² exakt als int
+        self.sum_x = 0
+        self.sum_xx = 0
+        self.sum_y = 0.0
+        self.sum_xy = 0.0
+        self.min_score = float('inf')
+        self.max_score = float('-inf')
+        self.distribution = dict.fromkeys(_DISTRIBUTION_BUCKETS, 0)
+        self.marker_counts: Dict[str, int] = {}
+        self._first_seen: Dict[str, int] = {}
+        self._top: List[str] = []
+
+    def add(self, chunk_score: ChunkScore):
+        """Nimmt einen Chunk-Score auf (O(1) plus O(k) je beitragendem Marker)."""
+        score = chunk_score.normalized_score
+        x = self.count
+        self.count += 1
+        self.sum_x += x
+        self.sum_xx += x * x
+        self.sum_y += score
+        self.sum_xy += x * score
+        if score < self.min_score:
+            self.min_score = score
+        if score > self.max_score:
+            self.max_score = score
+        self.distribution[self._bucket(score)] += 1
+
+        for name in marker_names(chunk_score.contributing_markers):
+            self._count_marker(name)
+
+    @staticmethod
+    def _bucket(score: float) -> str:
+        if score <= 2:
+            return "1-2"
+        elif score <= 4:
+            return "3-4"
+        elif score <= 6:
+            return "5-6"
+        elif score <= 8:
+            return "7-8"
+        return "9-10"
+
+    def _rank(self, name: str) -> Tuple[int, int]:
+        # Gleichstand: früher gesehene Marker zuerst (wie Counter.most_common)
+        return self.marker_counts[name], -self._first_seen[name]
+
+    def _count_marker(self, name: str):
+        if name not in self.marker_counts:
+            self._first_seen[name] = len(self._first_seen)
+            self.marker_counts[name] = 0
+        self.marker_counts[name] += 1
+
+        # Zähler wachsen nur; die Top-k ändern sich nur durch den erhöhten Marker
+        if name not in self._top:
+            if len(self._top) < self.top_k:
+                self._top.append(name)
+            elif self._rank(name) > self._rank(self._top[-1]):
+                self._top[-1] = name
+            else:
+                return
+        self._top.sort(key=self._rank, reverse=True)
+
+    @property
+    def average(self) -> float:
+        return self.sum_y / self.count if self.count else 0.0
+
+    def trend(self) -> Tuple[str, float]:
+        """Trend wie ScoringEngine._calculate_trend, aus den laufenden Summen."""
+        n = self.count
+        if n < 3:
+            return "stable", 0.0
+
+        slope = (n * self.sum_xy - self.sum_x * self.sum_y) / (n * self.sum_xx - self.sum_x ** 2)
+        mean = self.average
+        normalized_slope = slope / mean if mean > 0 else 0
+
+        if normalized_slope > 0.1:
+            return "improving", min(1.0, normalized_slope)
+        elif normalized_slope < -0.1:
+            return "declining", max(-1.0, normalized_slope)
+        else:
+            return "stable", normalized_slope
+
+    def snapshot(self) -> AggregatedScore:
+        trend, trend_strength = self.trend()
+        return AggregatedScore(
+            model_id=self.model.id,
+            score_type=self.model.type,
+            average_score=self.average,
+            min_score=self.min_score,
+            max_score=self.max_score,
+            trend=trend,
+            trend_strength=trend_strength,
+            chunk_count=self.count,
+            distribution=dict(self.distribution),
+            top_markers=[
+                {'name': name, 'count': self.marker_counts[name]}
+                for name in self._top
+            ]
+        )
+
+
+class IncrementalAggregator:
+    """Hält AggregatedScores pro Modell aktuell, während Chunks nacheinander
+    bewertet werden (Live-Sessions), ohne die Historie erneut zu durchlaufen.
+
+    Liefert dieselben Werte wie ScoringEngine._aggregate_scores über alle
+    bisher hinzugefügten Chunk-Scores.
+    """
+
+    def __init__(self, models: List[ScoringModel], top_k: int = 5):
+        self.models = list(models)
+        self._running: Dict[str, RunningScore] = {
+            model.id: RunningScore(model, top_k) for model in self.models
+        }
+
+    def add(self, chunk_score: ChunkScore):
+        """Nimmt einen Chunk-Score auf; Scores unbekannter Modelle werden ignoriert."""
+        running = self._running.get(chunk_score.model_id)
+        if running is not None:
+            running.add(chunk_score)
+
+    def add_many(self, chunk_scores: Iterable[ChunkScore]):
+        for chunk_score in chunk_scores:
+            self.add(chunk_score)
+
+    def aggregated_scores(self) -> Dict[str, AggregatedScore]:
+        """Aktueller Stand, Schlüssel wie ScoringResult.aggregated_scores."""
+        return {
+            model.type.value: self._running[model.id].snapshot()
+            for model in self.models
+            if self._running[model.id].count
+        }
+
+    def get(self, model_id: str) -> AggregatedScore:
+        return self._running[model_id].snapshot()
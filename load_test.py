@@ -0,0 +1,309 @@
+"""
+load_test.py
+Load generator for the analysis API. Replays JSONL request corpora, or conversations
+synthesised from marker ``examples``, against a running (or locally started)
+api_service and reports throughput, latency percentiles and error rate.
+
+Usage:
+    python load_test.py --start-server --synthesize 200 --concurrency 8 --rate 20
+    python load_test.py --corpus corpus.jsonl --url http://localhost:8000 --requests 1000
+    python load_test.py --corpus corpus.jsonl --baseline load_results/run_old.json
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import yaml
+
+
+@dataclass
+class RequestResult:
+    status: int
+    latency: float
+    error: Optional[str] = None
+
+
+# --------------------------------------------------------------
+# Corpora
+# --------------------------------------------------------------
+def load_corpus(path: Path) -> List[Dict[str, Any]]:
+    """Loads /analyze request bodies from a JSONL file; lines without messages are skipped."""
+    corpus = []
+    skipped = 0
+    for line in path.read_text("utf-8").splitlines():
+        if not line.strip():
+            continue
+        body = json.loads(line)
+        if isinstance(body, dict) and body.get("messages"):
+            corpus.append(body)
+        else:
+            skipped += 1
+    if skipped:
+        print(f"Warning: skipped {skipped} lines without 'messages' in {path}")
+    return corpus
+
+
+def synthesize_corpus(
+    marker_root: Path,
+    conversations: int,
+    messages_per_conversation: int = 20,
+    seed: int = 42
+) -> List[Dict[str, Any]]:
+    """Builds conversations from the ``examples`` of the marker definitions."""
+    examples: List[str] = []
+    for file in sorted(marker_root.glob("*.yaml")):
+        try:
+            data = yaml.safe_load(file.read_text("utf-8"))
+        except yaml.YAMLError:
+            continue
+        if isinstance(data, dict) and isinstance(data.get("examples"), list):
+            examples.extend(e for e in data["examples"] if isinstance(e, str) and e.strip())
+
+    if not examples:
+        raise ValueError(f"No marker examples found in {marker_root}")
+
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 9, 0, 0)
+    corpus = []
+    for c in range(conversations):
+        messages = [
+            {
+                "id": f"c{c}_m{i}",
+                "ts": (start + timedelta(minutes=i)).isoformat(),
+                "speaker": "A" if i % 2 == 0 else "B",
+                "text": rng.choice(examples)
+            }
+            for i in range(messages_per_conversation)
+        ]
+        corpus.append({
+            "messages": messages,
+            "window": {"size": min(30, messages_per_conversation), "overlap": 0}
+        })
+    return corpus
+
+
+# --------------------------------------------------------------
+# Load generation
+# --------------------------------------------------------------
+def send_request(url: str, body: Dict[str, Any], timeout: float) -> RequestResult:
+    data = json.dumps(body).encode("utf-8")
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            return RequestResult(resp.status, time.perf_counter() - started)
+    except urllib.error.HTTPError as e:
+        e.read()
+        return RequestResult(e.code, time.perf_counter() - started, f"HTTP {e.code}")
+    except (urllib.error.URLError, OSError) as e:
+        return RequestResult(0, time.perf_counter() - started, str(e))
+
+
+def run_load(
+    url: str,
+    corpus: List[Dict[str, Any]],
+    total_requests: int,
+    concurrency: int,
+    rate: float = 0.0,
+    timeout: float = 60.0
+) -> List[RequestResult]:
+    """Sends ``total_requests`` bodies (cycling through the corpus).
+
+    ``concurrency`` bounds the requests in flight; ``rate`` > 0 additionally caps the
+    start rate in requests per second by scheduling request i at t0 + i / rate.
+    """
+    results: List[Optional[RequestResult]] = [None] * total_requests
+    next_index = 0
+    lock = threading.Lock()
+    t0 = time.perf_counter()
+
+    def worker():
+        nonlocal next_index
+        while True:
+            with lock:
+                i = next_index
+                next_index += 1
+            if i >= total_requests:
+                return
+            if rate > 0:
+                delay = t0 + i / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            results[i] = send_request(url, corpus[i % len(corpus)], timeout)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+
+    return [r for r in results if r is not None]
+
+
+def summarize(results: List[RequestResult], wall_time: float) -> Dict[str, Any]:
+    """Throughput, latency percentiles (successful requests) and error rate."""
+    ok = np.array([r.latency for r in results if 200 <= r.status < 300])
+    status_counts: Dict[str, int] = {}
+    for r in results:
+        status_counts[str(r.status)] = status_counts.get(str(r.status), 0) + 1
+
+    summary: Dict[str, Any] = {
+        "requests": len(results),
+        "successful": int(ok.size),
+        "error_rate": (len(results) - ok.size) / len(results) if results else 0.0,
+        "wall_time_s": wall_time,
+        "throughput_rps": ok.size / wall_time if wall_time > 0 else 0.0,
+        "status_counts": status_counts,
+    }
+    if ok.size:
+        p50, p95, p99 = np.percentile(ok, [50, 95, 99])
+        summary["latency_s"] = {
+            "mean": float(ok.mean()),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(ok.max()),
+        }
+    return summary
+
+
+def compare(summary: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, float]:
+    """Relative change against a previous run (positive = higher than baseline)."""
+    deltas = {}
+    if baseline.get("throughput_rps"):
+        deltas["throughput_rps"] = (
+            (summary["throughput_rps"] - baseline["throughput_rps"]) / baseline["throughput_rps"]
+        )
+    for key in ("p50", "p95", "p99"):
+        cur = summary.get("latency_s", {}).get(key)
+        base = baseline.get("latency_s", {}).get(key)
+        if cur is not None and base:
+            deltas[f"latency_{key}"] = (cur - base) / base
+    deltas["error_rate"] = summary["error_rate"] - baseline.get("error_rate", 0.0)
+    return deltas
+
+
+# --------------------------------------------------------------
+# Local server
+# --------------------------------------------------------------
+def start_server(host: str, port: int, startup_timeout: float = 120.0) -> subprocess.Popen:
+    """Starts api_service with uvicorn and waits until /health answers."""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api_service:app",
+         "--host", host, "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL
+    )
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"api_service exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://{host}:{port}/health", timeout=2):
+                return proc
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError(f"api_service did not become healthy within {startup_timeout}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the Marker Engine API")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--corpus", type=Path, help="JSONL file with /analyze request bodies")
+    source.add_argument("--synthesize", type=int, metavar="N",
+                        help="Synthesise N conversations from marker examples")
+    parser.add_argument("--marker-root", type=Path, default=Path("_Marker_5.0"))
+    parser.add_argument("--messages", type=int, default=20,
+                        help="Messages per synthesised conversation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", default=None, help="Base URL (default http://HOST:PORT)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--start-server", action="store_true",
+                        help="Start api_service locally for the duration of the run")
+    parser.add_argument("--view", choices=["full", "compact"], default="full")
+    parser.add_argument("--requests", type=int, default=None,
+                        help="Total requests (default: one pass over the corpus)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Max request start rate per second (0 = unlimited)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Result JSON (default load_results/run_<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, default=None,
+                        help="Previous result JSON to compare against")
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        corpus = synthesize_corpus(args.marker_root, args.synthesize, args.messages, args.seed)
+    if not corpus:
+        print("❌ Corpus is empty")
+        return 1
+
+    base_url = args.url or f"http://{args.host}:{args.port}"
+    url = f"{base_url}/analyze?view={args.view}"
+    total = args.requests or len(corpus)
+
+    server = start_server(args.host, args.port) if args.start_server else None
+    try:
+        print(f"Sending {total} requests to {url} "
+              f"(concurrency {args.concurrency}, rate {args.rate or 'unlimited'})")
+        started = time.perf_counter()
+        results = run_load(url, corpus, total, args.concurrency, args.rate, args.timeout)
+        wall_time = time.perf_counter() - started
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    summary = summarize(results, wall_time)
+    report: Dict[str, Any] = {
+        "started_at": datetime.utcnow().isoformat(),
+        "config": {
+            "url": url,
+            "corpus": str(args.corpus) if args.corpus else f"synthesized:{args.synthesize}",
+            "messages_per_request": sum(len(b["messages"]) for b in corpus) / len(corpus),
+            "requests": total,
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+        },
+        "summary": summary,
+    }
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text("utf-8"))
+        report["baseline"] = str(args.baseline)
+        report["delta"] = compare(summary, baseline["summary"])
+
+    output = args.output or Path("load_results") / f"run_{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), "utf-8")
+
+    latency = summary.get("latency_s", {})
+    print(f"Throughput: {summary['throughput_rps']:.1f} req/s, "
+          f"error rate: {summary['error_rate']:.1%}")
+    if latency:
+        print(f"Latency p50/p95/p99: {latency['p50'] * 1000:.1f} / "
+              f"{latency['p95'] * 1000:.1f} / {latency['p99'] * 1000:.1f} ms")
+    if "delta" in report:
+        for key, value in report["delta"].items():
+            print(f"  {key}: {value:+.1%}")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
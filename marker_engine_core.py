@@ -13,10 +13,15 @@ import json
 import importlib
 import re
 import datetime
+import time
 import numpy as np
-from typing import Dict, List, Any, Optional
+from bisect import bisect_right
+from itertools import accumulate
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
 
 from numeric_normalizer_plugin import NumericNormalizerPlugin
+from metrics import STAGE_LATENCY
 
 # --------------------------------------------------------------
 PRFX_LEVELS = ("ATO_", "SEM_", "CLU_", "MEMA_")
@@ -42,6 +47,11 @@ class MarkerEngine:
         self.detectors: List[Dict[str, Any]]     = []
         self.plugins  : Dict[str, Any]           = {}
 
+        # vorkompilierte Regeln, erst nach freeze() befüllt
+        self.frozen : bool = False
+        self._detector_rules : Dict[str, Tuple[re.Pattern, str]] = {}
+        self._marker_patterns : Dict[str, List[re.Pattern]] = {}
+
         self._load_markers()
         self._load_schemata()
         self._load_detectors()
@@ -121,6 +131,39 @@ class MarkerEngine:
         self.plugins["plugin.numeric.normalizer"] = NumericNormalizerPlugin()
 
 
+    def _load_detector_spec(self, det: Dict[str, Any]) -> Dict[str, Any]:
+        file_path = Path(det["file_path"])
+        if not file_path.is_absolute():
+            file_path = Path.cwd() / file_path
+        return json.loads(file_path.read_text("utf-8"))
+
+    def freeze(self) -> "MarkerEngine":
+        """Kompiliert Detektor-Regeln und ATO-Patterns einmalig und sperrt Marker/Detektoren.
+
+        Danach liest analyze() keine Detektor-Dateien mehr, kompiliert keine Patterns
+        und mutiert keinen Engine-Zustand. Gedacht für Prefork-Server, deren Worker
+        die Engine per Copy-on-Write aus dem Master-Prozess teilen.
+        """
+        if self.frozen:
+            return self
+
+        for det in self.detectors:
+            if det.get("module") == "regex":
+                spec = self._load_detector_spec(det)
+                pattern = re.compile(spec["rule"]["pattern"], re.IGNORECASE)
+                self._detector_rules[det["id"]] = (pattern, spec["fires_marker"])
+
+        for marker_id, marker in self.markers.items():
+            if marker_id.startswith("ATO_") and "pattern" in marker:
+                pats = marker.get("pattern", [])
+                if isinstance(pats, str): pats = [pats]
+                self._marker_patterns[marker_id] = [re.compile(p, re.IGNORECASE) for p in pats if p]
+
+        self.markers = MappingProxyType(self.markers)  # type: ignore[assignment]
+        self.detectors = tuple(self.detectors)  # type: ignore[assignment]
+        self.frozen = True
+        return self
+
     # ----------------------------------------------------------
     # Haupt­methode
     # ----------------------------------------------------------
@@ -131,13 +174,15 @@ class MarkerEngine:
         # 1) Detector-Registry anwenden (Präfix-Fire)
         for det in self.detectors:
             if det.get("module") == "regex":
-                file_path = Path(det["file_path"])
-                if not file_path.is_absolute():
-                    file_path = Path.cwd() / file_path
-                spec = json.loads(file_path.read_text("utf-8"))
-                pattern = re.compile(spec["rule"]["pattern"], re.IGNORECASE)
-                if pattern.search(text):
-                    hits.append({"marker": spec["fires_marker"], "source": det["id"]})
+                if self.frozen:
+                    pattern, fires_marker = self._detector_rules[det["id"]]
+                else:
+                    spec = self._load_detector_spec(det)
+                    pattern = re.compile(spec["rule"]["pattern"], re.IGNORECASE)
+                    fires_marker = spec["fires_marker"]
+                found = pattern.search(text)
+                if found:
+                    hits.append({"marker": fires_marker, "source": det["id"], "pos": found.start()})
 
             elif det.get("module") == "plugin":
                 plugin = self.plugins[det["id"]]
@@ -154,14 +199,25 @@ class MarkerEngine:
                     hits.append(result)
 
         # 2) Pattern-basierte Marker (nur Level 1, atomic)
-        for marker_id, marker in self.markers.items():
-            if marker_id.startswith("ATO_") and "pattern" in marker:
-                pats = marker.get("pattern", [])
-                if isinstance(pats, str): pats = [pats]
-                for pat in pats:
-                    if pat and re.search(pat, text, re.IGNORECASE):
-                        hits.append({"marker": marker_id, "source": "pattern"})
+        if self.frozen:
+            for marker_id, patterns in self._marker_patterns.items():
+                for p in patterns:
+                    found = p.search(text)
+                    if found:
+                        hits.append({"marker": marker_id, "source": "pattern",
+                                     "pos": found.start()})
                         break
+        else:
+            for marker_id, marker in self.markers.items():
+                if marker_id.startswith("ATO_") and "pattern" in marker:
+                    pats = marker.get("pattern", [])
+                    if isinstance(pats, str): pats = [pats]
+                    for pat in pats:
+                        found = re.search(pat, text, re.IGNORECASE) if pat else None
+                        if found:
+                            hits.append({"marker": marker_id, "source": "pattern",
+                                         "pos": found.start()})
+                            break
 
         # 3) Schema-Fusion (Scoring/Priorisierung)
         final_scores: Dict[str, float] = {}
@@ -200,6 +256,7 @@ class MarkerEngine:
     def analyze_conversation(self, messages: List[Dict[str, Any]], window: Dict[str, int], options: Dict[str, Any]) -> Dict[str, Any]:
         """Analyzes a conversation with a sliding window."""
         all_hits = []
+        started = time.perf_counter()
         window_size = window.get("size", 30)
         overlap = window.get("overlap", 0)
         
@@ -209,16 +266,27 @@ class MarkerEngine:
             if len(chunk) < window_size // 2:  # Skip very small chunks
                 continue
                 
-            text = " ".join([m["text"] for m in chunk])
+            texts = [m["text"] for m in chunk]
+            text = " ".join(texts)
             result = self.analyze(text)
             
+            # Startoffsets der Nachrichten im Fenstertext (für Treffer -> Nachricht)
+            offsets = list(accumulate((len(t) + 1 for t in texts[:-1]), initial=0))
+            
             # Add message IDs to hits for evidence tracking
             for hit in result["hits"]:
                 hit["msg_ids"] = [m["id"] for m in chunk]
                 hit["span"] = ""  # Could be enhanced to include actual text spans
+                # Index der Nachricht (in messages), in der der Treffer liegt;
+                # ohne Position (Plugins) die erste Nachricht des Fensters
+                pos = hit.get("pos")
+                hit["msg_index"] = i + (bisect_right(offsets, pos) - 1 if pos is not None else 0)
                 
             all_hits.extend(result["hits"])
 
+        STAGE_LATENCY.observe(time.perf_counter() - started, stage="detection")
+        started = time.perf_counter()
+
         # Activation Engine with evidence cascade
         activated_markers = []
         for marker_id, marker in self.markers.items():
@@ -381,13 +449,20 @@ class MarkerEngine:
 
         # Add activated markers to hits
         for activated in activated_markers:
-            all_hits.append({
+            hit = {
                 "marker": activated["marker_id"],
                 "source": activated["source"],
                 "evidence": activated["evidence"],
                 "rule": activated["rule"],
                 "params": activated["params"]
-            })
+            }
+            # Aktivierung gehört zur Nachricht des jüngsten Belegs
+            evidence_indices = [e["msg_index"] for e in activated["evidence"] if "msg_index" in e]
+            if evidence_indices:
+                hit["msg_index"] = max(evidence_indices)
+            all_hits.append(hit)
+
+        STAGE_LATENCY.observe(time.perf_counter() - started, stage="activation")
         
         return {"summary": "Conversation analysis complete.", "hits": all_hits}
 
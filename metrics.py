@@ -0,0 +1,400 @@
+"""
+metrics.py
+In-process metrics registry rendered in the Prometheus text exposition format.
+
+No client library or push gateway is required: the API exposes ``REGISTRY.render()``
+on ``/metrics`` and a local scraper reads it directly.
+
+With several worker processes, each worker periodically writes a snapshot of its
+registry to a shared directory (``start_multiprocess``) and ``render()`` merges
+all snapshots, so a scrape reports the whole server regardless of which worker
+answers it.
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, spanning sub-millisecond stages up to slow requests
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric(ABC):
+    """Base class holding name, help text and label handling."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _label_str(self, values: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(f'{extra[0]}="{extra[1]}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    @abstractmethod
+    def _sample_lines(self) -> List[str]:
+        """Sample lines in exposition format, without HELP/TYPE headers."""
+
+    @abstractmethod
+    def snapshot(self) -> List[List[Any]]:
+        """JSON-serializable ``[label values, state]`` pairs."""
+
+    @abstractmethod
+    def merge(self, snapshot: List[List[Any]]) -> None:
+        """Adds another process's snapshot to this metric."""
+
+    def empty_copy(self) -> "_Metric":
+        return type(self)(self.name, self.documentation, self.labelnames)
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._sample_lines())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> List[List[Any]]:
+        with self._lock:
+            return [[list(k), v] for k, v in self._values.items()]
+
+    def merge(self, snapshot: List[List[Any]]) -> None:
+        with self._lock:
+            for key, value in snapshot:
+                key = tuple(key)
+                self._values[key] = self._values.get(key, 0.0) + value
+
+    def _sample_lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (e.g. queue depth)."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        if not self.labelnames:
+            self._values[()] = 0.0
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> List[List[Any]]:
+        with self._lock:
+            return [[list(k), v] for k, v in self._values.items()]
+
+    def merge(self, snapshot: List[List[Any]]) -> None:
+        with self._lock:
+            for key, value in snapshot:
+                key = tuple(key)
+                self._values[key] = self._values.get(key, 0.0) + value
+
+    def _sample_lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [per-bucket counts, sum, count]
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the enclosed block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def snapshot(self) -> List[List[Any]]:
+        with self._lock:
+            return [[list(k), [list(s[0]), s[1], s[2]]] for k, s in self._series.items()]
+
+    def merge(self, snapshot: List[List[Any]]) -> None:
+        with self._lock:
+            for key, (counts, total, count) in snapshot:
+                series = self._series.setdefault(tuple(key), [[0] * len(self.buckets), 0.0, 0])
+                for i, bucket_count in enumerate(counts):
+                    series[0][i] += bucket_count
+                series[1] += total
+                series[2] += count
+
+    def empty_copy(self) -> "Histogram":
+        return Histogram(self.name, self.documentation, self.labelnames, self.buckets[:-1])
+
+    def _sample_lines(self) -> List[str]:
+        lines = []
+        with self._lock:
+            items = sorted((k, [list(s[0]), s[1], s[2]]) for k, s in self._series.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = self._label_str(key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_str(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._label_str(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._multiprocess_dir: Optional[Path] = None
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(  # type: ignore[return-value]
+            Histogram(name, documentation, labelnames, buckets)
+        )
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format.
+
+        In multiprocess mode the snapshots of all worker processes are merged:
+        counters and histograms are summed over every process that ever wrote
+        one, gauges only over processes that are still alive.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        if self._multiprocess_dir is None:
+            return "\n".join(m.render() for m in metrics) + "\n"
+
+        self.write_snapshot()
+        snapshots = _read_snapshots(self._multiprocess_dir)
+        rendered = []
+        for metric in metrics:
+            merged = metric.empty_copy()
+            for pid, snapshot in snapshots:
+                if metric.type_name == "gauge" and not _pid_alive(pid):
+                    continue
+                merged.merge(snapshot.get(metric.name, []))
+            rendered.append(merged.render())
+        return "\n".join(rendered) + "\n"
+
+    def start_multiprocess(self, directory: str, interval: float = 1.0) -> None:
+        """Shares this process's metrics through ``directory``.
+
+        Must be called in each worker after the fork; a daemon thread rewrites
+        the worker's snapshot every ``interval`` seconds, so scrapes lag other
+        workers by at most that long.
+        """
+        self._multiprocess_dir = Path(directory)
+        self._multiprocess_dir.mkdir(parents=True, exist_ok=True)
+        self.write_snapshot()
+
+        def _flush() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write_snapshot()
+                except OSError:
+                    pass
+
+        threading.Thread(target=_flush, name="metrics-snapshot", daemon=True).start()
+
+    def write_snapshot(self) -> None:
+        """Atomically writes this process's snapshot as ``<pid>.json``."""
+        if self._multiprocess_dir is None:
+            return
+        with self._lock:
+            metrics = list(self._metrics.values())
+        body = json.dumps({m.name: m.snapshot() for m in metrics})
+        fd, tmp_name = tempfile.mkstemp(dir=self._multiprocess_dir, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            f.write(body)
+        os.replace(tmp_name, self._multiprocess_dir / f"{os.getpid()}.json")
+
+
+def _read_snapshots(directory: Path) -> List[Tuple[int, Dict[str, Any]]]:
+    snapshots = []
+    for path in directory.glob("*.json"):
+        try:
+            snapshots.append((int(path.stem), json.loads(path.read_text())))
+        except (ValueError, OSError):
+            continue
+    return snapshots
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+# --------------------------------------------------------------
+# Process-wide registry and the engine's metrics
+# --------------------------------------------------------------
+REGISTRY = MetricsRegistry()
+
+# Set by the launcher for uvicorn --workers; preforked workers call start_multiprocess themselves
+if os.getenv("METRICS_MULTIPROC_DIR"):
+    REGISTRY.start_multiprocess(os.environ["METRICS_MULTIPROC_DIR"])
+
+STAGE_LATENCY = REGISTRY.histogram(
+    "marker_engine_stage_duration_seconds",
+    "Latency of the analysis pipeline stages in seconds",
+    ["stage"],
+)
+MESSAGES_TOTAL = REGISTRY.counter(
+    "marker_engine_messages_total",
+    "Messages submitted for analysis",
+)
+HITS_TOTAL = REGISTRY.counter(
+    "marker_engine_hits_total",
+    "Marker hits produced, by marker level",
+    ["level"],
+)
+CACHE_HITS_TOTAL = REGISTRY.counter(
+    "marker_engine_cache_hits_total",
+    "Cache hits, by cache",
+    ["cache"],
+)
+CACHE_MISSES_TOTAL = REGISTRY.counter(
+    "marker_engine_cache_misses_total",
+    "Cache misses, by cache",
+    ["cache"],
+)
+POOL_QUEUE_DEPTH = REGISTRY.gauge(
+    "marker_engine_pool_queue_depth",
+    "Analyses currently queued or running",
+)
+INFLIGHT_MESSAGES = REGISTRY.gauge(
+    "marker_engine_inflight_messages",
+    "Messages admitted and not yet fully analysed",
+)
+REJECTED_TOTAL = REGISTRY.counter(
+    "marker_engine_rejected_requests_total",
+    "Requests rejected by admission control, by reason",
+    ["reason"],
+)
@@ -0,0 +1,136 @@
+"""
+prefork_server.py
+Preforking launcher for the API: builds and freezes the engine once in the master
+process, then forks uvicorn workers that share it copy-on-write.
+
+The master imports api_service (which builds MarkerEngine and DriftAxesManager),
+precompiles and freezes the engine, moves every surviving object into the
+permanent GC generation with gc.freeze() and binds the listening socket. Forked
+workers inherit all of it; since the garbage collector no longer touches the
+frozen objects, their pages stay shared until a worker actually writes to them.
+Dead workers are re-forked from the same frozen master.
+
+Per-process state is reconciled as follows: the analysis pool and admission
+budget (MAX_WORKERS, MAX_INFLIGHT_MESSAGES) are split evenly across workers,
+/metrics merges the snapshots every worker writes to a shared directory, and
+artifacts live in ARTIFACTS_DIR. /health reports the answering worker's load only.
+"""
+
+import gc
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+def _bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket, log_level: str, metrics_dir: str) -> None:
+    """Worker body: serve the already-built app on the shared socket."""
+    import uvicorn
+    import api_service
+    from metrics import REGISTRY
+
+    # Threads do not survive fork(): the snapshot writer is started per worker
+    REGISTRY.start_multiprocess(metrics_dir)
+
+    # Default handlers; uvicorn installs its own for graceful shutdown
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    config = uvicorn.Config(api_service.app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _fork_worker(sock: socket.socket, log_level: str, metrics_dir: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 0
+        try:
+            _run_worker(sock, log_level, metrics_dir)
+        except Exception:
+            logger.exception("Worker crashed")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    return pid
+
+
+def serve_preforked(host: str = "0.0.0.0", port: int = 8000, workers: int = 2,
+                    log_level: str = "info") -> None:
+    """Builds the frozen engine once and supervises ``workers`` forked uvicorn workers."""
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Prefork mode requires os.fork (POSIX)")
+
+    import api_service
+
+    api_service.engine.freeze()
+    logger.info(f"Engine frozen: {len(api_service.engine.markers)} markers, "
+                f"{len(api_service.engine._marker_patterns)} compiled pattern sets")
+
+    # Each worker gets its share of the analysis pool and in-flight budget
+    api_service.configure_capacity(workers)
+    metrics_dir = (os.getenv("METRICS_MULTIPROC_DIR")
+                   or tempfile.mkdtemp(prefix="marker-engine-metrics-"))
+
+    sock = _bind_socket(host, port)
+
+    # Everything allocated so far is shared, read-only state for the workers
+    gc.collect()
+    gc.freeze()
+
+    children: Dict[int, int] = {}
+    shutting_down = False
+
+    def _shutdown(signum, frame):
+        nonlocal shutting_down
+        shutting_down = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    for slot in range(workers):
+        children[_fork_worker(sock, log_level, metrics_dir)] = slot
+    logger.info(f"Started {workers} preforked workers on {host}:{port}")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        slot = children.pop(pid, None)
+        if slot is None or shutting_down:
+            continue
+        logger.warning(f"Worker {pid} exited with status {status}; re-forking slot {slot}")
+        children[_fork_worker(sock, log_level, metrics_dir)] = slot
+
+    sock.close()
+    if not os.getenv("METRICS_MULTIPROC_DIR"):
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+    logger.info("All workers stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    serve_preforked(workers=int(sys.argv[1]) if len(sys.argv) > 1 else 2)
@@ -1,7 +1,10 @@
+from collections import Counter
+from collections.abc import Sequence
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Tuple
 from datetime import datetime
+import numpy as np
 from marker_models import MarkerCategory, MarkerSeverity
 
 class ScoreType(Enum):
@@ -25,18 +28,188 @@ class ScoringModel:
     scale_max: float = 10.0
     active: bool = True
 
+class MatchTable:
+    """Gemeinsame, spaltenweise Match-Tabelle eines Scoring-Laufs.
+
+    Ein Eintrag ist ein Match in einer Chunk-Zeile; ``info`` hält
+    (marker_id, marker_name, category, severity, confidence), ``contribution``
+    und ``present`` sind Arrays (Eintrag × Modell).
+    """
+    __slots__ = ('info', 'contribution', 'present', 'rows',
+                 '_order', '_row_starts', '_present_rows')
+
+    def __init__(self, info: List[tuple], contribution: np.ndarray, present: np.ndarray,
+                 rows: np.ndarray, n_rows: int):
+        self.info = info
+        self.contribution = contribution
+        self.present = present
+        self.rows = rows
+        # Einträge nach Zeile gruppiert (CSR): _order[_row_starts[i]:_row_starts[i + 1]]
+        order = np.argsort(rows, kind='stable')
+        self._order = order.tolist()
+        self._row_starts = np.searchsorted(rows[order], np.arange(n_rows + 1)).tolist()
+        self._present_rows: Optional[List[List[bool]]] = None
+
+    def entries(self, row: int, column: int) -> List[int]:
+        """Einträge der Zeile, die zum Modell in Spalte ``column`` beitragen."""
+        if self._present_rows is None:
+            # Einmalig als Listen: Einzelzugriffe auf NumPy-Arrays sind teuer
+            self._present_rows = self.present.tolist()
+        present = self._present_rows
+        return [
+            entry for entry in self._order[self._row_starts[row]:self._row_starts[row + 1]]
+            if present[entry][column]
+        ]
+
+    def top_markers(self, rows: List[int], column: int, k: int = 5) -> List[Tuple[str, int]]:
+        """Häufigste Marker-Namen über die Zeilen ``rows`` (in dieser Reihenfolge)
+        für Spalte ``column``; Gleichstand wie Counter.most_common (zuerst gesehen)."""
+        row_pos = np.full(len(self._row_starts) - 1, -1, dtype=np.int64)
+        row_pos[np.asarray(rows, dtype=np.int64)] = np.arange(len(rows))
+        entry_pos = row_pos[self.rows]
+        selected = np.flatnonzero(self.present[:, column] & (entry_pos >= 0))
+        if selected.size == 0:
+            return []
+
+        names = [self.info[entry][1] for entry in selected.tolist()]
+        name_index: Dict[str, int] = {}
+        name_ids = np.fromiter(
+            (name_index.setdefault(name, len(name_index)) for name in names),
+            dtype=np.int64,
+            count=len(names)
+        )
+        # Iterationsreihenfolge: Position der Zeile, dann Eintrag innerhalb der Zeile
+        order = np.lexsort((selected, entry_pos[selected]))
+        first_seen = np.full(len(name_index), len(order), dtype=np.int64)
+        np.minimum.at(first_seen, name_ids[order], np.arange(len(order)))
+        counts = np.bincount(name_ids, minlength=len(name_index))
+
+        unique_names = list(name_index)
+        ranked = np.lexsort((first_seen, -counts))[:k]
+        return [(unique_names[i], int(counts[i])) for i in ranked.tolist()]
+
+    def __getstate__(self):
+        return (self.info, self.contribution, self.present, self.rows,
+                self._order, self._row_starts)
+
+    def __setstate__(self, state):
+        self.info, self.contribution, self.present, self.rows, self._order, self._row_starts = state
+        self._present_rows = None
+
+    def marker(self, entry: int, column: int) -> Dict[str, Any]:
+        marker_id, marker_name, category, severity, confidence = self.info[entry]
+        return {
+            'marker_id': marker_id,
+            'marker_name': marker_name,
+            'category': category,
+            'severity': severity,
+            'contribution': float(self.contribution[entry, column]),
+            'confidence': confidence
+        }
+
+
+class MarkerContributions(Sequence):
+    """Lazy contributing_markers eines ChunkScores: Verweise in eine MatchTable,
+    die Marker-Dicts werden erst beim ersten Zugriff erzeugt."""
+    __slots__ = ('_table', '_row', '_column', '_markers')
+
+    def __init__(self, table: MatchTable, row: int, column: int):
+        self._table = table
+        self._row = row
+        self._column = column
+        self._markers: Optional[List[Dict[str, Any]]] = None
+
+    def __reduce__(self):
+        return MarkerContributions, (self._table, self._row, self._column)
+
+    def _materialize(self) -> List[Dict[str, Any]]:
+        if self._markers is None:
+            self._markers = [
+                self._table.marker(entry, self._column)
+                for entry in self._table.entries(self._row, self._column)
+            ]
+        return self._markers
+
+    def marker_names(self) -> List[str]:
+        """Marker-Namen ohne Materialisierung der Dicts."""
+        if self._markers is not None:
+            return [m['marker_name'] for m in self._markers]
+        info = self._table.info
+        return [info[entry][1] for entry in self._table.entries(self._row, self._column)]
+
+    def __getitem__(self, index):
+        return self._materialize()[index]
+
+    def __len__(self) -> int:
+        if self._markers is not None:
+            return len(self._markers)
+        return len(self._table.entries(self._row, self._column))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, MarkerContributions)):
+            return self._materialize() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._materialize())
+
+
+def top_marker_counts(marker_lists: List[Any], k: int = 5) -> List[Tuple[str, int]]:
+    """Top-k Marker-Namen über mehrere contributing_markers-Listen.
+
+    Verweisen alle Listen als MarkerContributions in dieselbe Tabelle und Spalte,
+    wird spaltenweise auf der Tabelle gezählt, ohne Marker-Dicts zu erzeugen.
+    """
+    first = marker_lists[0] if marker_lists else None
+    if isinstance(first, MarkerContributions):
+        table, column = first._table, first._column
+        if all(
+            isinstance(m, MarkerContributions) and m._table is table and m._column == column
+            for m in marker_lists
+        ):
+            return table.top_markers([m._row for m in marker_lists], column, k)
+    return Counter(
+        name for markers in marker_lists for name in marker_names(markers)
+    ).most_common(k)
+
+
+def marker_names(markers: Iterable[Dict[str, Any]]) -> List[str]:
+    """Namen der contributing_markers (Liste oder MarkerContributions)."""
+    if isinstance(markers, MarkerContributions):
+        return markers.marker_names()
+    return [m['marker_name'] for m in markers]
+
+
 @dataclass
 class ChunkScore:
+    """Score eines Chunks unter einem Modell.
+
+    ``contributing_markers`` ist eine Liste oder, ohne ``detail=True``, eine
+    MarkerContributions-Sicht in die gemeinsame MatchTable. Die ist keine
+    Liste: ``json.dumps`` lehnt sie ab und ``dataclasses.asdict`` kopiert die
+    ganze Tabelle mit. Wer serialisiert, ruft ``calculate_scores(..., detail=True)``
+    auf oder wandelt vorher mit ``list()`` um.
+    """
     chunk_id: str
     model_id: str
     score_type: ScoreType
     raw_score: float
     normalized_score: float
-    contributing_markers: List[Dict[str, Any]]
+    contributing_markers: Sequence[Dict[str, Any]]
     confidence: float
     timestamp: datetime
     metadata: Dict[str, Any]
 
+@dataclass
+class ScoreMatrix:
+    """Scores aller Chunks × Modelle als Arrays (Zeilen = chunk_ids, Spalten = model_ids)."""
+    chunk_ids: List[str]
+    model_ids: List[str]
+    raw: np.ndarray
+    normalized: np.ndarray
+    confidence: np.ndarray
+    marker_count: np.ndarray
+
 @dataclass
 class AggregatedScore:
     model_id: str
@@ -59,6 +232,8 @@ class ScoringResult:
     alerts: Optional[List[Dict[str, Any]]] = None
     summary: Optional[Dict[str, Any]] = None
     processing_time: float = 0.0
+    # TimelineRollups: Timeline je Auflösung ("minute", "hour", "day", "week")
+    timeline_rollups: Optional[Any] = None
 
     def __post_init__(self):
         if self.chunk_scores is None: self.chunk_scores = []
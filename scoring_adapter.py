@@ -1,5 +1,8 @@
 
-from scoring_engine import ScoringEngine
+import time
+from collections import defaultdict
+from functools import lru_cache
+from scoring_registry import get_scoring_engine
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
@@ -16,12 +19,16 @@ class MarkerCategory(Enum):
 class MarkerSeverity(Enum):
     LOW="LOW"; MEDIUM="MEDIUM"; HIGH="HIGH"
 
+@dataclass(frozen=True)
+class Speaker:
+    name: str
+
 @dataclass
 class TextChunk:
     id: str
     text: str
     timestamp: datetime
-    speaker: type("Speaker", (), {"name": str})  # quick shim
+    speaker: Speaker
     word_count: int
 
 @dataclass
@@ -34,25 +41,41 @@ class MarkerMatch:
     confidence: float
     metadata: dict
 
+# Zeitstempel wiederholen sich (Importe, Sekundenauflösung); Parser-Ergebnis cachen
+@lru_cache(maxsize=65536)
+def _parse_timestamp(ts):
+    return datetime.fromisoformat(ts)
+
+@lru_cache(maxsize=4096)
+def _speaker(name):
+    return Speaker(name)
+
 def to_chunks(messages):
-    chunks = []
-    for i, m in enumerate(messages):
-        chunks.append(TextChunk(
-            id=m["id"], text=m["text"], timestamp=datetime.fromisoformat(m["ts"]),
-            speaker=type("S", (), {"name": m.get("speaker","")}),
+    return [
+        TextChunk(
+            id=m["id"], text=m["text"], timestamp=_parse_timestamp(m["ts"]),
+            speaker=_speaker(m.get("speaker", "")),
             word_count=len(m["text"].split())
-        ))
-    return chunks
+        )
+        for m in messages
+    ]
+
+def _hit_message_id(h, messages):
+    """Nachricht eines Treffers: msg_index der Engine, sonst erste Nachricht des Fensters."""
+    idx = h.get("msg_index")
+    if idx is not None and 0 <= idx < len(messages):
+        return messages[idx]["id"]
+    msg_ids = h.get("msg_ids")
+    if msg_ids:
+        return msg_ids[0]
+    return messages[0]["id"]
 
 def to_matches(hits, messages):
     mm = []
     for h in hits:
-        # Find the message id for the hit. This is a placeholder
-        # and should be improved to correctly associate hits with messages.
-        msg_id = messages[0]["id"]
         meta = h.get("meta", {})
         mm.append(MarkerMatch(
-            chunk_id=msg_id,
+            chunk_id=_hit_message_id(h, messages),
             marker_id=h["marker"],
             marker_name=h.get("name", h["marker"]),
             category=MarkerCategory[meta.get("category","POSITIVE")],
@@ -62,8 +85,32 @@ def to_matches(hits, messages):
         ))
     return mm
 
-def run_scoring(messages, engine_output):
-    se = ScoringEngine()
+def index_matches(matches):
+    """Chunk-ID -> Matches in einem Durchlauf."""
+    by_chunk = defaultdict(list)
+    for m in matches:
+        by_chunk[m.chunk_id].append(m)
+    return by_chunk
+
+def run_scoring(messages, engine_output, engine=None, executor=None, partition_size=500):
+    """Bewertet eine Konversation (eine Nachricht = ein Chunk).
+
+    Mit ``executor`` (Thread- oder ProcessPoolExecutor) werden die Chunk-Scores
+    partitionsweise parallel berechnet und anschließend gemeinsam aggregiert.
+    """
+    # Prozessweite, vorkompilierte Engine statt Neuaufbau pro Request
+    se = engine or get_scoring_engine()
     chunks = to_chunks(messages)
     matches = to_matches(engine_output["hits"], messages)
-    return se.calculate_scores(chunks, matches)
+    if executor is None or len(chunks) <= partition_size:
+        return se.calculate_scores(chunks, matches)
+
+    started = time.time()
+    by_chunk = index_matches(matches)
+    futures = []
+    for start in range(0, len(chunks), partition_size):
+        part = chunks[start:start + partition_size]
+        part_matches = [m for c in part for m in by_chunk.get(c.id, ())]
+        futures.append(executor.submit(se.calculate_chunk_scores, part, part_matches))
+    chunk_scores = [cs for f in futures for cs in f.result()]
+    return se.build_result(chunks, chunk_scores, start_time=started)
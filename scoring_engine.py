@@ -9,19 +9,43 @@ import numpy as np
 
 from score_models import (
     ScoringModel, ChunkScore, AggregatedScore, ScoringResult,
-    ScoreType, ScoreComparison
+    ScoreType, ScoreComparison, ScoreMatrix, MatchTable, MarkerContributions,
+    top_marker_counts
 )
 from marker_models import MarkerMatch, MarkerCategory, MarkerSeverity
 from chunk_models import TextChunk
+from incremental_aggregator import IncrementalAggregator
+from timeline_rollups import TimelineRollups
+from chunk_score_cache import ChunkScoreCache, content_signature
+from cohort_comparison import CohortComparison, stack_runs
 
 logger = logging.getLogger(__name__)
 
+_DISTRIBUTION_BUCKETS = ("1-2", "3-4", "5-6", "7-8", "9-10")
+_DISTRIBUTION_EDGES = np.array([2.0, 4.0, 6.0, 8.0])
+
 
 class ScoringEngine:
     """Engine zur Berechnung von Scores basierend auf Marker-Matches."""
     
-    def __init__(self):
+    def __init__(self, chunk_cache_bytes: int = 0):
+        """
+        Args:
+            chunk_cache_bytes: Speicherobergrenze des inhaltsadressierten
+                Chunk-Score-Caches (0 = kein Cache). Genutzt vom Referenzpfad
+                (vectorized=False) und von score_chunk; der vektorisierte Pfad
+                rechnet schneller neu, als der Cache nachschlagen könnte.
+        """
         self.models: Dict[str, ScoringModel] = {}
+        self.chunk_cache: Optional[ChunkScoreCache] = (
+            ChunkScoreCache(chunk_cache_bytes) if chunk_cache_bytes > 0 else None
+        )
+        # Kompilierte Gewichtsmatrizen pro Modell-Auswahl (vektorisierter Pfad)
+        self._weight_cache: Dict[Tuple[str, ...], Tuple[List[str], np.ndarray, np.ndarray]] = {}
+        # Von der ScoringRegistry gesetzt (Hot Swap); der Digest ist anders als
+        # die Version über Prozesse und Neustarts hinweg vergleichbar
+        self.model_version = 0
+        self.model_digest = ""
         self._initialize_default_models()
     
     def _initialize_default_models(self):
@@ -111,7 +135,9 @@ class ScoringEngine:
         self,
         chunks: List[TextChunk],
         matches: List[MarkerMatch],
-        models: Optional[List[str]] = None
+        models: Optional[List[str]] = None,
+        vectorized: bool = True,
+        detail: bool = False
     ) -> ScoringResult:
         """Berechnet Scores für gegebene Chunks und Matches.
         
@@ -119,30 +145,73 @@ class ScoringEngine:
             chunks: Liste von Text-Chunks
             matches: Liste von Marker-Matches
             models: Spezifische Modelle zur Verwendung (None = alle)
+            vectorized: Alle Modelle als ein Matrixprodukt berechnen
+                (False = Referenzpfad Chunk für Chunk)
+            detail: contributing_markers sofort als Dict-Listen erzeugen
+                (False = lazy, erst beim Zugriff; nur vektorisierter Pfad)
             
         Returns:
             ScoringResult mit allen berechneten Scores
         """
         start_time = time.time()
-        result = ScoringResult()
-        
-        # Wähle Modelle
+        chunk_scores = self.calculate_chunk_scores(chunks, matches, models, vectorized, detail)
+        return self.build_result(chunks, chunk_scores, models, start_time)
+    
+    def calculate_chunk_scores(
+        self,
+        chunks: List[TextChunk],
+        matches: List[MarkerMatch],
+        models: Optional[List[str]] = None,
+        vectorized: bool = True,
+        detail: bool = False
+    ) -> List[ChunkScore]:
+        """Berechnet nur die Chunk-Scores (Chunk, dann Modell).
+
+        Chunks sind unabhängig voneinander; Partitionen können daher getrennt
+        (auch parallel) bewertet und mit build_result zusammengeführt werden.
+        """
         active_models = self._get_active_models(models)
         
+        if vectorized:
+            return self._calculate_chunk_scores_vectorized(
+                chunks,
+                matches,
+                active_models,
+                detail
+            )
+        
+        chunk_scores = []
         # Gruppiere Matches nach Chunk
         matches_by_chunk = self._group_matches_by_chunk(matches)
         
         # Berechne Scores pro Chunk
         for chunk in chunks:
             chunk_matches = matches_by_chunk.get(chunk.id, [])
+            signature = self._content_signature(chunk, chunk_matches)
             
             for model in active_models:
                 chunk_score = self._calculate_chunk_score(
                     chunk,
                     chunk_matches,
-                    model
+                    model,
+                    signature
                 )
-                result.chunk_scores.append(chunk_score)
+                chunk_scores.append(chunk_score)
+        
+        return chunk_scores
+    
+    def build_result(
+        self,
+        chunks: List[TextChunk],
+        chunk_scores: List[ChunkScore],
+        models: Optional[List[str]] = None,
+        start_time: Optional[float] = None
+    ) -> ScoringResult:
+        """Aggregiert Chunk-Scores zu einem vollständigen ScoringResult."""
+        start_time = start_time or time.time()
+        result = ScoringResult()
+        result.chunk_scores = chunk_scores
+        active_models = self._get_active_models(models)
         
         # Aggregiere Scores
         result.aggregated_scores = self._aggregate_scores(
@@ -156,8 +225,9 @@ class ScoringEngine:
             result.chunk_scores
         )
         
-        # Erstelle Timeline
-        result.timeline = self._create_timeline(result.chunk_scores)
+        # Erstelle Timeline (stündlich; weitere Auflösungen über timeline_rollups)
+        result.timeline_rollups = self._create_timeline(result.chunk_scores)
+        result.timeline = result.timeline_rollups.entries("hour")
         
         # Generiere Alerts
         result.alerts = self._generate_alerts(result.aggregated_scores)
@@ -170,13 +240,256 @@ class ScoringEngine:
         
         return result
     
+    def _compile_weight_matrix(
+        self,
+        models: List[ScoringModel]
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Kompiliert Kategorie-Gewichte aller Modelle zu einer Matrix (Kategorie × Modell).
+
+        Returns:
+            (Kategorien, Gewichte, Maske "Kategorie im Modell gewichtet")
+        """
+        key = tuple(m.id for m in models)
+        cached = self._weight_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        categories = sorted({c for m in models for c in m.category_weights})
+        weights = np.zeros((len(categories), len(models)))
+        present = np.zeros((len(categories), len(models)))
+        for j, model in enumerate(models):
+            for i, category in enumerate(categories):
+                if category in model.category_weights:
+                    weights[i, j] = model.category_weights[category]
+                    present[i, j] = 1.0
+        
+        compiled = (categories, weights, present)
+        self._weight_cache[key] = compiled
+        return compiled
+    
+    def score_matrix(
+        self,
+        chunks: List[TextChunk],
+        matches: List[MarkerMatch],
+        models: Optional[List[str]] = None
+    ) -> ScoreMatrix:
+        """Berechnet Scores aller Chunks und Modelle als Arrays (Chunk × Modell).
+
+        Reiner Array-Pfad ohne ChunkScore-Objekte; calculate_scores baut darauf auf.
+        """
+        matrix, _ = self._build_score_matrix(chunks, matches, self._get_active_models(models))
+        return matrix
+    
+    def _build_score_matrix(
+        self,
+        chunks: List[TextChunk],
+        matches: List[MarkerMatch],
+        models: List[ScoringModel]
+    ) -> Tuple[ScoreMatrix, MatchTable]:
+        """Vektorisierte Score-Berechnung.
+
+        Aus den Matches wird einmal eine Matrix Chunk × (Kategorie, Severity) mit
+        gewichteten Zählungen (Marker-Gewicht · Konfidenz) gebaut und mit der
+        kompilierten Kategorie-Gewichtsmatrix multipliziert. Normalisierung,
+        Begrenzung und Konfidenz laufen als Array-Operationen.
+
+        Returns:
+            (ScoreMatrix, gemeinsame Match-Tabelle für contributing_markers)
+        """
+        categories, cat_weights, cat_present = self._compile_weight_matrix(models)
+        cat_index = {c: i for i, c in enumerate(categories)}
+        n_chunks, n_cats, n_models = len(chunks), len(categories), len(models)
+        
+        rows_by_id: Dict[str, List[int]] = defaultdict(list)
+        for i, chunk in enumerate(chunks):
+            rows_by_id[chunk.id].append(i)
+        
+        # Spaltenweise Match-Tabelle (ein Eintrag je Match und Chunk-Zeile)
+        sev_index: Dict[str, int] = {}
+        m_row, m_cat, m_sev, m_value, m_conf, m_info = [], [], [], [], [], []
+        for match in matches:
+            rows = rows_by_id.get(match.chunk_id)
+            if not rows:
+                continue
+            category = match.category.value
+            severity = match.severity.value
+            cat = cat_index.get(category, -1)
+            sev = sev_index.setdefault(severity, len(sev_index))
+            value = match.metadata.get('weight', 1.0) * match.confidence
+            info = (match.marker_id, match.marker_name, category, severity, match.confidence)
+            for row in rows:
+                m_row.append(row)
+                m_cat.append(cat)
+                m_sev.append(sev)
+                m_value.append(value)
+                m_conf.append(match.confidence)
+                m_info.append(info)
+        
+        m_row_arr = np.asarray(m_row, dtype=np.int64)
+        m_cat_arr = np.asarray(m_cat, dtype=np.int64)
+        m_sev_arr = np.asarray(m_sev, dtype=np.int64)
+        m_value_arr = np.asarray(m_value, dtype=float)
+        n_sev = max(1, len(sev_index))
+        
+        # Severity-Multiplikatoren (Severity × Modell)
+        sev_mult = np.ones((n_sev, n_models))
+        for severity, s in sev_index.items():
+            for j, model in enumerate(models):
+                if model.severity_multipliers:
+                    sev_mult[s, j] = model.severity_multipliers.get(severity, 1.0)
+        
+        # Gewichtete Zählmatrix Chunk × Kategorie × Severity
+        relevant = m_cat_arr >= 0
+        flat = (m_row_arr[relevant] * n_cats + m_cat_arr[relevant]) * n_sev + m_sev_arr[relevant]
+        counts = np.bincount(
+            flat,
+            weights=m_value_arr[relevant],
+            minlength=n_chunks * n_cats * n_sev
+        ).reshape(n_chunks, n_cats, n_sev)
+        
+        raw = np.zeros((n_chunks, n_models))
+        for s in range(n_sev):
+            raw += (counts[:, :, s] @ cat_weights) * sev_mult[s]
+        
+        word_counts = np.array([chunk.word_count for chunk in chunks], dtype=float)
+        normalized = self._normalize_scores(raw, models, word_counts)
+        
+        # Konfidenz: mittlere Match-Konfidenz und Anzahl relevanter Matches je Modell
+        match_count = np.bincount(m_row_arr, minlength=n_chunks)
+        conf_sum = np.bincount(
+            m_row_arr, weights=np.asarray(m_conf, dtype=float), minlength=n_chunks
+        )
+        cat_counts = np.bincount(
+            m_row_arr[relevant] * n_cats + m_cat_arr[relevant],
+            minlength=n_chunks * n_cats
+        ).reshape(n_chunks, n_cats)
+        relevant_count = cat_counts @ cat_present
+        avg_conf = conf_sum / np.maximum(match_count, 1)
+        confidence = np.where(
+            (match_count > 0)[:, None],
+            avg_conf[:, None] * 0.7 + np.minimum(1.0, relevant_count / 10) * 0.3,
+            0.5
+        )
+        
+        matrix = ScoreMatrix(
+            chunk_ids=[chunk.id for chunk in chunks],
+            model_ids=[model.id for model in models],
+            raw=raw,
+            normalized=normalized,
+            confidence=confidence,
+            marker_count=match_count
+        )
+        
+        # Beitrag jedes Match-Eintrags je Modell (Eintrag × Modell)
+        safe_cat = np.where(relevant, m_cat_arr, 0)
+        match_table = MatchTable(
+            info=m_info,
+            contribution=cat_weights[safe_cat] * sev_mult[m_sev_arr] * m_value_arr[:, None],
+            present=(cat_present[safe_cat] > 0) & relevant[:, None],
+            rows=m_row_arr,
+            n_rows=n_chunks
+        )
+        return matrix, match_table
+    
+    def _calculate_chunk_scores_vectorized(
+        self,
+        chunks: List[TextChunk],
+        matches: List[MarkerMatch],
+        models: List[ScoringModel],
+        detail: bool = False
+    ) -> List[ChunkScore]:
+        """Baut ChunkScores aus der Score-Matrix.
+
+        Ergebnis und Reihenfolge (Chunk, dann Modell) entsprechen dem
+        Referenzpfad _calculate_chunk_score. Ohne ``detail`` verweisen die
+        contributing_markers nur in die gemeinsame Match-Tabelle.
+        """
+        if not chunks or not models:
+            return []
+        
+        matrix, table = self._build_score_matrix(chunks, matches, models)
+        
+        # Python-Listen statt Einzelzugriffe auf NumPy-Arrays
+        raw = matrix.raw.tolist()
+        normalized = matrix.normalized.tolist()
+        confidence = matrix.confidence.tolist()
+        marker_count = matrix.marker_count.tolist()
+        
+        chunk_scores = []
+        for i, chunk in enumerate(chunks):
+            for j, model in enumerate(models):
+                contributing_markers = MarkerContributions(table, i, j)
+                chunk_scores.append(ChunkScore(
+                    chunk_id=chunk.id,
+                    model_id=model.id,
+                    score_type=model.type,
+                    raw_score=raw[i][j],
+                    normalized_score=normalized[i][j],
+                    contributing_markers=(list(contributing_markers) if detail
+                                          else contributing_markers),
+                    confidence=confidence[i][j],
+                    timestamp=chunk.timestamp,
+                    metadata={
+                        'word_count': chunk.word_count,
+                        'marker_count': marker_count[i]
+                    }
+                ))
+        
+        return chunk_scores
+    
+    def _normalize_scores(
+        self,
+        raw_scores: np.ndarray,
+        models: List[ScoringModel],
+        word_counts: np.ndarray
+    ) -> np.ndarray:
+        """Vektorisierte Variante von _normalize_score (Chunk × Modell)."""
+        factors = np.array([m.normalization_factor for m in models])
+        scale_min = np.array([m.scale_min for m in models])
+        scale_max = np.array([m.scale_max for m in models])
+        inverse = np.array([m.inverse_scale for m in models])
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            normalized = np.where(
+                (word_counts > 0)[:, None],
+                raw_scores / np.where(word_counts > 0, word_counts, 1)[:, None] * factors,
+                0.0
+            )
+        
+        inverse_scores = np.where(
+            normalized < 0,
+            scale_max + normalized / 10,
+            scale_max - normalized * 2
+        )
+        scores = np.where(inverse, inverse_scores, scale_min + normalized * 2)
+        
+        return np.clip(scores, scale_min, scale_max)
+    
     def _calculate_chunk_score(
         self,
         chunk: TextChunk,
         matches: List[MarkerMatch],
-        model: ScoringModel
+        model: ScoringModel,
+        signature: Optional[Tuple] = None
     ) -> ChunkScore:
-        """Berechnet Score für einen einzelnen Chunk."""
+        """Berechnet Score für einen einzelnen Chunk.
+
+        Mit aktivem Chunk-Cache werden Chunks mit gleichem Text, gleicher
+        Match-Signatur und gleicher Modellversion nur einmal bewertet.
+        """
+        cache_key = None
+        if self.chunk_cache is not None:
+            if signature is None:
+                signature = content_signature(chunk.text, chunk.word_count, matches)
+            cache_key = (signature, model.id, self.model_version)
+            cached = self.chunk_cache.get(cache_key)
+            if cached is not None:
+                raw_score, normalized_score, confidence, markers = cached
+                return self._make_chunk_score(
+                    chunk, model, matches, raw_score, normalized_score,
+                    [dict(marker) for marker in markers], confidence
+                )
+        
         raw_score = 0.0
         contributing_markers = []
         
@@ -206,8 +519,36 @@ class ScoringEngine:
         
         # Normalisiere Score
         normalized_score = self._normalize_score(raw_score, model, chunk.word_count)
+        confidence = self._calculate_confidence(matches, model)
         
-        # Erstelle ChunkScore
+        if cache_key is not None:
+            self.chunk_cache.put(cache_key, (
+                raw_score, normalized_score, confidence,
+                tuple(dict(marker) for marker in contributing_markers)
+            ))
+        
+        return self._make_chunk_score(
+            chunk, model, matches, raw_score, normalized_score,
+            contributing_markers, confidence
+        )
+    
+    def _content_signature(self, chunk: TextChunk, matches: List[MarkerMatch]) -> Optional[Tuple]:
+        """Inhaltssignatur für den Chunk-Cache (None ohne Cache)."""
+        if self.chunk_cache is None:
+            return None
+        return content_signature(chunk.text, chunk.word_count, matches)
+    
+    def _make_chunk_score(
+        self,
+        chunk: TextChunk,
+        model: ScoringModel,
+        matches: List[MarkerMatch],
+        raw_score: float,
+        normalized_score: float,
+        contributing_markers: List[Dict[str, Any]],
+        confidence: float
+    ) -> ChunkScore:
+        """Erstellt den ChunkScore (ID, Zeitstempel und Metadaten kommen immer vom Chunk)."""
         return ChunkScore(
             chunk_id=chunk.id,
             model_id=model.id,
@@ -215,7 +556,7 @@ class ScoringEngine:
             raw_score=raw_score,
             normalized_score=normalized_score,
             contributing_markers=contributing_markers,
-            confidence=self._calculate_confidence(matches, model),
+            confidence=confidence,
             timestamp=chunk.timestamp,
             metadata={
                 'word_count': chunk.word_count,
@@ -265,7 +606,7 @@ class ScoringEngine:
         # Anzahl relevanter Matches
         relevant_matches = [
             m for m in matches 
-            if m.category in model.category_weights
+            if m.category.value in model.category_weights
         ]
         
         # Konfidenz steigt mit Anzahl relevanter Matches
@@ -280,57 +621,65 @@ class ScoringEngine:
     ) -> Dict[str, AggregatedScore]:
         """Aggregiert Chunk-Scores zu Gesamt-Scores."""
         aggregated = {}
+        scores_by_model = self._group_scores(chunk_scores, lambda cs: cs.model_id)
         
         for model in models:
-            model_scores = [
-                cs for cs in chunk_scores 
-                if cs.model_id == model.id
-            ]
-            
+            model_scores = scores_by_model.get(model.id)
             if not model_scores:
                 continue
-            
-            scores = [cs.normalized_score for cs in model_scores]
-            
-            # Berechne Trend
-            trend, trend_strength = self._calculate_trend(scores)
-            
-            # Score-Verteilung
-            distribution = self._calculate_distribution(scores)
-            
-            # Top Marker
-            all_markers = []
-            for cs in model_scores:
-                all_markers.extend(cs.contributing_markers)
-            
-            marker_counts = defaultdict(int)
-            for marker in all_markers:
-                marker_counts[marker['marker_name']] += 1
-            
-            top_markers = [
-                {'name': name, 'count': count}
-                for name, count in sorted(
-                    marker_counts.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:5]
-            ]
-            
-            aggregated[model.type.value] = AggregatedScore(
-                model_id=model.id,
-                score_type=model.type,
-                average_score=np.mean(scores),
-                min_score=min(scores),
-                max_score=max(scores),
-                trend=trend,
-                trend_strength=trend_strength,
-                chunk_count=len(model_scores),
-                distribution=distribution,
-                top_markers=top_markers
-            )
+            aggregated[model.type.value] = self._aggregate_model_scores(model, model_scores)
         
         return aggregated
     
+    def _aggregate_model_scores(
+        self,
+        model: ScoringModel,
+        model_scores: List[ChunkScore]
+    ) -> AggregatedScore:
+        """Aggregiert die Chunk-Scores eines Modells (ein Durchlauf über die Scores)."""
+        scores = np.fromiter(
+            (cs.normalized_score for cs in model_scores),
+            dtype=float,
+            count=len(model_scores)
+        )
+        
+        # Berechne Trend
+        trend, trend_strength = self._calculate_trend(scores)
+        
+        # Score-Verteilung
+        distribution = self._calculate_distribution(scores)
+        
+        # Top Marker
+        marker_lists = [cs.contributing_markers for cs in model_scores]
+        top_markers = [
+            {'name': name, 'count': count}
+            for name, count in top_marker_counts(marker_lists, 5)
+        ]
+        
+        return AggregatedScore(
+            model_id=model.id,
+            score_type=model.type,
+            average_score=scores.mean(),
+            min_score=scores.min(),
+            max_score=scores.max(),
+            trend=trend,
+            trend_strength=trend_strength,
+            chunk_count=len(model_scores),
+            distribution=distribution,
+            top_markers=top_markers
+        )
+    
+    @staticmethod
+    def _group_scores(
+        chunk_scores: List[ChunkScore],
+        key
+    ) -> Dict[Any, List[ChunkScore]]:
+        """Gruppiert Chunk-Scores in einem Durchlauf (Reihenfolge bleibt erhalten)."""
+        grouped = defaultdict(list)
+        for cs in chunk_scores:
+            grouped[key(cs)].append(cs)
+        return grouped
+    
     def _calculate_trend(
         self,
         scores: List[float]
@@ -361,27 +710,12 @@ class ScoringEngine:
         scores: List[float]
     ) -> Dict[str, int]:
         """Berechnet Score-Verteilung."""
-        distribution = {
-            "1-2": 0,
-            "3-4": 0,
-            "5-6": 0,
-            "7-8": 0,
-            "9-10": 0
-        }
-        
-        for score in scores:
-            if score <= 2:
-                distribution["1-2"] += 1
-            elif score <= 4:
-                distribution["3-4"] += 1
-            elif score <= 6:
-                distribution["5-6"] += 1
-            elif score <= 8:
-                distribution["7-8"] += 1
-            else:
-                distribution["9-10"] += 1
-        
-        return distribution
+        # Obergrenzen der Buckets: ≤2, ≤4, ≤6, ≤8, Rest
+        counts = np.bincount(
+            np.searchsorted(_DISTRIBUTION_EDGES, np.asarray(scores, dtype=float), side='left'),
+            minlength=len(_DISTRIBUTION_BUCKETS)
+        )
+        return dict(zip(_DISTRIBUTION_BUCKETS, counts.tolist()))
     
     def _calculate_speaker_scores(
         self,
@@ -389,14 +723,15 @@ class ScoringEngine:
         chunk_scores: List[ChunkScore]
     ) -> Dict[str, Dict[str, AggregatedScore]]:
         """Berechnet Scores pro Sprecher."""
+        scores_by_chunk = self._group_scores(chunk_scores, lambda cs: cs.chunk_id)
         speaker_scores = defaultdict(lambda: defaultdict(list))
         
-        # Sammle Scores pro Sprecher
-        for chunk, scores in zip(chunks, chunk_scores):
+        # Sammle Scores pro Sprecher und Modell
+        for chunk in chunks:
             if chunk.speaker:
-                speaker_name = chunk.speaker.name
-                for score in [s for s in chunk_scores if s.chunk_id == chunk.id]:
-                    speaker_scores[speaker_name][score.model_id].append(score)
+                by_model = speaker_scores[chunk.speaker.name]
+                for score in scores_by_chunk.get(chunk.id, ()):
+                    by_model[score.model_id].append(score)
         
         # Aggregiere pro Sprecher
         result = {}
@@ -404,48 +739,17 @@ class ScoringEngine:
             result[speaker] = {}
             for model_id, scores in model_scores.items():
                 model = self.models[model_id]
-                result[speaker][model.type.value] = self._aggregate_scores(
-                    scores,
-                    [model]
-                )[model.type.value]
+                result[speaker][model.type.value] = self._aggregate_model_scores(model, scores)
         
         return result
     
     def _create_timeline(
         self,
         chunk_scores: List[ChunkScore]
-    ) -> List[Dict[str, Any]]:
-        """Erstellt Timeline der Score-Entwicklung."""
-        timeline = []
-        
-        # Gruppiere nach Zeitstempel
-        scores_by_time = defaultdict(lambda: defaultdict(list))
-        
-        for score in chunk_scores:
-            if score.timestamp:
-                # Runde auf Stunde
-                hour = score.timestamp.replace(minute=0, second=0, microsecond=0)
-                scores_by_time[hour][score.model_id].append(score.normalized_score)
-        
-        # Erstelle Timeline-Einträge
-        for timestamp in sorted(scores_by_time.keys()):
-            entry = {
-                'timestamp': timestamp.isoformat(),
-                'scores': {}
-            }
-            
-            for model_id, scores in scores_by_time[timestamp].items():
-                model = self.models[model_id]
-                entry['scores'][model.type.value] = {
-                    'average': np.mean(scores),
-                    'min': min(scores),
-                    'max': max(scores),
-                    'count': len(scores)
-                }
-            
-            timeline.append(entry)
-        
-        return timeline
+    ) -> TimelineRollups:
+        """Erstellt die Timeline-Pyramide (Minute, Stunde, Tag, Woche)."""
+        score_types = {model_id: model.type.value for model_id, model in self.models.items()}
+        return TimelineRollups.from_chunk_scores(chunk_scores, score_types)
     
     def _generate_alerts(
         self,
@@ -552,8 +856,51 @@ class ScoringEngine:
     def add_custom_model(self, model: ScoringModel):
         """Fügt ein benutzerdefiniertes Scoring-Modell hinzu."""
         self.models[model.id] = model
+        self._weight_cache.clear()
+        if self.chunk_cache is not None:
+            self.chunk_cache.clear()
         logger.info(f"Custom Scoring-Modell '{model.name}' hinzugefügt")
     
+    def compile(self):
+        """Kompiliert die Gewichtsmatrix aller aktiven Modelle vorab."""
+        self._weight_cache.clear()
+        self._compile_weight_matrix(self._get_active_models())
+    
+    def create_aggregator(self, models: Optional[List[str]] = None) -> IncrementalAggregator:
+        """Erzeugt einen IncrementalAggregator für Live-Sessions."""
+        return IncrementalAggregator(self._get_active_models(models))
+    
+    def score_chunk(
+        self,
+        chunk: TextChunk,
+        matches: List[MarkerMatch],
+        aggregator: Optional[IncrementalAggregator] = None
+    ) -> List[ChunkScore]:
+        """Bewertet einen neuen Chunk und schreibt die Scores in den Aggregator.
+
+        Die Modelle kommen aus dem Aggregator (sonst alle aktiven Modelle);
+        die aggregierten Scores werden dabei in O(1) pro Modell aktualisiert.
+        """
+        models = aggregator.models if aggregator else self._get_active_models()
+        chunk_matches = [m for m in matches if m.chunk_id == chunk.id]
+        signature = self._content_signature(chunk, chunk_matches)
+        chunk_scores = [
+            self._calculate_chunk_score(chunk, chunk_matches, model, signature)
+            for model in models
+        ]
+        if aggregator:
+            aggregator.add_many(chunk_scores)
+        return chunk_scores
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Kennzahlen der Engine inklusive Chunk-Cache (Trefferquote, Speicher)."""
+        return {
+            'models': len(self.models),
+            'active_models': len(self._get_active_models()),
+            'model_version': self.model_version,
+            'chunk_cache': self.chunk_cache.stats() if self.chunk_cache is not None else None
+        }
+    
     def get_model(self, model_id: str) -> Optional[ScoringModel]:
         """Gibt ein spezifisches Scoring-Modell zurück."""
         return self.models.get(model_id)
@@ -595,3 +942,16 @@ class ScoringEngine:
                 ))
         
         return comparisons
+    
+    def compare_cohort(
+        self,
+        results: List[ScoringResult],
+        labels: Optional[List[str]] = None,
+        model_ids: Optional[List[str]] = None
+    ) -> CohortComparison:
+        """Vergleicht N Scoring-Ergebnisse auf einmal (Verallgemeinerung von compare_scores).
+
+        delta_matrix(score_type)[i, j] entspricht compare_scores(results[i], results[j]).delta.
+        """
+        score_types = [model.type.value for model in self._get_active_models(model_ids)]
+        return stack_runs(results, labels, score_types)
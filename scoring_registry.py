@@ -0,0 +1,188 @@
+"""Prozessweite Registry für Scoring-Modelle.
+
+Die Engine wird einmal gebaut und kompiliert und ist per Version austauschbar.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from score_models import ScoringModel, ScoreType
+from marker_models import MarkerCategory, MarkerSeverity
+from scoring_engine import ScoringEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_DIR = Path(__file__).parent / "scoring_models"
+
+
+def model_from_dict(data: Dict[str, Any]) -> ScoringModel:
+    """Erzeugt ein ScoringModel aus einer deklarativen Definition (YAML/JSON).
+
+    Raises:
+        ValueError: bei fehlenden Feldern oder unbekanntem Typ/Kategorie/Severity
+    """
+    missing = [key for key in ("id", "name", "type", "category_weights") if key not in data]
+    if missing:
+        raise ValueError(f"Fehlende Felder: {', '.join(missing)}")
+
+    try:
+        score_type = ScoreType(data["type"])
+    except ValueError:
+        raise ValueError(f"Unbekannter Score-Typ: {data['type']}") from None
+
+    categories = {c.value for c in MarkerCategory}
+    unknown = [c for c in data["category_weights"] if c not in categories]
+    if unknown:
+        raise ValueError(f"Unbekannte Kategorien: {', '.join(unknown)}")
+
+    severities = {s.value for s in MarkerSeverity}
+    severity_multipliers = data.get("severity_multipliers")
+    if severity_multipliers:
+        unknown = [s for s in severity_multipliers if s not in severities]
+        if unknown:
+            raise ValueError(f"Unbekannte Severities: {', '.join(unknown)}")
+
+    return ScoringModel(
+        id=data["id"],
+        name=data["name"],
+        type=score_type,
+        description=data.get("description", ""),
+        category_weights={c: float(w) for c, w in data["category_weights"].items()},
+        inverse_scale=bool(data.get("inverse_scale", False)),
+        thresholds=data.get("thresholds"),
+        severity_multipliers=severity_multipliers,
+        normalization_factor=float(data.get("normalization_factor", 1.0)),
+        scale_min=float(data.get("scale_min", 1.0)),
+        scale_max=float(data.get("scale_max", 10.0)),
+        active=bool(data.get("active", True))
+    )
+
+
+def load_model_definitions(model_dir: Path) -> List[ScoringModel]:
+    """Lädt alle deklarativen Modelle (*.yaml, *.yml, *.json) aus einem Verzeichnis.
+
+    Python-Module im Verzeichnis werden ignoriert; fehlerhafte Dateien werden
+    protokolliert und übersprungen.
+    """
+    models = []
+    if not model_dir.exists():
+        return models
+
+    files = sorted(
+        f for f in model_dir.iterdir()
+        if f.suffix in (".yaml", ".yml", ".json")
+    )
+    for file in files:
+        try:
+            text = file.read_text("utf-8")
+            data = json.loads(text) if file.suffix == ".json" else yaml.safe_load(text)
+            definitions = data if isinstance(data, list) else [data]
+            for definition in definitions:
+                models.append(model_from_dict(definition))
+        except (yaml.YAMLError, json.JSONDecodeError, ValueError, TypeError, AttributeError) as e:
+            logger.error(f"Scoring-Modell {file.name} übersprungen: {e}")
+    return models
+
+
+def models_digest(models: Dict[str, ScoringModel]) -> str:
+    """SHA-256 über die Modelldefinitionen (unabhängig von der Ladereihenfolge)."""
+    content = repr([models[model_id] for model_id in sorted(models)])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ScoringRegistry:
+    """Hält die aktuelle ScoringEngine eines Prozesses.
+
+    Die Engine wird einmal gebaut (Standardmodelle plus deklarative Modelle aus
+    ``scoring_models/``) und ihre Gewichtsmatrizen werden vorkompiliert, sodass
+    pro Request nur noch gerechnet wird. ``reload()``/``swap()`` ersetzen die
+    Engine atomar durch eine neue Version; laufende Requests behalten die
+    Engine, die sie beim Start geholt haben.
+    """
+
+    def __init__(self, model_dir: Optional[Path] = None, chunk_cache_bytes: int = 0):
+        # Kein Chunk-Cache per Default: der vektorisierte Pfad von /analyze nutzt ihn nicht
+        self.model_dir = Path(model_dir) if model_dir else DEFAULT_MODEL_DIR
+        self.chunk_cache_bytes = chunk_cache_bytes
+        self._engine: Optional[ScoringEngine] = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def engine(self) -> ScoringEngine:
+        """Aktuelle Engine (wird beim ersten Zugriff gebaut)."""
+        engine = self._engine
+        if engine is None:
+            with self._lock:
+                if self._engine is None:
+                    self._install(self.build_engine())
+                engine = self._engine
+        return engine
+
+    def build_engine(self, extra_models: Optional[List[ScoringModel]] = None) -> ScoringEngine:
+        """Baut und kompiliert eine neue Engine, ohne die aktuelle zu ersetzen."""
+        engine = ScoringEngine(chunk_cache_bytes=self.chunk_cache_bytes)
+        for model in load_model_definitions(self.model_dir) + list(extra_models or []):
+            engine.add_custom_model(model)
+        engine.compile()
+        return engine
+
+    def reload(self) -> int:
+        """Lädt die Modelldefinitionen neu und tauscht die Engine aus.
+
+        Returns:
+            neue Version
+        """
+        return self.swap(self.build_engine())
+
+    def swap(self, engine: ScoringEngine) -> int:
+        """Ersetzt die aktuelle Engine atomar.
+
+        Returns:
+            neue Version
+        """
+        engine.compile()
+        with self._lock:
+            self._install(engine)
+            return self._version
+
+    def _install(self, engine: ScoringEngine):
+        self._version += 1
+        engine.model_version = self._version
+        engine.model_digest = models_digest(engine.models)
+        self._engine = engine
+        logger.info(f"Scoring-Registry v{self._version}: {len(engine.models)} Modelle")
+
+    def describe(self) -> Dict[str, Any]:
+        engine = self.engine
+        return {
+            "version": self._version,
+            "digest": engine.model_digest,
+            "stats": engine.get_statistics(),
+            "models": {
+                model_id: {
+                    "name": model.name,
+                    "type": model.type.value,
+                    "active": model.active
+                }
+                for model_id, model in engine.models.items()
+            }
+        }
+
+
+scoring_registry = ScoringRegistry()
+
+
+def get_scoring_engine() -> ScoringEngine:
+    """Prozessweite, vorkompilierte ScoringEngine."""
+    return scoring_registry.engine
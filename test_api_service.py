@@ -0,0 +1,319 @@
+"""
+test_api_service.py
+Tests for the FastAPI service endpoints.
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from dataclasses import replace
+from unittest import mock
+from fastapi.testclient import TestClient
+
+import api_service
+import prefork_server
+from admission import AdmissionController
+from artifact_store import ArtifactStore
+from metrics import Histogram, MetricsRegistry
+
+MESSAGES = [
+    {"id": "m1", "ts": "2025-07-01T09:00:00", "speaker": "A", "text": "Ich bin wütend"},
+    {"id": "m2", "ts": "2025-07-01T09:01:00", "speaker": "B", "text": "Das tut mir leid"},
+]
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(api_service.app)
+
+    def test_metrics_after_analysis(self):
+        response = self.client.post(
+            "/analyze", json={"messages": MESSAGES, "window": {"size": 2, "overlap": 0}}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        metrics = self.client.get("/metrics")
+        self.assertEqual(metrics.status_code, 200)
+        self.assertTrue(metrics.headers["content-type"].startswith("text/plain"))
+        body = metrics.text
+        stages = ("detection", "activation", "scoring", "drift", "serialization", "artifact_write")
+        for stage in stages:
+            self.assertIn(f'marker_engine_stage_duration_seconds_count{{stage="{stage}"}}', body)
+        self.assertIn("# TYPE marker_engine_messages_total counter", body)
+        self.assertIn('marker_engine_hits_total{level="ATO"}', body)
+        self.assertIn("marker_engine_pool_queue_depth 0.0", body)
+
+class TestCompactView(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(api_service.app)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_store = api_service.artifact_store
+        api_service.artifact_store = ArtifactStore(
+            self.tmp.name, json_default=api_service._json_default
+        )
+        api_service.engine.markers["CLU_TEST_ANGER"] = {
+            "id": "CLU_TEST_ANGER",
+            "composed_of": ["ATO_ANGER"],
+            "activation": {"rule": "ANY", "params": {"count": 1}}
+        }
+
+    def tearDown(self):
+        api_service.engine.markers.pop("CLU_TEST_ANGER", None)
+        api_service.artifact_store = self.original_store
+        self.tmp.cleanup()
+
+    def test_compact_matches_full(self):
+        messages = [dict(m, id=f"compact-{m['id']}") for m in MESSAGES]
+        body = {"messages": messages, "window": {"size": 2, "overlap": 0}}
+        full = self.client.post("/analyze", json=body).json()
+        compact = self.client.post("/analyze?view=compact", json=body).json()
+
+        self.assertEqual(compact["view"], "compact")
+        self.assertEqual([h["marker"] for h in compact["hits"]],
+                         [h["marker"] for h in full["hits"]])
+        self.assertEqual(sum(compact["marker_counts"].values()), len(full["hits"]))
+
+        cluster_idx = next(
+            i for i, h in enumerate(compact["hits"]) if h["marker"] == "CLU_TEST_ANGER"
+        )
+        cluster = compact["hits"][cluster_idx]
+        self.assertTrue(cluster["evidence"])
+        for ref in cluster["evidence"]:
+            self.assertEqual(compact["hits"][ref]["marker"], "ATO_ANGER")
+            self.assertEqual(compact["hits"][ref]["msg_range"], [0, 2])
+
+        detail = self.client.get(f"/artifacts/{compact['artifact']}/hits/{cluster_idx}")
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(detail.json(), full["hits"][cluster_idx])
+
+        # Another worker process only shares the artifact directory
+        api_service.artifact_store = ArtifactStore(self.tmp.name)
+        detail = self.client.get(f"/artifacts/{compact['artifact']}/hits/{cluster_idx}")
+        self.assertEqual(detail.json(), full["hits"][cluster_idx])
+
+    def test_artifact_key_follows_markers_and_scoring_models(self):
+        body = {"messages": [dict(m, id=f"versioned-{m['id']}") for m in MESSAGES]}
+
+        def artifact_key():
+            return self.client.post("/analyze?view=compact", json=body).json()["artifact"]
+
+        def hit_count(key):
+            return len(self.client.get(f"/artifacts/{key}").json()["output"]["hits"])
+
+        first = artifact_key()
+        self.assertEqual(artifact_key(), first)
+
+        original_digest = api_service.MARKER_SET_DIGEST
+        api_service.MARKER_SET_DIGEST = "0" * 64
+        try:
+            changed_markers = artifact_key()
+        finally:
+            api_service.MARKER_SET_DIGEST = original_digest
+        self.assertNotEqual(changed_markers, first)
+
+        registry = api_service.scoring_registry
+        base = registry.build_engine()
+        extra = next(iter(base.models.values()))
+        registry.swap(registry.build_engine([replace(extra, id="test_extra_model")]))
+        self.addCleanup(registry.reload)
+        changed_models = artifact_key()
+        self.assertNotIn(changed_models, (first, changed_markers))
+        self.assertEqual(hit_count(changed_models), hit_count(first))
+
+    def test_openapi_documents_both_views(self):
+        schema = self.client.get("/openapi.json").json()
+        response = schema["paths"]["/analyze"]["post"]["responses"]["200"]
+        refs = [s["$ref"] for s in response["content"]["application/json"]["schema"]["anyOf"]]
+        self.assertEqual(refs, [
+            "#/components/schemas/AnalysisResponse", "#/components/schemas/CompactAnalysisResponse"
+        ])
+        compact = schema["components"]["schemas"]["CompactAnalysisResponse"]["properties"]
+        self.assertIn("artifact", compact)
+        self.assertIn("marker_counts", compact)
+
+    def test_invalid_view_rejected(self):
+        response = self.client.post("/analyze?view=tiny", json={"messages": MESSAGES})
+        self.assertEqual(response.status_code, 422)
+
+class TestArtifactStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_once_and_invalid_keys(self):
+        store = ArtifactStore(self.tmp.name)
+        key = "a" * 64
+        self.assertTrue(store.put(key, {"n": 1}))
+        self.assertFalse(store.put(key, {"n": 2}))
+        self.assertEqual(store.get(key), {"n": 1})
+        self.assertIsNone(store.get("../" + key))
+        self.assertNotIn("../" + key, store)
+
+    def test_prune_bounds_count_and_age(self):
+        store = ArtifactStore(self.tmp.name, max_entries=3, max_age_seconds=3600,
+                              prune_interval=100)
+        keys = [f"{i:064x}" for i in range(5)]
+        now = time.time()
+        for i, key in enumerate(keys):
+            store.put(key, {"i": i})
+            os.utime(os.path.join(self.tmp.name, f"{key}.json"), (now - 100 + i, now - 100 + i))
+        self.assertEqual(store.prune(), 2)
+        self.assertEqual([key in store for key in keys], [False, False, True, True, True])
+
+        expired = now - 7200
+        os.utime(os.path.join(self.tmp.name, f"{keys[2]}.json"), (expired, expired))
+        self.assertIsNone(store.get(keys[2]))
+        self.assertEqual(store.prune(), 1)
+        self.assertEqual(store.get(keys[4]), {"i": 4})
+
+class TestAdmissionControl(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(api_service.app)
+        self.original = api_service.admission
+
+    def tearDown(self):
+        api_service.admission = self.original
+
+    def test_rejects_oversized_request(self):
+        api_service.admission = AdmissionController(max_messages_per_request=1)
+        response = self.client.post("/analyze", json={"messages": MESSAGES})
+        self.assertEqual(response.status_code, 413)
+
+        api_service.admission = AdmissionController(max_request_text_chars=10)
+        response = self.client.post("/analyze", json={"messages": MESSAGES})
+        self.assertEqual(response.status_code, 413)
+
+    def test_saturated_pool_returns_429_but_health_stays_up(self):
+        api_service.admission = AdmissionController(max_inflight_messages=10)
+        self.assertTrue(api_service.admission.try_admit(9))
+
+        response = self.client.post("/analyze", json={"messages": MESSAGES})
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response.headers["Retry-After"]), 1)
+
+        health = self.client.get("/health")
+        self.assertEqual(health.status_code, 200)
+        self.assertEqual(health.json()["load"]["inflight_messages"], 9)
+
+        api_service.admission.release(9, 0.1)
+        response = self.client.post("/analyze", json={"messages": MESSAGES})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(api_service.admission.inflight_messages, 0)
+
+class TestScoringRegistryEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(api_service.app)
+
+    def test_scores_reload_bumps_version(self):
+        before = self.client.get("/scores").json()
+        self.assertIn("manipulation_index", before["models"])
+
+        reloaded = self.client.post("/scores/reload").json()
+        self.assertEqual(reloaded["version"], before["version"] + 1)
+        self.assertEqual(self.client.get("/scores").json()["version"], reloaded["version"])
+
+        response = self.client.post("/analyze", json={"messages": MESSAGES})
+        self.assertEqual(response.status_code, 200)
+
+class TestPreforkServer(unittest.TestCase):
+
+    def tearDown(self):
+        api_service.configure_capacity(1)
+
+    def test_configure_capacity_splits_server_budget(self):
+        with mock.patch.dict(os.environ, {"MAX_WORKERS": "8", "MAX_INFLIGHT_MESSAGES": "6000",
+                                          "MAX_MESSAGES_PER_REQUEST": "500"}):
+            api_service.configure_capacity(3)
+        self.assertEqual(api_service.ANALYSIS_WORKERS, 2)
+        self.assertEqual(api_service.analysis_pool._max_workers, 2)
+        self.assertEqual(api_service.admission.max_inflight_messages, 2000)
+        self.assertEqual(api_service.admission.max_messages_per_request, 500)
+        self.assertEqual(api_service.admission.workers, 2)
+
+    def test_master_freezes_before_forking(self):
+        calls = mock.Mock()
+        calls.configure_capacity.side_effect = api_service.configure_capacity
+        calls.fork.side_effect = [101, 102, 103]
+        calls.wait.side_effect = ChildProcessError
+
+        with tempfile.TemporaryDirectory() as metrics_dir, \
+                mock.patch.dict(os.environ, {"METRICS_MULTIPROC_DIR": metrics_dir}), \
+                mock.patch.object(api_service.engine, "freeze", calls.engine_freeze), \
+                mock.patch.object(api_service, "configure_capacity", calls.configure_capacity), \
+                mock.patch.object(prefork_server, "_bind_socket", calls.bind_socket), \
+                mock.patch.object(prefork_server.gc, "collect", calls.gc_collect), \
+                mock.patch.object(prefork_server.gc, "freeze", calls.gc_freeze), \
+                mock.patch.object(prefork_server.os, "fork", calls.fork), \
+                mock.patch.object(prefork_server.os, "wait", calls.wait), \
+                mock.patch.object(prefork_server.signal, "signal"):
+            prefork_server.serve_preforked("127.0.0.1", 0, workers=3)
+
+        order = [name for name, _, _ in calls.mock_calls if "." not in name]
+        self.assertEqual(order, [
+            "engine_freeze", "configure_capacity", "bind_socket", "gc_collect", "gc_freeze",
+            "fork", "fork", "fork", "wait",
+        ])
+        calls.configure_capacity.assert_called_once_with(3)
+        calls.bind_socket.return_value.close.assert_called_once()
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        hist = registry.register(Histogram("t_seconds", "test", ["stage"], buckets=(0.1, 1.0)))
+        hist.observe(0.05, stage="a")
+        hist.observe(0.5, stage="a")
+        hist.observe(5.0, stage="a")
+        text = registry.render()
+        self.assertIn('t_seconds_bucket{stage="a",le="0.1"} 1', text)
+        self.assertIn('t_seconds_bucket{stage="a",le="1.0"} 2', text)
+        self.assertIn('t_seconds_bucket{stage="a",le="+Inf"} 3', text)
+        self.assertIn('t_seconds_count{stage="a"} 3', text)
+
+    def test_multiprocess_render_merges_workers(self):
+        def build():
+            registry = MetricsRegistry()
+            return (registry,
+                    registry.counter("t_total", "test"),
+                    registry.gauge("t_depth", "test"),
+                    registry.register(Histogram("t_seconds", "test", buckets=(1.0,))))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            registry, counter, gauge, hist = build()
+            registry.start_multiprocess(tmp, interval=3600)
+            counter.inc(2)
+            gauge.set(3)
+            hist.observe(0.5)
+
+            # Snapshot of a worker that has since exited
+            _, other_counter, other_gauge, other_hist = build()
+            other_counter.inc(5)
+            other_gauge.set(7)
+            other_hist.observe(2.0)
+            dead_pid = 2 ** 22 + 1
+            with open(os.path.join(tmp, f"{dead_pid}.json"), "w") as f:
+                others = (other_counter, other_gauge, other_hist)
+                json.dump({m.name: m.snapshot() for m in others}, f)
+
+            text = registry.render()
+            self.assertIn("t_total 7.0", text)
+            self.assertIn("t_depth 3.0", text)
+            self.assertIn('t_seconds_bucket{le="1.0"} 1', text)
+            self.assertIn('t_seconds_bucket{le="+Inf"} 2', text)
+            self.assertIn("t_seconds_count 2", text)
+
+    def test_label_mismatch_raises(self):
+        hist = Histogram("t_seconds", "test", ["stage"])
+        with self.assertRaises(ValueError):
+            hist.observe(1.0)
+
+if __name__ == '__main__':
+    unittest.main()
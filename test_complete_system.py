@@ -105,6 +105,22 @@ class TestCompleteSystem(unittest.TestCase):
             if "evidence" in hit:
                 self.assertIsInstance(hit["evidence"], list)
 
+    def test_frozen_engine_matches_unfrozen(self):
+        """Test that the precompiled, frozen engine produces identical hits."""
+        messages = [
+            {"id": "m1", "ts": "2025-07-01T09:00:00", "speaker": "A", "text": "Ich bin wütend"},
+            {"id": "m2", "ts": "2025-07-01T09:01:00", "speaker": "B",
+             "text": "Das tut mir leid, 50k"},
+        ]
+        expected = self.engine.analyze_conversation(messages, {"size": 1, "overlap": 0}, {})
+
+        frozen = MarkerEngine().freeze()
+        result = frozen.analyze_conversation(messages, {"size": 1, "overlap": 0}, {})
+
+        self.assertEqual(json.dumps(expected, sort_keys=True), json.dumps(result, sort_keys=True))
+        with self.assertRaises(TypeError):
+            frozen.markers["NEW_MARKER"] = {}
+
     def test_marker_validation(self):
         """Test that all referenced markers exist."""
         # Check that all composed_of references are valid
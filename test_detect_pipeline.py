@@ -0,0 +1,512 @@
+"""
+test_detect_pipeline.py
+Equivalence tests for the DETECT_ chunker and matcher modules (streaming and
+parallel chunking, timestamp fast path, q-gram filter, match deduplication).
+
+The DETECT_ files are flat copies of a package that uses relative imports, so
+the module assembles them into a temporary package before importing.
+"""
+
+import importlib
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+DETECTORS = Path(__file__).resolve().parent / "DETECT_" / "repo" / "detectors"
+PACKAGE = "detect_pipeline_pkg"
+LAYOUT = {
+    "chunker": ["chunk_models", "chat_importers", "text_chunker", "importer_benchmark"],
+    "matcher": ["marker_models", "fuzzy_engine", "marker_matcher"],
+    "config": ["config_loader"],
+}
+
+_tmp = None
+
+
+def setUpModule():
+    global _tmp, text_chunker, chunk_models, chat_importers
+    global fuzzy_engine, marker_matcher, config_loader
+    _tmp = tempfile.TemporaryDirectory()
+    root = Path(_tmp.name) / PACKAGE
+    for subpackage, modules in LAYOUT.items():
+        target = root / subpackage
+        target.mkdir(parents=True)
+        (target / "__init__.py").write_text("")
+        for module in modules:
+            shutil.copy(DETECTORS / f"DETECT_{module}.py", target / f"{module}.py")
+    (root / "__init__.py").write_text("")
+    sys.path.insert(0, _tmp.name)
+
+    chunk_models = importlib.import_module(f"{PACKAGE}.chunker.chunk_models")
+    chat_importers = importlib.import_module(f"{PACKAGE}.chunker.chat_importers")
+    text_chunker = importlib.import_module(f"{PACKAGE}.chunker.text_chunker")
+    fuzzy_engine = importlib.import_module(f"{PACKAGE}.matcher.fuzzy_engine")
+    marker_matcher = importlib.import_module(f"{PACKAGE}.matcher.marker_matcher")
+    config_loader = importlib.import_module(f"{PACKAGE}.config.config_loader")
+
+
+def tearDownModule():
+    sys.path.remove(_tmp.name)
+    for name in [m for m in sys.modules if m == PACKAGE or m.startswith(PACKAGE + ".")]:
+        del sys.modules[name]
+    _tmp.cleanup()
+
+
+def make_whatsapp_export(n_messages=300, seed=11):
+    """WhatsApp-style export with multi-line messages, umlauts and time gaps."""
+    rng = random.Random(seed)
+    timestamp = datetime(2024, 3, 1, 8, 0)
+    lines = []
+    for i in range(n_messages):
+        timestamp += timedelta(minutes=rng.choice((1, 2, 5, 45, 180)))
+        speaker = rng.choice(["Anna", "Ben", "Jörg Müller"])
+        words = ["Hallo", "äöü", "wirklich?", "ok", "Grüße 🙂", "naja"]
+        text = " ".join(rng.choices(words, k=rng.randint(1, 30)))
+        lines.append(f"{timestamp:%d.%m.%y, %H:%M} - {speaker}: {text}")
+        if rng.random() < 0.15:
+            lines.append("Fortsetzung der Nachricht mit ß")
+    return "\n".join(lines) + "\n"
+
+
+def chunk_key(chunk):
+    """Everything but the random chunk IDs and the links derived from them."""
+    model = chunk.to_model() if hasattr(chunk, "to_model") else chunk
+    return model.model_dump(exclude={"id", "previous_chunk_id", "next_chunk_id"})
+
+
+class DetectTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, text):
+        path = Path(self.tmp.name) / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+
+class TestStreamingChunking(DetectTestCase):
+
+    def test_chunk_file_matches_chunk_text_across_block_sizes(self):
+        text = make_whatsapp_export()
+        path = self.write("chat.txt", text)
+        expected = [chunk_key(c) for c in text_chunker.TextChunker().chunk_text(text).chunks]
+        self.assertGreater(len(expected), 10)
+
+        for block_size in (1, 7, 64, 1000, 1 << 20):
+            with self.subTest(block_size=block_size):
+                chunks = text_chunker.TextChunker().chunk_file(path, block_size=block_size)
+                self.assertEqual([chunk_key(c) for c in chunks], expected)
+
+    def test_parallel_seams_match_sequential(self):
+        text = make_whatsapp_export(n_messages=400, seed=5)
+        path = self.write("chat.txt", text)
+        expected = [chunk_key(c) for c in text_chunker.TextChunker().chunk_file(path)]
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            for range_size in (64, 300, 1000, 4096, 20000):
+                with self.subTest(range_size=range_size):
+                    chunks = text_chunker.TextChunker().chunk_file_parallel(
+                        path, executor=pool, range_size=range_size
+                    )
+                    self.assertEqual([chunk_key(c) for c in chunks], expected)
+
+
+class TestImporterOffsets(DetectTestCase):
+
+    def test_mbox_positions_are_character_offsets(self):
+        mails = []
+        senders = [("Jörg Müller", "Grüße aus Köln 🙂"), ("Anna", "ok"), ("Zoë", "Schöne Straße")]
+        for i, (sender, body) in enumerate(senders):
+            mails.append(
+                f"From sender{i}@example.org Fri Mar  1 08:0{i}:00 2024\r\n"
+                f"From: {sender} <sender{i}@example.org>\r\n"
+                f"Date: Fri, 01 Mar 2024 08:0{i}:00 +0100\r\n"
+                "Content-Type: text/plain; charset=utf-8\r\n"
+                "\r\n"
+                f"{body}\r\n>From ä\r\n\r\n"
+            )
+        path = Path(self.tmp.name) / "mail.mbox"
+        path.write_bytes("".join(mails).encode("utf-8"))
+        decoded = "".join(chat_importers.iter_decoded_blocks(path))
+
+        messages = list(chat_importers.MboxImporter().iter_messages(path))
+        self.assertEqual([m["speaker"] for m in messages], ["Jörg Müller", "Anna", "Zoë"])
+        self.assertEqual(messages[-1]["end_pos"], len(decoded))
+        for message, mail in zip(messages, mails):
+            entry = decoded[message["start_pos"]:message["end_pos"]]
+            self.assertEqual(entry, mail.replace("\r\n", "\n"))
+
+
+    def test_signal_messages_and_positions(self):
+        envelopes = [
+            {"envelope": {"sourceName": "Jörg", "timestamp": 1709280000000,
+                          "dataMessage": {"timestamp": 1709280000000, "message": "Grüße 🙂"}}},
+            {"envelope": {"sourceNumber": "+49123", "receiptMessage": {"isDelivery": True}}},
+            {"envelope": {"syncMessage": {"sentMessage": {"timestamp": 1709280060000,
+                                                          "message": "Hallo"}}}},
+            {"envelope": {"sourceNumber": "+49123", "dataMessage": {"message": "ohne Zeit"}}},
+        ]
+        lines = [json.dumps(e, ensure_ascii=False) for e in envelopes]
+        lines.insert(2, "kein json")
+        path = self.write("signal.json", "\n".join(lines) + "\n")
+        decoded = "".join(chat_importers.iter_decoded_blocks(path))
+        importer = chat_importers.detect_importer(decoded)
+        self.assertIsInstance(importer, chat_importers.SignalImporter)
+
+        with self.assertLogs(chat_importers.logger, "WARNING"):
+            messages = list(importer.iter_messages(path))
+        self.assertEqual(
+            [(m["speaker"], m["text"]) for m in messages],
+            [("Jörg", "Grüße 🙂"), ("Ich", "Hallo"), ("+49123", "ohne Zeit")],
+        )
+        self.assertEqual(messages[0]["timestamp"], datetime(2024, 3, 1, 8, tzinfo=timezone.utc))
+        self.assertIsNone(messages[2]["timestamp"])
+        for message, line in zip(messages, [lines[0], lines[3], lines[4]]):
+            self.assertEqual(decoded[message["start_pos"]:message["end_pos"]], line)
+
+    def test_discord_messages_and_positions(self):
+        items = [
+            {"id": "1", "timestamp": "2024-03-01T08:00:00.1234567+00:00", "content": "Hallo äöü",
+             "author": {"name": "anna", "nickname": "Anna"}},
+            {"id": "2", "timestamp": "2024-03-01T08:01:00Z", "content": "",
+             "author": {"name": "bot"}},
+            {"id": "3", "timestamp": "2024-03-01T08:02:00.5Z", "content": "ok " * 400,
+             "author": {"name": "ben"}},
+        ]
+        export = {"guild": {"name": "G"}, "channel": {"name": "c"}, "messages": items}
+        path = self.write("discord.json", json.dumps(export, ensure_ascii=False, indent=2))
+        decoded = "".join(chat_importers.iter_decoded_blocks(path))
+        importer = chat_importers.detect_importer(decoded)
+        self.assertIsInstance(importer, chat_importers.DiscordImporter)
+
+        original = chat_importers.iter_decoded_blocks
+        # Kleine Blöcke, damit Nachrichten über Blockgrenzen reichen
+        chat_importers.iter_decoded_blocks = lambda p, e="utf-8": original(p, e, block_size=64)
+        self.addCleanup(setattr, chat_importers, "iter_decoded_blocks", original)
+        messages = list(importer.iter_messages(path))
+
+        self.assertEqual([m["speaker"] for m in messages], ["Anna", "ben"])
+        self.assertEqual(
+            [m["timestamp"] for m in messages],
+            [datetime(2024, 3, 1, 8, 0, 0, 123456, tzinfo=timezone.utc),
+             datetime(2024, 3, 1, 8, 2, 0, 500000, tzinfo=timezone.utc)],
+        )
+        for message, item in zip(messages, [items[0], items[2]]):
+            entry = decoded[message["start_pos"]:message["end_pos"]]
+            self.assertEqual(json.loads(entry), item)
+
+        truncated = self.write("truncated.json", decoded[:decoded.index('"id": "3"')])
+        with self.assertLogs(chat_importers.logger, "WARNING"):
+            self.assertEqual(len(list(importer.iter_messages(truncated))), 1)
+
+    def test_mbox_sniff_requires_from_line_and_headers(self):
+        importer = chat_importers.MboxImporter()
+        self.assertTrue(importer.sniff(
+            "From sender@example.org Fri Mar  1 08:00:00 2024\nFrom: Anna <a@example.org>\n"
+        ))
+        self.assertTrue(importer.sniff(
+            "From MAILER-DAEMON Fri Mar  1 08:00:00 +0100 2024\nReturn-Path: <>\n"
+        ))
+        self.assertFalse(importer.sniff("From the start I felt uneasy.\nAnother line\n"))
+        self.assertFalse(importer.sniff(
+            "From sender@example.org Fri Mar  1 08:00:00 2024\n\nkein Header\n"
+        ))
+
+    def test_plain_text_starting_with_from_is_not_mbox(self):
+        text = "From the start I felt uneasy.\n\nAnother paragraph follows here.\n"
+        path = self.write("notes.txt", text)
+        chunks = [c.to_model() for c in text_chunker.TextChunker().chunk_file(path)]
+        self.assertTrue(chunks[0].text.startswith("From the start"))
+        self.assertIn("Another paragraph follows here.", " ".join(c.text for c in chunks))
+
+
+class TestChunkRecords(DetectTestCase):
+
+    def test_construct_model_matches_model_construct(self):
+        speaker_fields = {"id": "speaker_1", "name": "Anna", "metadata": {"role": "a"}}
+        chunk_fields = {
+            "id": "c1", "type": chunk_models.ChunkType.MESSAGE, "text": "Hallo du",
+            "original_text": None,
+            "speaker": chunk_models.Speaker.model_construct(**speaker_fields),
+            "timestamp": datetime(2024, 3, 1, 8, 0), "start_pos": 0, "end_pos": 8,
+            "word_count": 2, "char_count": 8, "metadata": {"message_count": 1},
+            "previous_chunk_id": None, "next_chunk_id": "c2",
+        }
+        cases = ((chunk_models.Speaker, speaker_fields), (chunk_models.TextChunk, chunk_fields))
+        for model_cls, fields in cases:
+            fast = chunk_models.construct_model(model_cls, dict(fields))
+            reference = model_cls.model_construct(**fields)
+            self.assertEqual(fast, reference)
+            self.assertEqual(fast.model_fields_set, reference.model_fields_set)
+            self.assertEqual(fast.__pydantic_extra__, reference.__pydantic_extra__)
+            self.assertEqual(fast.__pydantic_private__, reference.__pydantic_private__)
+            self.assertEqual(fast.model_dump_json(), reference.model_dump_json())
+            self.assertEqual(fast.model_copy(update={"id": "x"}).id, "x")
+
+    def test_record_equality_ignores_lazy_counts(self):
+        def record():
+            return chunk_models.TextChunkRecord(
+                id="c1", type=chunk_models.ChunkType.MESSAGE, text="Hallo du da",
+                start_pos=0, end_pos=11, speaker=chunk_models.SpeakerRecord("s1", "Anna"),
+            )
+
+        first, second = record(), record()
+        self.assertEqual(first.word_count, 3)
+        self.assertEqual(first, second)
+        second.text = "Hallo"
+        self.assertNotEqual(first, second)
+        self.assertNotEqual(record(), chunk_models.TextChunkRecord(
+            id="c1", type=chunk_models.ChunkType.MESSAGE, text="Hallo du da",
+            start_pos=0, end_pos=11, speaker=chunk_models.SpeakerRecord("s1", "Anna"), word_count=2,
+        ))
+
+    def test_records_round_trip_through_models(self):
+        text = make_whatsapp_export(n_messages=40)
+        records = list(text_chunker.TextChunker().chunk_file(self.write("chat.txt", text)))
+        for record in records:
+            model = record.to_model()
+            self.assertEqual(chunk_models.TextChunk.model_validate(model.model_dump()), model)
+            restored = chunk_models.TextChunkRecord.from_model(model)
+            self.assertEqual(chunk_key(restored), chunk_key(model))
+
+
+class TestTimestampFastPath(unittest.TestCase):
+
+    FIELD_VALUES = {
+        "d": lambda rng: rng.choice(["1", "01", " 7", "29", "31", "32", "00"]),
+        "m": lambda rng: rng.choice(["1", "02", "12", "13", "0"]),
+        "y": lambda rng: rng.choice(["68", "69", "00", "99", "7"]),
+        "Y": lambda rng: rng.choice(["2024", "1999", "0999", "24"]),
+        "H": lambda rng: rng.choice(["0", "09", "23", "24", "7"]),
+        "M": lambda rng: rng.choice(["0", "05", "59", "60"]),
+        "S": lambda rng: rng.choice(["0", "30", "59", "60", "61", "62"]),
+    }
+
+    def random_string(self, fmt, rng):
+        out = []
+        i = 0
+        while i < len(fmt):
+            if fmt[i] == "%":
+                out.append(self.FIELD_VALUES[fmt[i + 1]](rng))
+                i += 2
+            elif fmt[i] == " ":
+                out.append(rng.choice([" ", "  ", "\t"]))
+                i += 1
+            else:
+                out.append(fmt[i] if rng.random() > 0.05 else rng.choice(".,/-x"))
+                i += 1
+        return "".join(out)
+
+    def test_compiled_format_agrees_with_strptime(self):
+        rng = random.Random(3)
+        for fmt in text_chunker.TimestampParser.FORMATS:
+            compiled = text_chunker.CompiledTimestampFormat(fmt)
+            for _ in range(3000):
+                value = self.random_string(fmt, rng)
+                try:
+                    expected = datetime.strptime(value, fmt)
+                except ValueError:
+                    expected = None
+                self.assertEqual(compiled.parse(value), expected, (fmt, value))
+
+
+class TestTokenOffsets(unittest.TestCase):
+
+    @staticmethod
+    def reference_context(text, position, context_words):
+        """extract_context before the offset table: linear scan over re-found words."""
+        words = text.split()
+        word_positions = []
+        current_pos = 0
+        for word in words:
+            word_start = text.find(word, current_pos)
+            word_positions.append((word_start, word_start + len(word)))
+            current_pos = word_start + len(word)
+        target = 0
+        for i, (start, end) in enumerate(word_positions):
+            if start <= position <= end:
+                target = i
+                break
+        start_idx = max(0, target - context_words)
+        end_idx = min(len(words), target + context_words + 1)
+        context = words[start_idx:end_idx]
+        if start_idx < target < end_idx:
+            context[target - start_idx] = f"**{context[target - start_idx]}**"
+        return " ".join(context)
+
+    def test_extract_context_matches_reference(self):
+        rng = random.Random(47)
+        matcher = fuzzy_engine.RegexMatcher()
+        for _ in range(3000):
+            tokens = ["ist", "du", "äöü", "ja", "a", "  ", "\t", "\n", " "]
+            text = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 40)))
+            offsets = fuzzy_engine.TokenOffsets(text)
+            position = rng.randint(-2, len(text) + 2)
+            context_words = rng.randint(0, 5)
+            expected = self.reference_context(text, position, context_words)
+            self.assertEqual(matcher.extract_context(text, position, context_words), expected)
+            self.assertEqual(
+                matcher.extract_context(text, position, context_words, offsets), expected
+            )
+
+    def test_fuzzy_spans_cover_their_window(self):
+        text = "Du  bist ist ist\tschuld,   immer ist ist"
+        offsets = fuzzy_engine.TokenOffsets(text)
+        self.assertEqual([text[s:e] for s, e in zip(offsets.starts, offsets.ends)], text.split())
+
+        matcher = fuzzy_engine.FuzzyMatcher()
+        matcher.use_fuzzywuzzy = False
+        matches = matcher.find_fuzzy_matches(text, ["ist ist", "du bist"], threshold=0.9)
+        self.assertTrue(matches)
+        for matched_text, start, end, _ in matches:
+            self.assertEqual(text[start:end].split(), matched_text.split())
+        self.assertIn((text.rindex("ist ist"), len(text)), [(s, e) for _, s, e, _ in matches])
+
+
+class TestRegexCache(DetectTestCase):
+
+    def test_lru_eviction_and_stats(self):
+        cache = fuzzy_engine.RegexCache(max_entries=2)
+        first = cache.get(r"\bja\b")
+        cache.get(r"\bnein\b")
+        self.assertIs(cache.get(r"\bja\b"), first)
+        cache.get(r"\bja\b", re.IGNORECASE)  # flags are part of the key
+        cache.get(r"\bnein\b")  # evicts \bja\b
+        with self.assertRaises(re.error):
+            cache.get("(")
+
+        stats = cache.stats()
+        self.assertEqual(
+            {key: stats[key] for key in ("entries", "hits", "misses", "evictions", "errors")},
+            {"entries": 2, "hits": 1, "misses": 5, "evictions": 2, "errors": 1},
+        )
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 6)
+        self.assertGreater(stats["compile_seconds"], 0.0)
+        cache.get(r"\bja\b")  # evicted as least recently used: compiled again
+        self.assertEqual((cache.stats()["misses"], cache.stats()["evictions"]), (6, 3))
+
+    def test_marker_statistics_report_regex_cache(self):
+        path = self.write("markers.yaml", (
+            "markers:\n  - id: M_REGEX\n    patterns:\n"
+            "      - pattern: '\\bschuld\\b'\n        is_regex: true\n"
+        ))
+        config = config_loader.MarkerConfig(marker_directories=[path.parent], auto_reload=False)
+        matcher = marker_matcher.MarkerMatcher(config)
+        matcher.load_markers()
+        text = "Du bist schuld."
+        chunk = chunk_models.TextChunk(
+            id="c1", type=chunk_models.ChunkType.MESSAGE, text=text, start_pos=0, end_pos=len(text)
+        )
+        matches = matcher.find_match_records([chunk, chunk])
+
+        stats = matcher.get_statistics(matches).regex_cache
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats, matcher.regex_matcher.cache_stats())
+
+
+class TestFuzzyFilters(unittest.TestCase):
+
+    WORDS = ["hallo", "halo", "du", "bist", "immer", "imer", "so", "schuld", "schult", "nie", "ja"]
+
+    def random_phrase(self, rng, words):
+        return " ".join(rng.choice(self.WORDS) for _ in range(words))
+
+    def test_qgram_candidates_are_lossless(self):
+        rng = random.Random(7)
+        matcher = fuzzy_engine.FuzzyMatcher()
+        matcher.use_fuzzywuzzy = False
+        for _ in range(40):
+            patterns = [self.random_phrase(rng, rng.randint(1, 3)) for _ in range(8)]
+            index = fuzzy_engine.QGramIndex(patterns)
+            for threshold in (0.5, 0.7, 0.85, 1.0):
+                for word_count in index.groups:
+                    ids = index.groups[word_count][0]
+                    low, high = index.length_range(word_count, threshold)
+                    for _ in range(20):
+                        window = self.random_phrase(rng, word_count)
+                        candidates = set(index.candidates(window, word_count, threshold))
+                        for idx in ids:
+                            pattern = index.patterns[idx]
+                            if matcher._calculate_similarity(window, pattern) >= threshold:
+                                self.assertIn(idx, candidates, (window, pattern, threshold))
+                                self.assertTrue(low <= len(window) <= high)
+
+    def test_index_cache_is_bounded_lru(self):
+        matcher = fuzzy_engine.FuzzyMatcher(max_indexes=3)
+        first = matcher.get_index(["hallo"])
+        for i in range(2):
+            matcher.get_index([f"pattern {i}"])
+        self.assertIs(matcher.get_index(["hallo"]), first)
+
+        for i in range(2, 10):
+            matcher.get_index([f"pattern {i}"])
+        self.assertEqual(len(matcher._indexes), 3)
+        self.assertEqual(list(matcher._indexes), [("pattern 7",), ("pattern 8",), ("pattern 9",)])
+        self.assertIsNot(matcher.get_index(["hallo"]), first)
+
+    def test_sweep_dedup_matches_pairwise(self):
+        def pairwise(matches):
+            kept, used = [], []
+            for match in sorted(matches, key=lambda x: (-x[3], x[1])):
+                _, start, end, _ = match
+                if all(end <= s or start >= e for s, e in used):
+                    kept.append(match)
+                    used.append((start, end))
+            return sorted(kept, key=lambda x: x[1])
+
+        rng = random.Random(1)
+        matcher = fuzzy_engine.FuzzyMatcher()
+        for _ in range(500):
+            matches = []
+            for _ in range(rng.randint(0, 40)):
+                start = rng.randint(0, 100)
+                end = start + rng.randint(0, 15)
+                matches.append(("x", start, end, rng.choice([0.8, 0.9, 1.0, rng.random()])))
+            self.assertEqual(matcher._deduplicate_matches(matches), pairwise(matches))
+
+
+class TestMarkerReload(DetectTestCase):
+
+    def write_markers(self, pattern, mtime):
+        path = self.write("markers.yaml", (
+            "markers:\n"
+            "  - id: M_TEST\n"
+            "    patterns:\n"
+            f"      - pattern: '{pattern}'\n"
+            "        is_regex: true\n"
+        ))
+        os.utime(path, (mtime, mtime))
+
+    def test_auto_reload_matches_new_definitions(self):
+        self.write_markers(r"\bschuld\b", 1_000_000)
+        config = config_loader.MarkerConfig(marker_directories=[Path(self.tmp.name)])
+        matcher = marker_matcher.MarkerMatcher(config)
+        matcher.load_markers()
+        text = "Du bist schuld, immer du."
+        chunk = chunk_models.TextChunk(
+            id="c1", type=chunk_models.ChunkType.MESSAGE, text=text, start_pos=0, end_pos=len(text)
+        )
+
+        self.assertEqual([m.text for m in matcher.find_match_records([chunk])], ["schuld"])
+
+        self.write_markers(r"\bimmer\b", 2_000_000)
+        self.assertEqual([m.text for m in matcher.find_match_records([chunk])], ["immer"])
+        self.assertIs(matcher._markers, matcher.loader.get_all_markers())
+        self.assertEqual(matcher._plans["M_TEST"].marker.patterns[0].pattern, r"\bimmer\b")
+        self.assertEqual(matcher._semantic_groups["manipulation"]["M_TEST"], [r"\bimmer\b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
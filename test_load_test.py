@@ -0,0 +1,157 @@
+"""
+test_load_test.py
+Tests for the load generator: corpus loading, summaries, baseline comparison and
+request pacing against a local stub server.
+"""
+
+import contextlib
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from load_test import RequestResult, compare, load_corpus, run_load, summarize
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Records arrival time and body; answers 429 for bodies marked "reject"."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.arrivals.append((time.perf_counter(), body))
+        status = 429 if body.get("reject") else 200
+        payload = b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestLoadCorpus(unittest.TestCase):
+
+    def test_skips_lines_without_messages(self):
+        lines = [
+            json.dumps({"messages": [{"id": "m1", "text": "a"}]}),
+            "",
+            json.dumps({"messages": []}),
+            json.dumps(["not", "a", "body"]),
+            json.dumps({"window": {"size": 2}}),
+            json.dumps({"messages": [{"id": "m2", "text": "b"}], "window": {"size": 1}}),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "corpus.jsonl"
+            path.write_text("\n".join(lines) + "\n", "utf-8")
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                corpus = load_corpus(path)
+
+        self.assertEqual([body["messages"][0]["id"] for body in corpus], ["m1", "m2"])
+        self.assertIn("skipped 3 lines", out.getvalue())
+
+
+class TestSummaries(unittest.TestCase):
+
+    def test_percentiles_and_error_rate(self):
+        results = [RequestResult(200, (i + 1) / 100) for i in range(100)]
+        results += [RequestResult(429, 0.001, "HTTP 429")] * 3 + [RequestResult(0, 5.0, "timeout")]
+        summary = summarize(results, wall_time=2.0)
+
+        self.assertEqual(summary["requests"], 104)
+        self.assertEqual(summary["successful"], 100)
+        self.assertAlmostEqual(summary["error_rate"], 4 / 104)
+        self.assertAlmostEqual(summary["throughput_rps"], 50.0)
+        self.assertEqual(summary["status_counts"], {"200": 100, "429": 3, "0": 1})
+        latency = summary["latency_s"]
+        self.assertAlmostEqual(latency["p50"], 0.505)
+        self.assertAlmostEqual(latency["p95"], 0.9505)
+        self.assertAlmostEqual(latency["p99"], 0.9901)
+        self.assertAlmostEqual(latency["max"], 1.0)
+        self.assertAlmostEqual(latency["mean"], 0.505)
+
+    def test_no_successful_requests(self):
+        summary = summarize([RequestResult(503, 0.2, "HTTP 503")] * 2, wall_time=1.0)
+        self.assertEqual(summary["successful"], 0)
+        self.assertEqual(summary["error_rate"], 1.0)
+        self.assertEqual(summary["throughput_rps"], 0.0)
+        self.assertNotIn("latency_s", summary)
+
+        empty = summarize([], wall_time=0.0)
+        self.assertEqual(empty["requests"], 0)
+        self.assertEqual((empty["error_rate"], empty["throughput_rps"]), (0.0, 0.0))
+
+    def test_compare_against_baseline(self):
+        baseline = {"throughput_rps": 50.0, "error_rate": 0.01,
+                    "latency_s": {"p50": 0.1, "p95": 0.2, "p99": 0.0}}
+        summary = {"throughput_rps": 60.0, "error_rate": 0.03,
+                   "latency_s": {"p50": 0.05, "p95": 0.3, "p99": 0.4}}
+        deltas = compare(summary, baseline)
+
+        self.assertAlmostEqual(deltas["throughput_rps"], 0.2)
+        self.assertAlmostEqual(deltas["latency_p50"], -0.5)
+        self.assertAlmostEqual(deltas["latency_p95"], 0.5)
+        self.assertNotIn("latency_p99", deltas)  # zero baseline has no relative change
+        self.assertAlmostEqual(deltas["error_rate"], 0.02)
+
+        no_success = compare({"throughput_rps": 0.0, "error_rate": 1.0}, {"error_rate": 0.0})
+        self.assertEqual(no_success, {"error_rate": 1.0})
+
+
+class TestRunLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.server.arrivals = []
+        self.server.lock = threading.Lock()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/analyze"
+
+    def test_rate_paces_request_starts(self):
+        corpus = [{"messages": [{"id": "a"}]}, {"messages": [{"id": "b"}], "reject": True}]
+        rate = 20.0
+        started = time.perf_counter()
+        results = run_load(self.url, corpus, total_requests=8, concurrency=4, rate=rate, timeout=5)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual([r.status for r in results], [200, 429] * 4)
+        self.assertEqual([r.error for r in results], [None, "HTTP 429"] * 4)
+        self.assertGreaterEqual(elapsed, 7 / rate)
+
+        arrivals = sorted(t for t, _ in self.server.arrivals)
+        self.assertEqual(len(arrivals), 8)
+        for i, arrival in enumerate(arrivals):
+            # Request i may not start before t0 + i / rate
+            self.assertGreaterEqual(arrival - started, i / rate - 0.01)
+
+    def test_unpaced_run_cycles_corpus(self):
+        corpus = [{"messages": [{"id": str(i)}]} for i in range(3)]
+        results = run_load(self.url, corpus, total_requests=7, concurrency=3)
+
+        self.assertEqual(len(results), 7)
+        self.assertTrue(all(r.status == 200 for r in results))
+        ids = sorted(body["messages"][0]["id"] for _, body in self.server.arrivals)
+        self.assertEqual(ids, ["0", "0", "0", "1", "1", "2", "2"])
+
+    def test_connection_errors_are_reported(self):
+        self.server.shutdown()
+        self.server.server_close()
+        results = run_load(self.url, [{"messages": [{"id": "a"}]}], total_requests=2, concurrency=1,
+                           timeout=1)
+        self.assertEqual([r.status for r in results], [0, 0])
+        self.assertTrue(all(r.error for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
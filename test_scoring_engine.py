@@ -0,0 +1,437 @@
+"""
+test_scoring_engine.py
+Tests for the ScoringEngine (chunk scoring, aggregation, timeline).
+"""
+
+import json
+import pickle
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+from scoring_engine import ScoringEngine
+from scoring_registry import ScoringRegistry
+from scoring_adapter import run_scoring, to_matches
+from marker_engine_core import MarkerEngine
+from cohort_comparison import compare_cohorts, stack_runs
+from chunk_models import TextChunk
+from marker_models import MarkerMatch, MarkerCategory, MarkerSeverity
+
+def make_conversation(n_chunks=60, n_matches=200, seed=7):
+    """Random chunks and matches across all categories, severities and two speakers."""
+    rng = random.Random(seed)
+    start = datetime(2025, 7, 1, 9, 0, 0)
+    chunks = [
+        TextChunk(
+            id=f"c{i}",
+            text="x",
+            timestamp=start + timedelta(minutes=17 * i),
+            speaker=type("S", (), {"name": "A" if i % 3 else "B"}),
+            word_count=rng.choice([0, 3, 8, 20])
+        )
+        for i in range(n_chunks)
+    ]
+    matches = [
+        MarkerMatch(
+            chunk_id=f"c{rng.randrange(n_chunks)}",
+            marker_id=f"ATO_{k % 9}",
+            marker_name=f"Marker {k % 9}",
+            category=rng.choice(list(MarkerCategory)),
+            severity=rng.choice(list(MarkerSeverity)),
+            confidence=rng.uniform(0.5, 1.0),
+            metadata={"weight": rng.choice([0.5, 1.0, 2.0])}
+        )
+        for k in range(n_matches)
+    ]
+    return chunks, matches
+
+class TestVectorizedScoring(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ScoringEngine()
+        self.chunks, self.matches = make_conversation()
+
+    def assertScoresEqual(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for e, a in zip(expected, actual):
+            self.assertEqual((e.chunk_id, e.model_id), (a.chunk_id, a.model_id))
+            self.assertAlmostEqual(e.raw_score, a.raw_score)
+            self.assertAlmostEqual(e.normalized_score, a.normalized_score)
+            self.assertAlmostEqual(e.confidence, a.confidence)
+            self.assertEqual(e.metadata, a.metadata)
+            self.assertEqual(len(e.contributing_markers), len(a.contributing_markers))
+            for ce, ca in zip(e.contributing_markers, a.contributing_markers):
+                self.assertEqual(ce["marker_id"], ca["marker_id"])
+                self.assertAlmostEqual(ce["contribution"], ca["contribution"])
+
+    def test_vectorized_matches_reference(self):
+        reference = self.engine.calculate_scores(self.chunks, self.matches, vectorized=False)
+        vectorized = self.engine.calculate_scores(self.chunks, self.matches)
+
+        self.assertScoresEqual(reference.chunk_scores, vectorized.chunk_scores)
+        for score_type, agg in reference.aggregated_scores.items():
+            self.assertAlmostEqual(agg.average_score,
+                                   vectorized.aggregated_scores[score_type].average_score)
+
+    def test_vectorized_with_severity_multipliers_and_model_subset(self):
+        model = self.engine.get_model("fraud_probability")
+        model.severity_multipliers = {"LOW": 0.5, "HIGH": 2.0}
+        self.engine.add_custom_model(model)
+
+        ids = ["fraud_probability", "relationship_health"]
+        reference = self.engine.calculate_scores(self.chunks, self.matches, ids, vectorized=False)
+        vectorized = self.engine.calculate_scores(self.chunks, self.matches, ids)
+        self.assertScoresEqual(reference.chunk_scores, vectorized.chunk_scores)
+
+    def test_score_matrix_matches_chunk_scores(self):
+        matrix = self.engine.score_matrix(self.chunks, self.matches)
+        scores = self.engine.calculate_scores(self.chunks, self.matches).chunk_scores
+
+        self.assertEqual(matrix.normalized.shape, (len(self.chunks), len(self.engine.models)))
+        for cs in scores:
+            i = matrix.chunk_ids.index(cs.chunk_id)
+            j = matrix.model_ids.index(cs.model_id)
+            self.assertAlmostEqual(matrix.normalized[i, j], cs.normalized_score)
+            self.assertAlmostEqual(matrix.confidence[i, j], cs.confidence)
+
+    def test_empty_inputs(self):
+        result = self.engine.calculate_scores([], [])
+        self.assertEqual(result.chunk_scores, [])
+        result = self.engine.calculate_scores(self.chunks[:2], [])
+        self.assertEqual(len(result.chunk_scores), 2 * len(self.engine.models))
+        self.assertTrue(all(cs.confidence == 0.5 for cs in result.chunk_scores))
+
+    def test_lazy_contributing_markers_match_detail(self):
+        lazy = self.engine.calculate_scores(self.chunks, self.matches)
+        detail = self.engine.calculate_scores(self.chunks, self.matches, detail=True)
+
+        self.assertIsInstance(detail.chunk_scores[0].contributing_markers, list)
+        for cl, cd in zip(lazy.chunk_scores, detail.chunk_scores):
+            self.assertEqual(len(cl.contributing_markers), len(cd.contributing_markers))
+            self.assertEqual(list(cl.contributing_markers), cd.contributing_markers)
+        for score_type, agg in detail.aggregated_scores.items():
+            self.assertEqual(agg.top_markers, lazy.aggregated_scores[score_type].top_markers)
+
+        restored = pickle.loads(pickle.dumps(lazy.chunk_scores))
+        self.assertEqual([list(cs.contributing_markers) for cs in restored],
+                         [cs.contributing_markers for cs in detail.chunk_scores])
+
+class TestAggregation(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ScoringEngine()
+        self.chunks, self.matches = make_conversation()
+        self.result = self.engine.calculate_scores(self.chunks, self.matches)
+
+    def test_speaker_scores_partition_chunks(self):
+        speakers = {chunk.id: chunk.speaker.name for chunk in self.chunks}
+        for model in self.engine.models.values():
+            expected = [
+                cs.normalized_score for cs in self.result.chunk_scores
+                if cs.model_id == model.id and speakers[cs.chunk_id] == "B"
+            ]
+            agg = self.result.speaker_scores["B"][model.type.value]
+            self.assertEqual(agg.chunk_count, len(expected))
+            self.assertAlmostEqual(agg.average_score, sum(expected) / len(expected))
+            self.assertEqual(agg.max_score, max(expected))
+
+        total = sum(agg.chunk_count for per_model in self.result.speaker_scores.values()
+                    for agg in per_model.values())
+        self.assertEqual(total, len(self.result.chunk_scores))
+
+    def test_distribution_bucket_edges(self):
+        scores = [1.0, 2.0, 2.5, 4.0, 6.0, 8.0, 8.5, 10.0]
+        distribution = self.engine._calculate_distribution(scores)
+        self.assertEqual(distribution, {"1-2": 2, "3-4": 2, "5-6": 1, "7-8": 1, "9-10": 2})
+
+class TestTimelineRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ScoringEngine()
+        self.chunks, self.matches = make_conversation(n_chunks=400, n_matches=900)
+        self.result = self.engine.calculate_scores(self.chunks, self.matches)
+
+    def test_hourly_timeline_matches_manual_buckets(self):
+        expected = {}
+        for cs in self.result.chunk_scores:
+            if cs.model_id != "manipulation_index":
+                continue
+            hour = cs.timestamp.replace(minute=0, second=0, microsecond=0).isoformat()
+            expected.setdefault(hour, []).append(cs.normalized_score)
+
+        timeline = self.result.timeline
+        self.assertEqual([e["timestamp"] for e in timeline], sorted(expected))
+        for entry in timeline:
+            stats = entry["scores"]["manipulation_index"]
+            scores = expected[entry["timestamp"]]
+            self.assertEqual(stats["count"], len(scores))
+            self.assertAlmostEqual(stats["average"], sum(scores) / len(scores))
+            self.assertEqual((stats["min"], stats["max"]), (min(scores), max(scores)))
+
+    def test_levels_roll_up_consistently(self):
+        rollups = self.result.timeline_rollups
+        total = len(self.chunks)
+        for resolution in ("minute", "hour", "day", "week"):
+            entries = rollups.entries(resolution)
+            counts = [e["scores"]["fraud_probability"]["count"] for e in entries]
+            self.assertEqual(sum(counts), total)
+
+        weeks = rollups.entries("week")
+        self.assertEqual(weeks[0]["timestamp"], "2025-06-30T00:00:00")  # Montag
+        for entry in weeks:
+            self.assertEqual(datetime.fromisoformat(entry["timestamp"]).weekday(), 0)
+
+        with self.assertRaises(ValueError):
+            rollups.entries("month")
+
+    def test_aware_timestamps_bucket_on_local_time(self):
+        ist = timezone(timedelta(hours=5, minutes=30))
+        chunks, matches = make_conversation(n_chunks=3, n_matches=0)
+        chunks[0].timestamp = datetime(2025, 7, 1, 9, 10, tzinfo=ist)
+        chunks[1].timestamp = datetime(2025, 7, 1, 9, 50, tzinfo=ist)
+        chunks[2].timestamp = datetime(2025, 7, 1, 5, 0, tzinfo=timezone.utc)  # 10:30+05:30
+        result = self.engine.calculate_scores(chunks, matches)
+
+        timeline = result.timeline
+        self.assertEqual([e["timestamp"] for e in timeline],
+                         ["2025-07-01T09:00:00+05:30", "2025-07-01T05:00:00+00:00"])
+        self.assertEqual(timeline[0]["scores"]["manipulation_index"]["count"], 2)
+
+        days = result.timeline_rollups.entries("day")
+        self.assertEqual([e["timestamp"] for e in days],
+                         ["2025-07-01T00:00:00+05:30", "2025-07-01T00:00:00+00:00"])
+
+class TestChunkScoreCache(unittest.TestCase):
+
+    def repeated_chunks(self, n):
+        chunks, matches = make_conversation(n_chunks=n, n_matches=0)
+        for chunk in chunks:
+            chunk.text = "Guten Morgen"
+            chunk.word_count = 2
+        matches = [
+            MarkerMatch(chunk_id=chunk.id, marker_id="ATO_GREETING", marker_name="Greeting",
+                        category=MarkerCategory.POSITIVE, severity=MarkerSeverity.LOW,
+                        confidence=0.9, metadata={"weight": 1.0})
+            for chunk in chunks
+        ]
+        return chunks, matches
+
+    def test_repeated_chunks_hit_cache_with_identical_scores(self):
+        chunks, matches = self.repeated_chunks(20)
+        cached = ScoringEngine(chunk_cache_bytes=1024 * 1024)
+        reference = ScoringEngine().calculate_scores(chunks, matches, vectorized=False)
+        result = cached.calculate_scores(chunks, matches, vectorized=False)
+
+        def rows(scores):
+            return [(cs.chunk_id, cs.normalized_score, cs.contributing_markers) for cs in scores]
+
+        self.assertEqual(rows(reference.chunk_scores), rows(result.chunk_scores))
+        stats = cached.get_statistics()["chunk_cache"]
+        self.assertEqual(stats["misses"], len(cached.models))
+        self.assertEqual(stats["hits"], 19 * len(cached.models))
+        self.assertGreater(stats["bytes"], 0)
+
+        cached.model_version += 1
+        cached.calculate_scores(chunks[:1], matches[:1], vectorized=False)
+        self.assertEqual(cached.get_statistics()["chunk_cache"]["misses"], 2 * len(cached.models))
+
+    def test_memory_cap_evicts_least_recently_used(self):
+        engine = ScoringEngine(chunk_cache_bytes=4000)
+        chunks, matches = make_conversation(n_chunks=200, n_matches=600)
+        engine.calculate_scores(chunks, matches, vectorized=False)
+
+        stats = engine.get_statistics()["chunk_cache"]
+        self.assertLessEqual(stats["bytes"], 4000)
+        self.assertGreater(stats["evictions"], 0)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(ScoringEngine().get_statistics()["chunk_cache"])
+
+class TestCohortComparison(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ScoringEngine()
+        self.results = [
+            self.engine.calculate_scores(*make_conversation(n_chunks=30, n_matches=n, seed=seed))
+            for seed, n in enumerate((20, 80, 150, 300))
+        ]
+
+    def test_delta_matrix_matches_pairwise_compare(self):
+        cohort = self.engine.compare_cohort(self.results, labels=["a", "b", "c", "d"])
+        for i, first in enumerate(self.results):
+            for j, second in enumerate(self.results):
+                for comparison in self.engine.compare_scores(first, second):
+                    score_type = comparison.score_type.value
+                    self.assertAlmostEqual(cohort.delta_matrix(score_type)[i, j], comparison.delta)
+                    signs = {"Verbesserung": 1, "Verschlechterung": -1, "Stabil": 0}
+                    expected = signs[comparison.change]
+                    self.assertEqual(cohort.change_matrix(score_type)[i, j], expected)
+
+    def test_change_matrix_uses_double_precision_near_threshold(self):
+        scores = (5.0, 5.5000001, 4.4999999)
+        runs = [{"fraud_probability": {"average_score": score}} for score in scores]
+        cohort = stack_runs(runs)
+        change = cohort.change_matrix("fraud_probability", block_rows=2)
+        self.assertEqual(change.tolist(), [[0, 1, -1], [-1, 0, -1], [1, 1, 0]])
+
+    def test_cohort_summaries_and_missing_scores(self):
+        stored = {"aggregated_scores": {"fraud_probability": {"average_score": 9.0}}}
+        report = compare_cohorts({"control": self.results[:2], "test": self.results[2:] + [stored]})
+
+        self.assertEqual(report["cohorts"], ["control", "test"])
+        fraud = report["summaries"]["test"]["fraud_probability"]
+        self.assertEqual(fraud["count"], 3)
+        self.assertEqual(fraud["max"], 9.0)
+        self.assertEqual(report["summaries"]["test"]["manipulation_index"]["count"], 2)
+
+        delta = report["deltas"]["fraud_probability"]
+        control = report["summaries"]["control"]["fraud_probability"]
+        self.assertAlmostEqual(delta[0][1], fraud["mean"] - control["mean"])
+        self.assertEqual(delta[0][0], 0.0)
+
+class TestIncrementalAggregator(unittest.TestCase):
+
+    def test_matches_batch_aggregation(self):
+        engine = ScoringEngine()
+        chunks, matches = make_conversation(n_chunks=80, n_matches=400)
+        batch = engine.calculate_scores(chunks, matches)
+
+        aggregator = engine.create_aggregator()
+        for i, chunk in enumerate(chunks):
+            engine.score_chunk(chunk, matches, aggregator)
+            if i == 1:
+                trends = [a.trend for a in aggregator.aggregated_scores().values()]
+                self.assertTrue(all(trend == "stable" for trend in trends))
+
+        live = aggregator.aggregated_scores()
+        self.assertEqual(live.keys(), batch.aggregated_scores.keys())
+        for score_type, expected in batch.aggregated_scores.items():
+            actual = live[score_type]
+            self.assertAlmostEqual(actual.average_score, expected.average_score)
+            self.assertEqual((actual.min_score, actual.max_score),
+                             (expected.min_score, expected.max_score))
+            self.assertEqual(actual.trend, expected.trend)
+            self.assertAlmostEqual(actual.trend_strength, expected.trend_strength)
+            self.assertEqual(actual.chunk_count, expected.chunk_count)
+            self.assertEqual(actual.distribution, expected.distribution)
+            self.assertEqual(actual.top_markers, expected.top_markers)
+
+class TestScoringRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_model(self, name, **fields):
+        definition = {
+            "id": "relationship_health",
+            "name": "Beziehungsgesundheit",
+            "type": "relationship_health",
+            "category_weights": {"SUPPORT": 2.0, "MANIPULATION": -1.0},
+            "inverse_scale": True,
+        }
+        definition.update(fields)
+        (self.model_dir / name).write_text(json.dumps(definition), "utf-8")
+
+    def test_engine_is_shared_and_hot_swapped(self):
+        registry = ScoringRegistry(self.model_dir)
+        engine = registry.engine
+        self.assertIs(registry.engine, engine)
+        self.assertEqual(engine.model_version, 1)
+
+        self.write_model("health.json", category_weights={"SUPPORT": 5.0})
+        (self.model_dir / "helper.py").write_text("class NotAModel: pass\n", "utf-8")
+        self.assertEqual(registry.reload(), 2)
+
+        swapped = registry.engine
+        self.assertIsNot(swapped, engine)
+        self.assertEqual(swapped.models["relationship_health"].category_weights, {"SUPPORT": 5.0})
+        self.assertNotEqual(engine.models["relationship_health"].category_weights, {"SUPPORT": 5.0})
+        self.assertEqual(registry.describe()["version"], 2)
+
+    def test_invalid_definitions_are_skipped(self):
+        self.write_model("bad_type.json", id="x", type="unknown")
+        self.write_model("bad_category.json", id="y", category_weights={"NOPE": 1.0})
+        self.write_model("good.json", id="z", type="fraud_probability")
+
+        engine = ScoringRegistry(self.model_dir).engine
+        self.assertIn("z", engine.models)
+        self.assertNotIn("x", engine.models)
+        self.assertNotIn("y", engine.models)
+
+class TestScoringAdapter(unittest.TestCase):
+
+    def make_messages(self, n):
+        start = datetime(2025, 7, 1, 9, 0, 0)
+        return [
+            {"id": f"m{i}", "ts": (start + timedelta(minutes=i)).isoformat(),
+             "speaker": "A" if i % 2 else "B", "text": f"Nachricht {i} mit Text"}
+            for i in range(n)
+        ]
+
+    def test_hits_are_mapped_to_their_message(self):
+        messages = self.make_messages(4)
+        messages[2]["text"] = "Ich bin wütend"
+        engine = MarkerEngine()
+        output = engine.analyze_conversation(messages, {"size": 4, "overlap": 0}, {})
+
+        anger = [h for h in output["hits"] if h["marker"] == "ATO_ANGER"]
+        self.assertTrue(anger)
+        self.assertEqual(anger[0]["msg_index"], 2)
+        self.assertEqual({m.chunk_id for m in to_matches(anger, messages)}, {"m2"})
+
+    def test_partitioned_scoring_matches_single_pass(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        messages = self.make_messages(50)
+        rng = random.Random(3)
+        hits = [
+            {"marker": f"ATO_{k % 5}", "msg_index": rng.randrange(len(messages)),
+             "meta": {"category": rng.choice(["MANIPULATION", "SUPPORT", "EMPATHY"]),
+                      "severity": rng.choice(["LOW", "HIGH"])}}
+            for k in range(120)
+        ]
+        single = run_scoring(messages, {"hits": hits})
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            partitioned = run_scoring(messages, {"hits": hits}, executor=pool, partition_size=7)
+
+        self.assertEqual(
+            [(cs.chunk_id, cs.model_id, cs.normalized_score) for cs in single.chunk_scores],
+            [(cs.chunk_id, cs.model_id, cs.normalized_score) for cs in partitioned.chunk_scores]
+        )
+        for score_type, agg in single.aggregated_scores.items():
+            self.assertAlmostEqual(agg.average_score,
+                                   partitioned.aggregated_scores[score_type].average_score)
+        self.assertEqual(single.speaker_scores.keys(), partitioned.speaker_scores.keys())
+
+    def test_partitioned_scoring_in_processes_with_chunk_cache(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        messages = self.make_messages(30)
+        hits = [
+            {"marker": f"ATO_{k % 3}", "msg_index": k % len(messages),
+             "meta": {"category": "MANIPULATION", "severity": "HIGH"}}
+            for k in range(40)
+        ]
+        engine = ScoringEngine(chunk_cache_bytes=1024 * 1024)
+        single = run_scoring(messages, {"hits": hits}, engine=engine)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            partitioned = run_scoring(messages, {"hits": hits}, engine=engine, executor=pool,
+                                      partition_size=8)
+
+        self.assertEqual(
+            [(cs.chunk_id, cs.model_id, cs.normalized_score) for cs in single.chunk_scores],
+            [(cs.chunk_id, cs.model_id, cs.normalized_score) for cs in partitioned.chunk_scores]
+        )
+
+        copy = pickle.loads(pickle.dumps(engine.chunk_cache))
+        self.assertEqual(copy.stats()["entries"], 0)
+        self.assertEqual(copy.max_bytes, engine.chunk_cache.max_bytes)
+
+if __name__ == '__main__':
+    unittest.main()